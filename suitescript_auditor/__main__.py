@@ -0,0 +1,8 @@
+"""``python -m suitescript_auditor``: the GUI, or ``audit`` for headless runs."""
+
+import sys
+
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""Synthetic corpus and stage benchmarks (``python -m suitescript_auditor.benchmarks``)."""
+
+from .corpus import CorpusSpec, generate_corpus
+from .suite import compare, run_benchmarks
+
+__all__ = ["CorpusSpec", "compare", "generate_corpus", "run_benchmarks"]
@@ -0,0 +1,86 @@
+"""Command line entry point: ``python -m suitescript_auditor.benchmarks``."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+from ..core.rules.profiler import format_table
+from .corpus import CorpusSpec, generate_corpus
+from .suite import STAGES, compare, run_benchmarks
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m suitescript_auditor.benchmarks",
+        description="Generate a synthetic SuiteScript corpus and time each analysis stage.",
+    )
+    parser.add_argument("--corpus", type=Path, help="Reuse (or create) the corpus in this directory.")
+    parser.add_argument("--files", type=int, default=CorpusSpec.files, help="Script files to generate.")
+    parser.add_argument("--seed", type=int, default=CorpusSpec.seed)
+    parser.add_argument("--min-blocks", type=int, default=CorpusSpec.min_blocks)
+    parser.add_argument("--max-blocks", type=int, default=CorpusSpec.max_blocks)
+    parser.add_argument("--hotspot-density", type=float, default=CorpusSpec.hotspot_density)
+    parser.add_argument("--minified-ratio", type=float, default=CorpusSpec.minified_ratio)
+    parser.add_argument("--pathological-ratio", type=float, default=CorpusSpec.pathological_ratio)
+    parser.add_argument("--pathological-kb", type=int, default=CorpusSpec.pathological_kb)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the best one is compared.")
+    parser.add_argument("--stage", action="append", choices=STAGES, help="Only time this stage (repeatable).")
+    parser.add_argument(
+        "--profile-rules", action="store_true", help="Print a per-rule profile table to stderr and add it to the report."
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here instead of stdout.")
+    parser.add_argument("--compare", type=Path, help="Baseline report to compare against.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Slowdown fraction counted as a regression (default 0.10)."
+    )
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    spec = CorpusSpec(
+        files=args.files,
+        seed=args.seed,
+        min_blocks=args.min_blocks,
+        max_blocks=args.max_blocks,
+        hotspot_density=args.hotspot_density,
+        minified_ratio=args.minified_ratio,
+        pathological_ratio=args.pathological_ratio,
+        pathological_kb=args.pathological_kb,
+    )
+    with tempfile.TemporaryDirectory(prefix="ssa-bench-corpus-") as scratch:
+        corpus_root = args.corpus or Path(scratch)
+        if not (corpus_root / "corpus_manifest.json").exists():
+            generate_corpus(corpus_root, spec)
+        report = run_benchmarks(
+            corpus_root, repeat=args.repeat, stages=args.stage, profile_rules=args.profile_rules
+        )
+    if args.profile_rules:
+        print(format_table(report["rule_profile"]["rules"]), file=sys.stderr)
+
+    exit_code = 0
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        rows = compare(baseline, report, threshold=args.threshold)
+        report["comparison"] = {"baseline": str(args.compare), "threshold": args.threshold, "metrics": rows}
+        for row in rows:
+            marker = "REGRESSION" if row["regression"] else "ok"
+            print(f"{row['metric']:<40} {row['ratio']:>7.3f}x  {marker}", file=sys.stderr)
+        if any(row["regression"] for row in rows):
+            exit_code = 1
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload, encoding="utf-8")
+    else:
+        print(payload)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""Synthetic SuiteScript project generator for benchmarks.
+
+Files follow the shapes the parsing layer expects: a JSDoc header with
+``@NApiVersion``/``@NScriptType`` and an AMD ``define([...], function(...))``
+module whose dependencies include ``N/*`` modules and project-local
+``./lib/*`` helpers. A configurable share of the code blocks carries the
+patterns the static rules look for, and a few files are deliberately
+minified or pathological so regressions on those shapes show up too.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+SCRIPT_TYPES: Dict[str, List[str]] = {
+    "ClientScript": ["pageInit", "fieldChanged", "saveRecord"],
+    "UserEventScript": ["beforeLoad", "beforeSubmit", "afterSubmit"],
+    "Suitelet": ["onRequest"],
+    "MapReduceScript": ["getInputData", "map", "reduce", "summarize"],
+    "ScheduledScript": ["execute"],
+    "Restlet": ["get", "post"],
+}
+
+NATIVE_MODULES = ["N/record", "N/search", "N/log", "N/runtime", "N/https", "N/ui/serverWidget"]
+
+# Each snippet triggers at least one rule; ``{i}`` is replaced by a counter.
+HOTSPOT_SNIPPETS = [
+    "for (var i{i} = 0; i{i} < ids.length; i{i}++) {{\n    var rec{i} = record.load({{type: 'salesorder', id: ids[i{i}]}});\n    rec{i}.save();\n}}",
+    "while (hasMore{i}) {{\n    search.run().each(function (r) {{ return true; }});\n    hasMore{i} = false;\n}}",
+    "record.submitFields({{type: 'customer', id: id{i}, values: {{}}, options: {{ignoreMandatoryFields: true}}}});",
+    "var out{i} = eval('(' + payload{i} + ')');",
+    "https.request({{method: 'GET', url: 'http://partner.example.com/api/{i}'}});",
+    "var config{i} = {{ token: 'A1b2C3d4E5f6G7h8{i}' }};",
+    "try {{\n    doWork{i}();\n}} catch (e{i}) {{}}",
+    "for (var n{i} = 0; n{i} < rows.length; n{i}++) {{\n    document.getElementById('row' + n{i}).innerHTML = rows[n{i}];\n}}",
+    "response.write(JSON.stringify(search.create({{type: 'transaction'}}).run().getRange({{start: 0, end: 1000}})));",
+]
+
+CLEAN_SNIPPETS = [
+    "var total{i} = values.reduce(function (acc, v) {{ return acc + v; }}, 0);",
+    "log.debug({{title: 'step {i}', details: JSON.stringify(context)}});",
+    "if (!id{i}) {{\n    return null;\n}}",
+    "var fields{i} = ['entity', 'trandate', 'memo'].map(function (f) {{ return f.toUpperCase(); }});",
+    "// Helper comment {i}: keeps the block readable for reviewers.",
+    "var label{i} = 'Record ' + String({i});",
+]
+
+
+@dataclass
+class CorpusSpec:
+    files: int = 200
+    seed: int = 1
+    min_blocks: int = 5
+    max_blocks: int = 60
+    hotspot_density: float = 0.15
+    helper_modules: int = 8
+    minified_ratio: float = 0.03
+    pathological_ratio: float = 0.02
+    pathological_kb: int = 64
+
+
+@dataclass
+class CorpusFile:
+    path: str
+    kind: str
+    script_type: str | None
+    bytes: int
+    hotspot_blocks: int = 0
+
+
+@dataclass
+class CorpusManifest:
+    root: str
+    spec: CorpusSpec
+    files: List[CorpusFile] = field(default_factory=list)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(f.bytes for f in self.files)
+
+    def as_dict(self) -> Dict:
+        return {"root": self.root, "spec": asdict(self.spec), "files": [asdict(f) for f in self.files]}
+
+
+def generate_corpus(root: Path, spec: CorpusSpec | None = None) -> CorpusManifest:
+    """Write a synthetic project under ``root`` and return its manifest."""
+
+    spec = spec or CorpusSpec()
+    rng = random.Random(spec.seed)
+    manifest = CorpusManifest(root=str(root), spec=spec)
+    root.mkdir(parents=True, exist_ok=True)
+
+    for idx in range(spec.helper_modules):
+        text = _helper_module(idx, rng)
+        manifest.files.append(_write(root, f"lib/helper{idx}.js", text, "helper", None))
+
+    type_names = list(SCRIPT_TYPES)
+    for idx in range(spec.files):
+        roll = rng.random()
+        if roll < spec.minified_ratio:
+            text = _minified_bundle(idx, rng, spec)
+            manifest.files.append(_write(root, f"vendor/bundle{idx}.min.js", text, "minified", None))
+            continue
+        if roll < spec.minified_ratio + spec.pathological_ratio:
+            text = _pathological(idx, rng, spec)
+            manifest.files.append(_write(root, f"generated/pathological{idx}.js", text, "pathological", None))
+            continue
+        script_type = type_names[idx % len(type_names)]
+        text, hotspots = _script(idx, script_type, rng, spec)
+        folder = script_type.replace("Script", "").lower()
+        manifest.files.append(
+            _write(root, f"src/{folder}/{folder}_{idx}.js", text, "script", script_type, hotspots)
+        )
+
+    (root / "corpus_manifest.json").write_text(json.dumps(manifest.as_dict(), indent=2), encoding="utf-8")
+    return manifest
+
+
+def _write(
+    root: Path, rel_path: str, text: str, kind: str, script_type: str | None, hotspots: int = 0
+) -> CorpusFile:
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = text.encode("utf-8")
+    path.write_bytes(data)
+    return CorpusFile(path=rel_path, kind=kind, script_type=script_type, bytes=len(data), hotspot_blocks=hotspots)
+
+
+def _header(script_type: str | None) -> str:
+    lines = ["/**", " * @NApiVersion 2.1"]
+    if script_type:
+        lines.append(f" * @NScriptType {script_type}")
+    lines.append(" * @NModuleScope SameAccount")
+    lines.append(" */")
+    return "\n".join(lines)
+
+
+def _blocks(rng: random.Random, count: int, density: float, counter: List[int]) -> tuple[List[str], int]:
+    blocks: List[str] = []
+    hotspots = 0
+    for _ in range(count):
+        counter[0] += 1
+        if rng.random() < density:
+            hotspots += 1
+            blocks.append(rng.choice(HOTSPOT_SNIPPETS).format(i=counter[0]))
+        else:
+            blocks.append(rng.choice(CLEAN_SNIPPETS).format(i=counter[0]))
+    return blocks, hotspots
+
+
+def _indent(block: str, spaces: int) -> str:
+    pad = " " * spaces
+    return "\n".join(pad + line for line in block.splitlines())
+
+
+def _script(idx: int, script_type: str, rng: random.Random, spec: CorpusSpec) -> tuple[str, int]:
+    natives = rng.sample(NATIVE_MODULES, k=rng.randint(2, len(NATIVE_MODULES)))
+    helpers = [f"./lib/helper{h}" for h in range(spec.helper_modules) if rng.random() < 0.25]
+    # Scripts live in src/<type>/, so project helpers are two levels up.
+    deps = natives + [h.replace("./", "../../") for h in helpers]
+    aliases = [d.split("/")[-1].replace("serverWidget", "ui") for d in natives] + [
+        f"helper{h.rsplit('helper', 1)[1]}" for h in helpers
+    ]
+    counter = [0]
+    hotspot_total = 0
+    functions = []
+    entry_points = SCRIPT_TYPES[script_type]
+    for name in entry_points:
+        blocks, hotspots = _blocks(rng, rng.randint(spec.min_blocks, max(spec.min_blocks, spec.max_blocks)), spec.hotspot_density, counter)
+        hotspot_total += hotspots
+        body = "\n".join(_indent(b, 8) for b in blocks)
+        functions.append(f"    function {name}(context) {{\n{body}\n    }}")
+    for helper_idx in range(rng.randint(0, 3)):
+        blocks, hotspots = _blocks(rng, rng.randint(1, 8), spec.hotspot_density, counter)
+        hotspot_total += hotspots
+        body = "\n".join(_indent(b, 8) for b in blocks)
+        functions.append(f"    var internal{helper_idx} = function (input) {{\n{body}\n    }};")
+    returned = ", ".join(f"{name}: {name}" for name in entry_points)
+    if script_type == "MapReduceScript" and rng.random() < 0.5:
+        # Inline summarize that only logs: the shape the retry rule flags.
+        returned = returned.replace(
+            "summarize: summarize", "summarize: function (summary) { log.audit('done', summary.inputSummary); }"
+        )
+    deps_literal = ", ".join(f"'{d}'" for d in deps)
+    text = (
+        f"{_header(script_type)}\n"
+        f"define([{deps_literal}], function ({', '.join(aliases)}) {{\n"
+        + "\n\n".join(functions)
+        + f"\n\n    return {{ {returned} }};\n}});\n"
+    )
+    return text, hotspot_total
+
+
+def _helper_module(idx: int, rng: random.Random) -> str:
+    counter = [0]
+    blocks, _ = _blocks(rng, rng.randint(3, 12), 0.1, counter)
+    body = "\n".join(_indent(b, 8) for b in blocks)
+    return (
+        "/**\n * @NApiVersion 2.1\n */\n"
+        "define(['N/record', 'N/search'], function (record, search) {\n"
+        f"    function doThing{idx}(ids) {{\n{body}\n    }}\n\n"
+        f"    return {{ doThing{idx}: doThing{idx} }};\n}});\n"
+    )
+
+
+def _minified_bundle(idx: int, rng: random.Random, spec: CorpusSpec) -> str:
+    counter = [0]
+    parts = []
+    size = 0
+    target = spec.pathological_kb * 1024
+    while size < target:
+        blocks, _ = _blocks(rng, 20, 0.05, counter)
+        chunk = ";".join(" ".join(b.split()) for b in blocks)
+        parts.append(f"function m{counter[0]}(a,b){{{chunk}}}")
+        size += len(parts[-1])
+    return "!function(e){" + ";".join(parts) + "}(window);\n//# sourceMappingURL=bundle" + str(idx) + ".min.js.map\n"
+
+
+def _pathological(idx: int, rng: random.Random, spec: CorpusSpec) -> str:
+    """Shapes that stress backtracking-prone or quadratic code paths."""
+
+    target = spec.pathological_kb * 1024
+    variant = idx % 3
+    if variant == 0:
+        # Many afterSubmit mentions with no record write after them.
+        unit = "// afterSubmit handler placeholder\nvar afterSubmitCount = 0;\n"
+    elif variant == 1:
+        # Loop headers with long bodies and no record.load/save.
+        unit = "for (var k = 0; k < 10; k++) { var x = k * 2; var y = x + 1; log.debug('x', y); }\n"
+    else:
+        # Deeply nested blocks.
+        depth = 40
+        unit = "".join("if (a) {\n" for _ in range(depth)) + "b();\n" + "}\n" * depth
+    body = unit * max(1, target // len(unit))
+    return f"{_header('ScheduledScript')}\ndefine(['N/log'], function (log) {{\n{body}\n}});\n"
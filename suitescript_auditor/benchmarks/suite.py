@@ -0,0 +1,299 @@
+"""Stage-level timings of the analysis pipeline over a corpus.
+
+Each stage is timed ``repeat`` times over the whole corpus and reported
+with its best and median wall time plus throughput. The report is plain
+JSON, so results from two commits can be diffed with :func:`compare`.
+"""
+
+from __future__ import annotations
+
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+from ..core.config.defaults import defaults
+from ..core.docs.writer import DocsWriter, FileDocsPayload
+from ..core.io import discovery
+from ..core.io.snapshot import FileSnapshot, read_snapshot
+from ..core.jobs.analysis import FileAnalysis, analyze_file
+from ..core.jobs.models import Job, JobSettings, JobSourceType
+from ..core.jobs.runner import JobRunner
+from ..core.parsing import module_resolver, suitescript_header
+from ..core.parsing.ast_js import extract_functions
+from ..core.parsing.lexer import LexedSource, lex
+from ..core.parsing.line_map import LineMap
+from ..core.parsing.parsed_file import ParsedFile
+from ..core.parsing.scopes import build_scope_index
+from ..core.rules.base import RuleContext
+from ..core.rules.profiler import RuleProfile
+
+REPORT_FORMAT = 1
+STAGES = (
+    "discovery",
+    "snapshot",
+    "line_map",
+    "lexer",
+    "scopes",
+    "header",
+    "modules",
+    "extract_functions",
+    "rules",
+    "docs_writer",
+    "packaging",
+    "job",
+)
+# Offsets converted per file by the line_map stage, spread evenly over the text.
+LINE_MAP_QUERIES = 64
+
+
+@dataclass
+class Timing:
+    samples: List[float] = field(default_factory=list)
+    items: int = 0
+    bytes: int = 0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        best = min(self.samples) if self.samples else 0.0
+        data: Dict[str, Any] = {
+            "min_seconds": round(best, 6),
+            "median_seconds": round(statistics.median(self.samples), 6) if self.samples else 0.0,
+            "repeat": len(self.samples),
+            "items": self.items,
+            "bytes": self.bytes,
+            "items_per_second": round(self.items / best, 2) if best else 0.0,
+            "mb_per_second": round(self.bytes / best / 1_000_000, 3) if best else 0.0,
+        }
+        data.update(self.extra)
+        return data
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Timing:
+    timing = Timing()
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        timing.samples.append(time.perf_counter() - started)
+    return timing
+
+
+def run_benchmarks(
+    corpus_root: Path,
+    *,
+    repeat: int = 3,
+    stages: Iterable[str] | None = None,
+    profile_rules: bool = False,
+) -> Dict[str, Any]:
+    """Time each selected stage over ``corpus_root`` and return the report.
+
+    ``profile_rules`` adds a ``rule_profile`` section from one profiled
+    :meth:`RuleEngine.run` pass over every file.
+    """
+
+    selected = [stage for stage in STAGES if stages is None or stage in set(stages)]
+    runner = JobRunner(cache_dir=Path(tempfile.mkdtemp(prefix="ssa-bench-cache-")))
+    engine = runner.rule_engine
+
+    files = discovery.discover(corpus_root)
+    snapshots = [read_snapshot(source_file) for source_file in files]
+    total_bytes = sum(s.size for s in snapshots)
+    contexts = [_context(s) for s in snapshots]
+
+    report_stages: Dict[str, Dict[str, Any]] = {}
+    rule_timings: Dict[str, Dict[str, Any]] = {}
+
+    def record(name: str, fn: Callable[[], Any], items: int = len(files), size: int = total_bytes) -> Timing:
+        timing = measure(fn, repeat)
+        timing.items, timing.bytes = items, size
+        report_stages[name] = timing.as_dict()
+        return timing
+
+    if "discovery" in selected:
+        record("discovery", lambda: discovery.discover(corpus_root))
+    if "snapshot" in selected:
+        record("snapshot", lambda: [read_snapshot(source_file) for source_file in files])
+    if "line_map" in selected:
+        record("line_map", lambda: [_line_map_workload(s.text) for s in snapshots])
+    if "lexer" in selected:
+        record("lexer", lambda: [_lexer_workload(s.text) for s in snapshots])
+    if "scopes" in selected:
+        record("scopes", lambda: [build_scope_index(c.view("code"), c.text) for c in contexts])
+    if "header" in selected:
+        record("header", lambda: [suitescript_header.parse_header(s.text) for s in snapshots])
+    if "modules" in selected:
+        record("modules", lambda: [module_resolver.find_modules(c.view("no_comments")) for c in contexts])
+    if "extract_functions" in selected:
+        record("extract_functions", lambda: [extract_functions(c.text, c.view("code")) for c in contexts])
+    if "rules" in selected:
+        for rule in engine.rules:
+            applicable = [ctx for ctx in contexts if rule.applies(ctx)]
+            matches = sum(len(list(rule.evaluate(ctx))) for ctx in applicable)
+            timing = measure(lambda rule=rule: _run_rule(rule, contexts), repeat)
+            timing.items = len(applicable)
+            timing.bytes = sum(len(ctx.text) for ctx in applicable)
+            timing.extra = {"matches": matches}
+            rule_timings[rule.rule_id] = timing.as_dict()
+        record("rules", lambda: [engine.run(ctx) for ctx in contexts])
+
+    analyses: List[FileAnalysis] = []
+    if {"docs_writer", "packaging"} & set(selected):
+        analyses = [analyze_file(s, engine) for s in snapshots]
+    with tempfile.TemporaryDirectory(prefix="ssa-bench-docs-") as scratch:
+        docs_root = Path(scratch) / "Docs"
+        if "docs_writer" in selected or "packaging" in selected:
+            write = lambda: _write_docs(runner, docs_root, analyses)  # noqa: E731
+            if "docs_writer" in selected:
+                record("docs_writer", write)
+            else:
+                write()
+        if "packaging" in selected:
+            archive_base = Path(scratch) / "Docs-archive"
+            docs_bytes = sum(p.stat().st_size for p in docs_root.rglob("*") if p.is_file())
+            record(
+                "packaging",
+                lambda: shutil.make_archive(str(archive_base), "zip", docs_root),
+                size=docs_bytes,
+            )
+    if "job" in selected:
+        record("job", lambda: _run_job(runner, corpus_root))
+
+    report: Dict[str, Any] = {
+        "format": REPORT_FORMAT,
+        "meta": _meta(repeat),
+        "corpus": {"root": str(corpus_root), "files": len(files), "bytes": total_bytes},
+        "stages": report_stages,
+        "rules": rule_timings,
+    }
+    if profile_rules:
+        profile = RuleProfile()
+        for ctx in contexts:
+            engine.run(ctx, profile)
+        report["rule_profile"] = profile.as_dict()
+    return report
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], *, threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """Best-time ratio of every metric present in both reports.
+
+    A metric is flagged as a regression when it got slower by more than
+    ``threshold`` (a fraction, so ``0.10`` is 10%).
+    """
+
+    rows: List[Dict[str, Any]] = []
+    for section in ("stages", "rules"):
+        old_section = baseline.get(section, {})
+        for name, new in current.get(section, {}).items():
+            old = old_section.get(name)
+            if not old or not old.get("min_seconds"):
+                continue
+            ratio = new["min_seconds"] / old["min_seconds"]
+            rows.append(
+                {
+                    "metric": f"{section}.{name}",
+                    "baseline_seconds": old["min_seconds"],
+                    "current_seconds": new["min_seconds"],
+                    "ratio": round(ratio, 3),
+                    "regression": ratio > 1 + threshold,
+                }
+            )
+    return rows
+
+
+def _context(snapshot: FileSnapshot) -> RuleContext:
+    """Context with views and scopes built up front, so rule timings exclude parsing."""
+
+    parsed = ParsedFile(snapshot.text, str(snapshot.source.rel_path), source=_lexer_workload(snapshot.text))
+    return RuleContext.from_parsed(parsed.compute("scopes"))
+
+
+def _lexer_workload(text: str) -> LexedSource:
+    source = lex(text)
+    source.view("no_comments")
+    source.view("code")
+    return source
+
+
+def _line_map_workload(text: str) -> None:
+    line_map = LineMap.from_text(text)
+    step = max(1, len(text) // LINE_MAP_QUERIES)
+    for offset in range(0, len(text), step):
+        line_map.to_range(offset, offset + 1)
+
+
+def _run_rule(rule, contexts: List[RuleContext]) -> None:
+    for ctx in contexts:
+        if rule.applies(ctx):
+            for _ in rule.evaluate(ctx):
+                pass
+
+
+def _write_docs(runner: JobRunner, docs_root: Path, analyses: List[FileAnalysis]) -> None:
+    writer = DocsWriter(docs_root)
+    job = _job(docs_root)
+    for analysis in analyses:
+        audit = runner._build_audit_payload(
+            job=job,
+            source_file=analysis.source_file,
+            file_hash=analysis.file_hash,
+            header=analysis.header,
+            hotspots=analysis.hotspots,
+            score=analysis.score,
+        )
+        summary = runner._build_summary_payload(job=job, parsed=analysis.parsed, file_hash=analysis.file_hash)
+        writer.write(FileDocsPayload(rel_path=analysis.source_file.rel_path, audit=audit, summary=summary))
+
+
+def _job(source: Path, **settings: Any) -> Job:
+    return Job(
+        id=f"bench-{os.getpid()}-{time.monotonic_ns()}",
+        project_name="Benchmark",
+        source=source,
+        source_type=JobSourceType.REPOSITORY,
+        created_at=datetime.utcnow(),
+        settings=JobSettings(**settings),
+    )
+
+
+def _run_job(runner: JobRunner, corpus_root: Path) -> None:
+    job = _job(corpus_root, use_cache=False)
+    try:
+        runner.run(job)
+    finally:
+        # The runner writes its docs next to the sources; keep the corpus pristine.
+        shutil.rmtree(corpus_root / defaults.docs_dir_name, ignore_errors=True)
+        runner.workspace.cleanup(job.id)
+
+
+def _meta(repeat: int) -> Dict[str, Any]:
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": _git_commit(),
+        "repeat": repeat,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
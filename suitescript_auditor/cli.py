@@ -0,0 +1,171 @@
+"""Headless command line interface.
+
+``python -m suitescript_auditor audit SOURCE...`` runs one job per source
+through the same :class:`JobQueue` the desktop app uses, streams progress as
+JSON lines on stderr and prints a JSON summary on stdout. Nothing here
+imports tkinter; the GUI is only loaded when no subcommand is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, TextIO
+
+EXIT_OK = 0
+EXIT_THRESHOLD = 1  # every job finished but at least one missed a threshold
+EXIT_USAGE = 2  # argparse errors and missing sources
+EXIT_FAILED = 3  # at least one job failed
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m suitescript_auditor")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("gui", help="Launch the desktop application (default).")
+
+    audit = commands.add_parser("audit", help="Audit repositories or ZIP exports without the GUI.")
+    audit.add_argument("sources", nargs="+", type=Path, help="Repository folders and/or .zip exports.")
+    audit.add_argument("--jobs", type=int, default=1, help="Sources audited concurrently (default 1).")
+    audit.add_argument(
+        "--workers", type=int, default=1, help="Analysis processes per job; 0 means one per CPU (default 1)."
+    )
+    audit.add_argument("--name", help="Project name (defaults to each source's folder or file name).")
+    audit.add_argument("--llm", action="store_true", help="Enable the LLM review stage.")
+    audit.add_argument("--no-cache", action="store_true", help="Ignore and do not update the analysis cache.")
+    audit.add_argument("--profile-rules", action="store_true", help="Add a per-rule profile to each result.")
+    audit.add_argument(
+        "--rule-budget", type=float, default=5.0, help="Seconds each rule may spend on one file; 0 disables (default 5)."
+    )
+    audit.add_argument(
+        "--rule-pack",
+        action="append",
+        type=Path,
+        default=[],
+        metavar="PATH",
+        help="Rule pack file or folder of packs (.toml/.json) to add to the built-in rules; repeatable.",
+    )
+    audit.add_argument(
+        "--fail-under", type=float, help="Exit 1 if any job's summary_scores.overall is below this value."
+    )
+    audit.add_argument(
+        "--max-critical-files", type=int, help="Exit 1 if any job has more critical files than this."
+    )
+    audit.add_argument(
+        "--progress", choices=("json", "none"), default="json", help="Progress on stderr (default json lines)."
+    )
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "audit":
+        return audit(args)
+    from . import run_app
+
+    run_app()
+    return EXIT_OK
+
+
+def audit(args: argparse.Namespace, *, stdout: TextIO | None = None, stderr: TextIO | None = None) -> int:
+    from .core.jobs.models import JobSettings, JobSourceType
+    from .core.jobs.queue import JobQueue
+    from .core.jobs.runner import JobRunner
+    from .core.rules.packs import RulePackError
+
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    missing = [str(source) for source in args.sources if not source.exists()]
+    if missing:
+        print(json.dumps({"event": "error", "message": "source not found", "sources": missing}), file=stderr)
+        return EXIT_USAGE
+
+    runner = None
+    if args.rule_pack:
+        try:
+            runner = JobRunner(rule_packs=args.rule_pack)
+        except RulePackError as exc:
+            print(json.dumps({"event": "error", "message": "invalid rule pack", "detail": str(exc)}), file=stderr)
+            return EXIT_USAGE
+    queue = JobQueue(runner=runner, max_concurrent=max(1, args.jobs))
+    pending: set[str] = set()
+    done = threading.Event()
+    lock = threading.Lock()
+
+    def on_progress(snapshot) -> None:
+        if args.progress == "json":
+            with lock:
+                print(json.dumps({"event": "progress", **snapshot.as_dict()}), file=stderr, flush=True)
+        if snapshot.terminal:
+            with lock:
+                pending.discard(snapshot.id)
+                if not pending:
+                    done.set()
+
+    unsubscribe = queue.subscribe(on_progress)
+    jobs = []
+    with lock:
+        for source in args.sources:
+            is_zip = source.is_file() and source.suffix.lower() == ".zip"
+            settings = JobSettings(
+                llm_mode=args.llm,
+                llm_mode_label="ON" if args.llm else "OFF",
+                workers=args.workers,
+                use_cache=not args.no_cache,
+                profile_rules=args.profile_rules,
+                rule_time_budget=args.rule_budget,
+                artifact_mode="lazy",
+            )
+            job = queue.submit_job(
+                project_name=args.name or (source.stem if is_zip else source.resolve().name),
+                source=source,
+                source_type=JobSourceType.ZIP if is_zip else JobSourceType.REPOSITORY,
+                settings=settings,
+            )
+            pending.add(job.id)
+            jobs.append(job)
+    done.wait()
+    queue.flush_events()
+    unsubscribe()
+
+    results = [_job_summary(job, args) for job in jobs]
+    print(json.dumps({"jobs": results}, indent=2), file=stdout)
+    if any(result["status"] != "completed" for result in results):
+        return EXIT_FAILED
+    if any(result["violations"] for result in results):
+        return EXIT_THRESHOLD
+    return EXIT_OK
+
+
+def _job_summary(job, args: argparse.Namespace) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {
+        "id": job.id,
+        "project_name": job.project_name,
+        "source": str(job.source),
+        "status": job.status.value,
+        "error": job.error,
+        "docs_path": job.results.get("docs_path"),
+        "archive": job.results.get("archive"),
+        "summary_scores": None,
+        "counts": None,
+        "violations": [],
+    }
+    if job.status.value != "completed":
+        return summary
+    index = json.loads((Path(job.results["docs_path"]) / "index.json").read_text(encoding="utf-8"))
+    summary["summary_scores"] = index.get("summary_scores")
+    summary["counts"] = index.get("counts")
+    summary["timing"] = index.get("timing", {}).get("throughput")
+    summary["classification"] = index.get("timing", {}).get("classification")
+    if "rule_profile" in index:
+        summary["rule_profile"] = index["rule_profile"]
+
+    overall = (summary["summary_scores"] or {}).get("overall")
+    if args.fail_under is not None and overall is not None and overall < args.fail_under:
+        summary["violations"].append(f"summary_scores.overall {overall:.2f} < {args.fail_under}")
+    critical = (summary["counts"] or {}).get("critical_files", 0)
+    if args.max_critical_files is not None and critical > args.max_critical_files:
+        summary["violations"].append(f"counts.critical_files {critical} > {args.max_critical_files}")
+    return summary
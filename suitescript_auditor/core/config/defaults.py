@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Tuple
 
 
 @dataclass
@@ -13,6 +14,11 @@ class Defaults:
     quality_tier: str = "Economic"
     max_cost_per_job: float = 5.0
     docs_dir_name: str = "Docs"
+    cache_max_mb: int = 256
+    max_concurrent_jobs: int = 2
+    progress_rate_hz: float = 10.0
+    # Rule pack files or folders loaded on top of the built-in rules (see ``rules.packs``).
+    rule_packs: Tuple[str, ...] = ()
 
 
 defaults = Defaults()
@@ -0,0 +1,120 @@
+"""Streaming aggregation of per-file results into index.json sections."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+SEVERITY_RANK = {"HIGH": 0, "MED": 1, "LOW": 2}
+CRITICAL_SCORE = 3
+PERCENTILES = (50, 75, 90, 95, 99)
+
+
+class IndexAggregator:
+    """Updates index counters as each file finishes.
+
+    Only the ``top_k`` most severe hotspots are retained (a bounded heap
+    ordered like a stable sort on severity), so memory for hotspots is
+    O(K) regardless of project size. Partial aggregators built by
+    parallel workers can be combined with :meth:`merge` as long as every
+    file is added with its global ``order``.
+    """
+
+    def __init__(self, top_k: int = 10) -> None:
+        self.top_k = top_k
+        self.ranking_files: List[Dict[str, Any]] = []
+        self.severity_counts: Counter[str] = Counter()
+        self.critical_files = 0
+        self.score_total = 0.0
+        self.score_histogram: Counter[float] = Counter()
+        self._files = 0
+        # Entries are (-rank, -order, -position, -seq, hotspot): the heap root
+        # is the least severe / latest hotspot, i.e. the first to be evicted.
+        self._heap: List[Tuple[int, int, int, int, Dict[str, Any]]] = []
+        self._seq = itertools.count()
+
+    def add_file(
+        self,
+        ranking_entry: Dict[str, Any],
+        hotspots: Iterable[Dict[str, Any]],
+        *,
+        order: int | None = None,
+    ) -> None:
+        order = self._files if order is None else order
+        self._files += 1
+        self.ranking_files.append(ranking_entry)
+        score = ranking_entry["score_overall"]
+        self.score_total += score
+        self.score_histogram[round(score, 1)] += 1
+        if score <= CRITICAL_SCORE:
+            self.critical_files += 1
+        for position, hotspot in enumerate(hotspots):
+            self.severity_counts[hotspot["severity"]] += 1
+            self._push(-SEVERITY_RANK.get(hotspot["severity"], 3), -order, -position, hotspot)
+
+    def merge(self, other: "IndexAggregator") -> "IndexAggregator":
+        self._files += other._files
+        self.ranking_files.extend(other.ranking_files)
+        self.severity_counts.update(other.severity_counts)
+        self.critical_files += other.critical_files
+        self.score_total += other.score_total
+        self.score_histogram.update(other.score_histogram)
+        for rank, order, position, _, hotspot in other._heap:
+            self._push(rank, order, position, hotspot)
+        return self
+
+    @property
+    def files(self) -> int:
+        return self._files
+
+    def top_hotspots(self) -> List[Dict[str, Any]]:
+        return [entry[-1] for entry in sorted(self._heap, reverse=True)]
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "files": self._files,
+            "critical_files": self.critical_files,
+            "hotspots_high": self.severity_counts["HIGH"],
+            "hotspots_med": self.severity_counts["MED"],
+            "hotspots_low": self.severity_counts["LOW"],
+        }
+
+    def summary_scores(self) -> Dict[str, float]:
+        return {"overall": self.score_total / max(1, self._files)}
+
+    def score_distribution(self) -> Dict[str, Any]:
+        ordered = sorted(self.score_histogram.items())
+        percentiles: Dict[str, float | None] = {}
+        for pct in PERCENTILES:
+            percentiles[f"p{pct}"] = percentile(ordered, self._files, pct)
+        return {
+            "histogram": {f"{score:.1f}": count for score, count in ordered},
+            "percentiles": percentiles,
+        }
+
+    def _push(self, rank: int, order: int, position: int, hotspot: Dict[str, Any]) -> None:
+        entry = (rank, order, position, -next(self._seq), hotspot)
+        if len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:4] > self._heap[0][:4]:
+            heapq.heapreplace(self._heap, entry)
+
+
+def percentile(ordered: Iterable[Tuple[float, int]], total: int, pct: int) -> float | None:
+    """Nearest-rank percentile over a sorted ``(value, count)`` histogram of ``total`` items.
+
+    ``None`` when there are no items.
+    """
+
+    if not total:
+        return None
+    rank = max(1, -(-pct * total // 100))
+    seen = 0
+    value = None
+    for value, count in ordered:
+        seen += count
+        if seen >= rank:
+            return value
+    return value
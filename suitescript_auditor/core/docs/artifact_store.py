@@ -0,0 +1,41 @@
+"""On-demand loading of generated Docs artefacts."""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+
+class ArtifactStore:
+    """Small LRU of parsed JSON / Markdown documents read from ``Docs/``."""
+
+    def __init__(self, max_items: int = 32) -> None:
+        self.max_items = max_items
+        self._items: OrderedDict[tuple[Path, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load_json(self, path: Path) -> Any:
+        return self._load(path, "json")
+
+    def load_text(self, path: Path) -> str:
+        return self._load(path, "text")
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _load(self, path: Path, kind: str) -> Any:
+        key = (path, kind)
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        text = path.read_text(encoding="utf-8")
+        value = json.loads(text) if kind == "json" else text
+        with self._lock:
+            self._items[key] = value
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        return value
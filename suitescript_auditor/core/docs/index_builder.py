@@ -7,6 +7,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
+from .aggregator import IndexAggregator
 from .markdown import render_template
 
 
@@ -14,12 +15,26 @@ def build_index(
     docs_root: Path,
     *,
     project: Dict,
-    summary_scores: Dict,
-    counts: Dict,
-    ranking_files: List[Dict],
-    top_hotspots: List[Dict],
     llm_usage: Dict,
+    aggregator: IndexAggregator | None = None,
+    summary_scores: Dict | None = None,
+    counts: Dict | None = None,
+    ranking_files: List[Dict] | None = None,
+    top_hotspots: List[Dict] | None = None,
+    extra: Dict | None = None,
 ) -> Dict[str, Path]:
+    """Write ``index.json``/``index.md``.
+
+    Sections can be passed explicitly or taken from a streaming
+    :class:`IndexAggregator`; ``extra`` adds further top-level sections.
+    """
+
+    if aggregator is not None:
+        summary_scores = summary_scores or aggregator.summary_scores()
+        counts = counts or aggregator.counts()
+        ranking_files = ranking_files if ranking_files is not None else aggregator.ranking_files
+        top_hotspots = top_hotspots if top_hotspots is not None else aggregator.top_hotspots()
+        extra = {"score_distribution": aggregator.score_distribution(), **(extra or {})}
     index_json = {
         "project": project,
         "settings": project.get("settings"),
@@ -28,6 +43,7 @@ def build_index(
         "ranking_files": ranking_files,
         "top_hotspots": top_hotspots,
         "llm_usage": llm_usage,
+        **(extra or {}),
     }
     json_path = docs_root / "index.json"
     json_path.write_text(json.dumps(index_json, indent=2), encoding="utf-8")
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Dict, List
 
@@ -15,6 +15,8 @@ class FileDocsPayload:
     rel_path: Path
     audit: Dict
     summary: Dict
+    audit_markdown: str | None = None
+    summary_markdown: str | None = None
 
 
 class DocsWriter:
@@ -24,24 +26,14 @@ class DocsWriter:
         (self.root / "summary").mkdir(parents=True, exist_ok=True)
         (self.root / "artifacts").mkdir(parents=True, exist_ok=True)
 
-    def write(self, payload: FileDocsPayload) -> Dict[str, Path]:
-        rel_dir = payload.rel_path.parent
-        rel_name = payload.rel_path.name
-        stem = rel_name.replace(".js", "")
-
-        audit_json_path = self.root / "audit" / rel_dir / f"{rel_name}.audit.json"
-        audit_md_path = self.root / "audit" / rel_dir / f"{rel_name}.audit.md"
-        summary_json_path = self.root / "summary" / rel_dir / f"{rel_name}.summary.json"
-        summary_md_path = self.root / "summary" / rel_dir / f"{rel_name}.summary.md"
+    def render(self, payload: FileDocsPayload) -> FileDocsPayload:
+        """Return ``payload`` with both Markdown documents rendered."""
 
-        for path in [audit_json_path, audit_md_path, summary_json_path, summary_md_path]:
-            path.parent.mkdir(parents=True, exist_ok=True)
-
-        audit_json_path.write_text(json.dumps(payload.audit, indent=2), encoding="utf-8")
-        summary_json_path.write_text(json.dumps(payload.summary, indent=2), encoding="utf-8")
-
-        audit_md_path.write_text(
-            render_template(
+        if payload.audit_markdown is not None and payload.summary_markdown is not None:
+            return payload
+        return replace(
+            payload,
+            audit_markdown=render_template(
                 "audit_file.md.j2",
                 {
                     "path": str(payload.rel_path),
@@ -51,11 +43,7 @@ class DocsWriter:
                     "hotspots": payload.audit["hotspots"],
                 },
             ),
-            encoding="utf-8",
-        )
-
-        summary_md_path.write_text(
-            render_template(
+            summary_markdown=render_template(
                 "summary_file.md.j2",
                 {
                     "path": str(payload.rel_path),
@@ -64,9 +52,28 @@ class DocsWriter:
                     "functions": payload.summary.get("functions", []),
                 },
             ),
-            encoding="utf-8",
         )
 
+    def write(self, payload: FileDocsPayload) -> Dict[str, Path]:
+        payload = self.render(payload)
+        rel_dir = payload.rel_path.parent
+        rel_name = payload.rel_path.name
+        stem = rel_name.replace(".js", "")
+
+        audit_json_path = self.root / "audit" / rel_dir / f"{rel_name}.audit.json"
+        audit_md_path = self.root / "audit" / rel_dir / f"{rel_name}.audit.md"
+        summary_json_path = self.root / "summary" / rel_dir / f"{rel_name}.summary.json"
+        summary_md_path = self.root / "summary" / rel_dir / f"{rel_name}.summary.md"
+
+        for path in [audit_json_path, audit_md_path, summary_json_path, summary_md_path]:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+        audit_json_path.write_text(json.dumps(payload.audit, indent=2), encoding="utf-8")
+        summary_json_path.write_text(json.dumps(payload.summary, indent=2), encoding="utf-8")
+
+        audit_md_path.write_text(payload.audit_markdown, encoding="utf-8")
+        summary_md_path.write_text(payload.summary_markdown, encoding="utf-8")
+
         return {
             "audit_json": audit_json_path,
             "summary_json": summary_json_path,
@@ -5,7 +5,7 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, Iterator, List
 
 
 @dataclass
@@ -16,16 +16,24 @@ class SourceFile:
 
 
 def discover(root: Path, patterns: Iterable[str] | None = None) -> List[SourceFile]:
+    return list(iter_discover(root, patterns))
+
+
+def iter_discover(root: Path, patterns: Iterable[str] | None = None) -> Iterator[SourceFile]:
+    """Lazily yield matching files in the same order as :func:`discover`."""
+
     patterns = list(patterns or ["*.js"])
-    results: List[SourceFile] = []
     for dirpath, _, filenames in os.walk(root):
         for filename in filenames:
             if not _match(filename, patterns):
                 continue
             path = Path(dirpath) / filename
             rel = path.relative_to(root)
-            results.append(SourceFile(path=path, rel_path=rel, size=path.stat().st_size))
-    return results
+            yield SourceFile(path=path, rel_path=rel, size=path.stat().st_size)
+
+
+def matches(filename: str, patterns: Iterable[str] | None = None) -> bool:
+    return _match(Path(filename).name, list(patterns or ["*.js"]))
 
 
 def _match(filename: str, patterns: Iterable[str]) -> bool:
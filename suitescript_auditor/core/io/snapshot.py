@@ -0,0 +1,43 @@
+"""Single-read file ingestion.
+
+A :class:`FileSnapshot` is produced once per source file: the bytes are read
+a single time (memory-mapped above ``MMAP_THRESHOLD``), hashed and decoded
+from that buffer, and the same object is handed to every later stage.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+from dataclasses import dataclass
+
+from .discovery import SourceFile
+
+MMAP_THRESHOLD = 1024 * 1024
+
+
+@dataclass
+class FileSnapshot:
+    source: SourceFile
+    sha256: str
+    text: str
+    size: int
+
+
+def read_snapshot(source_file: SourceFile, *, mmap_threshold: int = MMAP_THRESHOLD) -> FileSnapshot:
+    with open(source_file.path, "rb") as handle:
+        size = source_file.size
+        if size >= mmap_threshold and size > 0:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                return _snapshot(source_file, buffer, len(buffer))
+        data = handle.read()
+        return _snapshot(source_file, data, len(data))
+
+
+def _snapshot(source_file: SourceFile, buffer, size: int) -> FileSnapshot:
+    digest = hashlib.sha256(buffer).hexdigest()
+    text = str(buffer, "utf-8", "ignore")
+    if "\r" in text:
+        # Match ``Path.read_text`` universal-newline decoding.
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return FileSnapshot(source=source_file, sha256=digest, text=text, size=size)
@@ -12,6 +12,10 @@ class WorkspaceManager:
         self._root = Path(tempfile.gettempdir()) / "suitescript_auditor"
         self._root.mkdir(parents=True, exist_ok=True)
 
+    @property
+    def root(self) -> Path:
+        return self._root
+
     def create(self, job_id: str) -> Path:
         workspace = self._root / job_id
         workspace.mkdir(parents=True, exist_ok=True)
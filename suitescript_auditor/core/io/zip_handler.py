@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import zipfile
 from pathlib import Path
+from typing import Iterator
 
 
 def extract(zip_path: Path, target: Path) -> Path:
@@ -14,6 +15,15 @@ def extract(zip_path: Path, target: Path) -> Path:
     return target
 
 
+def iter_members(zip_path: Path) -> Iterator[zipfile.ZipInfo]:
+    """Yield file entries without extracting them (used for size estimates)."""
+
+    with zipfile.ZipFile(zip_path) as zf:
+        for member in zf.infolist():
+            if not member.is_dir():
+                yield member
+
+
 def _extract_member(zf: zipfile.ZipFile, member: zipfile.ZipInfo, target: Path) -> None:
     if member.is_dir():
         (target / member.filename).mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,252 @@
+"""Per-file static analysis shared by serial and process-pool runs."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List
+
+from ..io.discovery import SourceFile
+from ..io.snapshot import FileSnapshot
+from ..llm import dossier
+from ..parsing import minified
+from ..parsing.call_graph import CallSite
+from ..parsing.module_resolver import ModuleImport
+from ..parsing.parsed_file import PORTABLE, ParsedFile
+from ..parsing.suitescript_header import SuiteScriptHeader
+from ..parsing.symbol_index import FunctionEntry
+from ..rules import verifier
+from ..rules.base import DEGRADED_SEVERITY, Hotspot, RuleContext, RuleEngine
+from ..rules.profiler import RuleProfile
+from ..rules.scoring import ScoreBreakdown, compute_score
+from .timing import Span, measure
+
+
+@dataclass
+class LLMContext:
+    """Job-level values required to build a dossier next to the analysis."""
+
+    project_name: str
+    settings: Dict[str, Any]
+
+
+@dataclass
+class FileAnalysis:
+    source_file: SourceFile
+    file_hash: str
+    parsed: ParsedFile
+    hotspots: List[Hotspot]
+    score: ScoreBreakdown
+    dossier: Dict[str, Any] | None = None
+    cached: bool = False
+    # Wall/CPU spans per phase ("parse", "rules", "llm"), measured where the
+    # work ran (possibly a worker process); never stored in the cache.
+    timings: Dict[str, Span] = field(default_factory=dict)
+    rule_profile: RuleProfile | None = None
+    classification: str = minified.SOURCE  # see parsing.minified.KINDS
+
+    @property
+    def fast_path(self) -> bool:
+        return self.classification != minified.SOURCE
+
+    @property
+    def degraded(self) -> bool:
+        """Whether a rule ran out of its time budget on this file."""
+
+        return any(hotspot.severity == DEGRADED_SEVERITY for hotspot in self.hotspots)
+
+    @property
+    def header(self) -> SuiteScriptHeader:
+        return self.parsed.header
+
+    @property
+    def modules(self) -> List[ModuleImport]:
+        return self.parsed.modules
+
+    @property
+    def symbols(self) -> List[FunctionEntry]:
+        return self.parsed.symbols
+
+    @property
+    def calls(self) -> List[CallSite]:
+        return self.parsed.calls
+
+
+def analyze_file(
+    snapshot: FileSnapshot,
+    rule_engine: RuleEngine,
+    llm_context: LLMContext | None = None,
+    *,
+    profile_rules: bool = False,
+    minified_policy: str | None = None,
+    rule_budget: float | None = None,
+) -> FileAnalysis:
+    """Parse a file, run the static rules and score it.
+
+    With ``profile_rules`` the analysis carries a :class:`RuleProfile` for
+    this file, ready to be merged into a job-level profile.
+
+    ``minified_policy`` enables the minified/bundle fast path: such files
+    skip module, symbol and call extraction and the LLM dossier, and run only the
+    engine's fast-path rules (``"security"``) or no rules at all
+    (``"skip"``). ``None`` analyses every file in full.
+
+    ``rule_budget`` is the per-rule time budget in seconds passed to
+    :meth:`RuleEngine.run`.
+    """
+
+    source_file = snapshot.source
+    timings = {"parse": Span(), "rules": Span()}
+    with measure(timings["parse"]):
+        kind = minified.classify(snapshot.text).kind if minified_policy else minified.SOURCE
+        if kind == minified.SOURCE:
+            parsed = ParsedFile(snapshot.text, str(source_file.rel_path))
+        else:
+            parsed = ParsedFile(snapshot.text, str(source_file.rel_path), modules=[], symbols=[], calls=[])
+        # Products stored with every analysis; rules pull anything else
+        # (views, scopes) from the same ParsedFile on demand.
+        parsed.compute(*PORTABLE)
+        context = RuleContext.from_parsed(parsed)
+    rule_profile = RuleProfile() if profile_rules else None
+    with measure(timings["rules"]):
+        if kind != minified.SOURCE and minified_policy == "skip":
+            hotspots = []
+        else:
+            hotspots = rule_engine.run(
+                context, rule_profile, fast_path=kind != minified.SOURCE, budget=rule_budget
+            )
+        hotspots = verifier.verify_ranges(hotspots)
+        score = compute_score(hotspots)
+
+    analysis = FileAnalysis(
+        source_file=source_file,
+        file_hash=snapshot.sha256,
+        parsed=parsed,
+        hotspots=hotspots,
+        score=score,
+        timings=timings,
+        rule_profile=rule_profile,
+        classification=kind,
+    )
+    if llm_context is not None and not analysis.fast_path:
+        attach_dossier(analysis, llm_context)
+    return analysis
+
+
+def attach_dossier(analysis: FileAnalysis, llm_context: LLMContext) -> FileAnalysis:
+    """Build the LLM dossier for an analysis (e.g. one restored from cache)."""
+
+    with measure(analysis.timings.setdefault("llm", Span())):
+        analysis.dossier = dossier.build_dossier(
+            parsed=analysis.parsed,
+            hotspots=analysis.hotspots,
+            project_name=llm_context.project_name,
+            settings=llm_context.settings,
+        )
+    return analysis
+
+
+def resolve_workers(workers: int) -> int:
+    """Translate the ``JobSettings.workers`` value into a process count.
+
+    ``1`` keeps the analysis in the calling thread, ``0`` or a negative
+    value means one worker per available CPU.
+    """
+
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def analyze_files(
+    snapshots: Iterable[FileSnapshot],
+    rule_engine: RuleEngine,
+    *,
+    workers: int = 1,
+    llm_context: LLMContext | None = None,
+    lookup: Callable[[FileSnapshot], FileAnalysis | None] | None = None,
+    window: int | None = None,
+    profile_rules: bool = False,
+    minified_policy: str | None = None,
+    rule_budget: float | None = None,
+) -> Iterator[FileAnalysis]:
+    """Yield one :class:`FileAnalysis` per snapshot, in input order.
+
+    ``lookup`` may return a previously computed analysis (e.g. from the
+    analysis cache); those are marked ``cached`` and skip parsing. With more
+    than one worker the CPU-bound parse and rule work runs in a process pool
+    with at most ``window`` files in flight, and results are released in
+    submission order so the caller sees exactly what a serial run produces.
+    ``profile_rules``, ``minified_policy`` and ``rule_budget`` are passed to
+    :func:`analyze_file`.
+    """
+
+    options = {"profile_rules": profile_rules, "minified_policy": minified_policy, "rule_budget": rule_budget}
+    workers = resolve_workers(workers)
+    if workers == 1:
+        for snapshot in snapshots:
+            yield _lookup(snapshot, lookup, llm_context) or analyze_file(snapshot, rule_engine, llm_context, **options)
+        return
+
+    window = window or workers * 4
+    # ``spawn`` avoids forking the multi-threaded job queue process and
+    # behaves the same on Windows, macOS and Linux.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(rule_engine, llm_context, options),
+    ) as pool:
+        pending: Deque[FileAnalysis | Future] = deque()
+        for snapshot in snapshots:
+            pending.append(
+                _lookup(snapshot, lookup, llm_context) or pool.submit(_analyze_in_worker, snapshot)
+            )
+            while len(pending) > window or (pending and _ready(pending[0])):
+                yield _resolve(pending.popleft())
+        while pending:
+            yield _resolve(pending.popleft())
+
+
+def _lookup(
+    snapshot: FileSnapshot,
+    lookup: Callable[[FileSnapshot], FileAnalysis | None] | None,
+    llm_context: LLMContext | None,
+) -> FileAnalysis | None:
+    if lookup is None:
+        return None
+    analysis = lookup(snapshot)
+    if analysis is None:
+        return None
+    analysis.cached = True
+    if llm_context is not None and not analysis.fast_path:
+        attach_dossier(analysis, llm_context)
+    return analysis
+
+
+def _ready(item: FileAnalysis | Future) -> bool:
+    return not isinstance(item, Future) or item.done()
+
+
+def _resolve(item: FileAnalysis | Future) -> FileAnalysis:
+    return item.result() if isinstance(item, Future) else item
+
+
+_worker_engine: RuleEngine | None = None
+_worker_llm_context: LLMContext | None = None
+_worker_options: Dict[str, Any] = {}
+
+
+def _init_worker(rule_engine: RuleEngine, llm_context: LLMContext | None, options: Dict[str, Any]) -> None:
+    global _worker_engine, _worker_llm_context, _worker_options
+    _worker_engine = rule_engine
+    _worker_llm_context = llm_context
+    _worker_options = options
+
+
+def _analyze_in_worker(snapshot: FileSnapshot) -> FileAnalysis:
+    assert _worker_engine is not None, "worker used before initialisation"
+    return analyze_file(snapshot, _worker_engine, _worker_llm_context, **_worker_options)
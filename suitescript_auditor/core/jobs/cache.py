@@ -0,0 +1,186 @@
+"""Content-addressed on-disk cache for per-file analysis products.
+
+Entries are keyed by the file's sha256, the rule-set fingerprint and the
+settings that influence static analysis, so editing a rule or toggling an
+analysis option simply produces new keys; stale entries are never read
+again and age out through the size-bounded LRU eviction.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict
+
+from ..io.snapshot import FileSnapshot
+from ..parsing.call_graph import CallSite
+from ..parsing.module_resolver import ModuleImport
+from ..parsing.parsed_file import ParsedFile
+from ..parsing.suitescript_header import SuiteScriptHeader
+from ..parsing.symbol_index import FunctionEntry
+from ..rules.base import Hotspot
+from ..rules.scoring import ScoreBreakdown
+from .analysis import FileAnalysis
+from .models import JobSettings
+
+# Bump when the serialized layout of an entry changes.
+CACHE_FORMAT = 5
+
+# JobSettings fields that change the static analysis output of a file.
+ANALYSIS_SETTINGS = ("strict_suite_script", "prioritize_transaction_safety", "exclude_minified", "minified_policy")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class AnalysisCache:
+    """Stores :class:`FileAnalysis` products as JSON files under ``root``."""
+
+    def __init__(self, root: Path, *, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] | None = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def key(self, file_hash: str, ruleset: str, settings: JobSettings) -> str:
+        relevant = {name: getattr(settings, name) for name in ANALYSIS_SETTINGS}
+        material = json.dumps(
+            [CACHE_FORMAT, file_hash, ruleset, relevant], sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, snapshot: FileSnapshot, stats: CacheStats | None = None) -> FileAnalysis | None:
+        stats = stats or CacheStats()
+        with self._lock:
+            entries = self._load_entries()
+            if key not in entries:
+                stats.misses += 1
+                return None
+            path = self._path(key)
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                os.utime(path)
+            except (OSError, ValueError):
+                self._drop(key)
+                stats.misses += 1
+                return None
+            entries.move_to_end(key)
+        stats.hits += 1
+        return _decode(data, snapshot)
+
+    def put(self, key: str, analysis: FileAnalysis, stats: CacheStats | None = None) -> None:
+        stats = stats or CacheStats()
+        payload = json.dumps(_encode(analysis), separators=(",", ":")).encode("utf-8")
+        path = self._path(key)
+        with self._lock:
+            entries = self._load_entries()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+            self._total_bytes -= entries.pop(key, 0)
+            entries[key] = len(payload)
+            self._total_bytes += len(payload)
+            stats.writes += 1
+            while self._total_bytes > self.max_bytes and len(entries) > 1:
+                oldest = next(iter(entries))
+                self._drop(oldest)
+                stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_entries()):
+                self._drop(key)
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._load_entries()
+            return self._total_bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_entries())
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _load_entries(self) -> OrderedDict[str, int]:
+        if self._entries is not None:
+            return self._entries
+        found = []
+        if self.root.exists():
+            for path in self.root.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, path.stem, stat.st_size))
+        found.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in found)
+        self._total_bytes = sum(size for _, _, size in found)
+        return self._entries
+
+    def _drop(self, key: str) -> None:
+        assert self._entries is not None
+        self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+
+def _encode(analysis: FileAnalysis) -> Dict[str, Any]:
+    return {
+        "header": asdict(analysis.header),
+        "modules": [asdict(m) for m in analysis.modules],
+        "symbols": [asdict(s) for s in analysis.symbols],
+        "calls": [asdict(c) for c in analysis.parsed.calls],
+        "hotspots": [asdict(h) for h in analysis.hotspots],
+        "score": asdict(analysis.score),
+        "classification": analysis.classification,
+    }
+
+
+def _decode(data: Dict[str, Any], snapshot: FileSnapshot) -> FileAnalysis:
+    symbols = []
+    for raw in data["symbols"]:
+        raw = dict(raw, lines=tuple(raw["lines"]))
+        symbols.append(FunctionEntry(**raw))
+    parsed = ParsedFile(
+        snapshot.text,
+        str(snapshot.source.rel_path),
+        header=SuiteScriptHeader(**data["header"]),
+        modules=[ModuleImport(**m) for m in data["modules"]],
+        symbols=symbols,
+        calls=[CallSite(**c) for c in data["calls"]],
+    )
+    return FileAnalysis(
+        source_file=snapshot.source,
+        file_hash=snapshot.sha256,
+        parsed=parsed,
+        hotspots=[Hotspot(**h) for h in data["hotspots"]],
+        score=ScoreBreakdown(**data["score"]),
+        classification=data["classification"],
+    )
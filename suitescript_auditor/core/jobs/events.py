@@ -0,0 +1,211 @@
+"""Coalescing progress event bus for job subscribers.
+
+Publishers (job threads) only take an immutable :class:`ProgressSnapshot`
+and store it as the latest state of its job, which is O(1) and never calls
+user code. A dispatcher thread forwards the latest snapshots at most
+``rate_hz`` times per second (terminal states are forwarded immediately)
+into per-subscriber mailboxes, and each subscriber is called from its own
+delivery thread. A slow or failing subscriber therefore only delays itself;
+its mailbox keeps one snapshot per job, so it cannot grow without bound.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from .models import Job, JobStage, JobStatus
+
+TERMINAL_STATUSES = frozenset({JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELED})
+
+
+@dataclass(frozen=True)
+class ProgressSnapshot:
+    """Immutable copy of the user-visible fields of a :class:`Job`."""
+
+    id: str
+    project_name: str
+    status: JobStatus
+    stage: JobStage
+    progress: float
+    files_total: int
+    files_processed: int
+    llm_cost: float
+    current_file: str | None
+    error: str | None
+    priority: int
+    timestamp: datetime
+
+    @classmethod
+    def from_job(cls, job: Job) -> "ProgressSnapshot":
+        return cls(
+            id=job.id,
+            project_name=job.project_name,
+            status=job.status,
+            stage=job.stage,
+            progress=job.progress,
+            files_total=job.files_total,
+            files_processed=job.files_processed,
+            llm_cost=job.llm_cost,
+            current_file=job.current_file,
+            error=job.error,
+            priority=job.priority,
+            timestamp=datetime.utcnow(),
+        )
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["status"] = self.status.value
+        data["stage"] = self.stage.value
+        data["timestamp"] = self.timestamp.isoformat()
+        return data
+
+
+Subscriber = Callable[[ProgressSnapshot], None]
+
+
+class _Subscription:
+    def __init__(self, callback: Subscriber) -> None:
+        self.callback = callback
+        self.errors = 0
+        self.delivered = 0
+        self._mailbox: Dict[str, ProgressSnapshot] = {}
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def offer(self, snapshots: Dict[str, ProgressSnapshot]) -> None:
+        with self._cond:
+            self._mailbox.update(snapshots)
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    @property
+    def idle(self) -> bool:
+        with self._cond:
+            return not self._mailbox and not self._busy
+
+    def run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._mailbox and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                batch = list(self._mailbox.values())
+                self._mailbox.clear()
+                self._busy = True
+            for snapshot in batch:
+                try:
+                    self.callback(snapshot)
+                except Exception:  # a broken subscriber must not stop delivery
+                    self.errors += 1
+            with self._cond:
+                self._busy = False
+                self.delivered += len(batch)
+
+
+class EventBus:
+    """Delivers coalesced :class:`ProgressSnapshot` updates to subscribers."""
+
+    def __init__(self, rate_hz: float = 10.0) -> None:
+        self.interval = 1.0 / rate_hz if rate_hz > 0 else 0.0
+        self._subscriptions: List[_Subscription] = []
+        self._latest: Dict[str, ProgressSnapshot] = {}
+        self._urgent = False
+        self._closed = False
+        self._in_flight = False
+        self._dispatcher: threading.Thread | None = None
+        self._cond = threading.Condition()
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Register ``callback``; the returned function unsubscribes it."""
+
+        subscription = _Subscription(callback)
+        with self._cond:
+            self._subscriptions.append(subscription)
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch_loop, name="progress-dispatcher", daemon=True
+                )
+                self._dispatcher.start()
+        threading.Thread(target=subscription.run, name="progress-subscriber", daemon=True).start()
+
+        def unsubscribe() -> None:
+            with self._cond:
+                if subscription in self._subscriptions:
+                    self._subscriptions.remove(subscription)
+            subscription.close()
+
+        return unsubscribe
+
+    def publish(self, job: Job) -> None:
+        with self._cond:
+            if not self._subscriptions:
+                return
+            snapshot = ProgressSnapshot.from_job(job)
+            self._latest[snapshot.id] = snapshot
+            self._urgent = self._urgent or snapshot.terminal
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Deliver pending snapshots now and wait until subscribers are idle."""
+
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._urgent = True
+            self._cond.notify_all()
+        while time.monotonic() < deadline:
+            with self._cond:
+                subscriptions = list(self._subscriptions)
+                pending = bool(self._latest) or self._in_flight
+            if not pending and all(s.idle for s in subscriptions):
+                return True
+            time.sleep(0.005)
+        return False
+
+    def close(self) -> None:
+        self.flush()
+        with self._cond:
+            self._closed = True
+            subscriptions, self._subscriptions = self._subscriptions, []
+            self._cond.notify_all()
+        for subscription in subscriptions:
+            subscription.close()
+
+    @property
+    def subscriber_errors(self) -> int:
+        with self._cond:
+            return sum(s.errors for s in self._subscriptions)
+
+    def _dispatch_loop(self) -> None:
+        last_dispatch = 0.0
+        while True:
+            with self._cond:
+                while not self._latest and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                delay = last_dispatch + self.interval - time.monotonic()
+                if delay > 0 and not self._urgent:
+                    self._cond.wait_for(lambda: self._urgent or self._closed, timeout=delay)
+                batch, self._latest = self._latest, {}
+                self._urgent = False
+                self._in_flight = True
+                subscriptions = list(self._subscriptions)
+            last_dispatch = time.monotonic()
+            for subscription in subscriptions:
+                subscription.offer(batch)
+            with self._cond:
+                self._in_flight = False
@@ -6,7 +6,12 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, auto
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from .timing import JobTimer
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..docs.artifact_store import ArtifactStore
 
 
 class JobSourceType(str, Enum):
@@ -42,11 +47,18 @@ class JobSettings:
     quality_tier: str = "Economic"
     strict_suite_script: bool = True
     prioritize_transaction_safety: bool = True
-    exclude_minified: bool = True
+    exclude_minified: bool = True  # route minified files and bundles to the fast path
+    minified_policy: str = "security"  # fast path: "security" rules only, or "skip" rules
     moe_multiexpert: bool = True
     cost_limit: float | None = None
     llm_mode_label: str = "OFF"
     max_tokens_per_file: int = 2000
+    workers: int = 1  # analysis processes; 1 = serial, 0 = one per CPU
+    use_cache: bool = True
+    pipeline_queue_size: int = 64
+    artifact_mode: str = "full"  # "full" keeps documents in memory, "lazy" keeps handles
+    profile_rules: bool = False  # per-rule timings in index.json["rule_profile"]
+    rule_time_budget: float = 5.0  # seconds per rule and file; 0 disables the budget
 
 
 @dataclass
@@ -59,6 +71,7 @@ class Job:
     settings: JobSettings
     status: JobStatus = JobStatus.PENDING
     stage: JobStage = JobStage.PREPARING
+    priority: int = 0
     progress: float = 0.0
     files_total: int = 0
     files_processed: int = 0
@@ -67,6 +80,7 @@ class Job:
     error: str | None = None
     results: Dict[str, Any] = field(default_factory=dict)
     log: List["JobLogEntry"] = field(default_factory=list)
+    timer: JobTimer = field(default_factory=JobTimer, repr=False, compare=False)
 
     def as_dict(self) -> Dict[str, Any]:
         return {
@@ -76,6 +90,7 @@ class Job:
             "source_type": self.source_type.value,
             "status": self.status.value,
             "stage": self.stage.value,
+            "priority": self.priority,
             "progress": self.progress,
             "files_total": self.files_total,
             "files_processed": self.files_processed,
@@ -83,8 +98,14 @@ class Job:
             "current_file": self.current_file,
             "error": self.error,
             "created_at": self.created_at.isoformat(),
+            "timing": self.timer.as_dict(),
         }
 
+    def add_log(self, message: str, level: str = "info") -> "JobLogEntry":
+        entry = JobLogEntry(timestamp=datetime.utcnow(), level=level, message=message)
+        self.log.append(entry)
+        return entry
+
 
 @dataclass
 class JobLogEntry:
@@ -102,9 +123,43 @@ class FileArtifact:
     summary_markdown: Optional[str] = None
 
 
+@dataclass
+class ArtifactHandle:
+    """Lightweight stand-in for :class:`FileArtifact`.
+
+    Only the path, hash and score stay in memory; the JSON and Markdown
+    documents are read back from ``Docs/`` through a shared LRU on access.
+    """
+
+    path: Path
+    hash: str
+    score: float
+    audit_json_path: Path
+    summary_json_path: Path
+    audit_md_path: Path
+    summary_md_path: Path
+    store: "ArtifactStore" = field(repr=False, compare=False)
+
+    @property
+    def audit_json(self) -> Dict[str, Any]:
+        return self.store.load_json(self.audit_json_path)
+
+    @property
+    def summary_json(self) -> Dict[str, Any]:
+        return self.store.load_json(self.summary_json_path)
+
+    @property
+    def audit_markdown(self) -> str:
+        return self.store.load_text(self.audit_md_path)
+
+    @property
+    def summary_markdown(self) -> str:
+        return self.store.load_text(self.summary_md_path)
+
+
 @dataclass
 class JobResult:
     job: Job
-    artifacts: List[FileArtifact]
+    artifacts: List[Union[FileArtifact, ArtifactHandle]]
     docs_path: Path
     index_json: Dict[str, Any]
@@ -0,0 +1,173 @@
+"""Streaming stage pipeline connected by bounded queues.
+
+Each stage runs in its own thread and hands items to the next one through a
+:class:`Channel`. Channels are bounded, so a slow consumer (a network disk,
+an LLM call) applies backpressure upstream instead of letting work pile up
+in memory, while faster stages keep overlapping with it.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List
+
+_CLOSED = object()
+_POLL_SECONDS = 0.1
+
+
+class PipelineCancelled(RuntimeError):
+    """Raised inside a stage when another stage failed."""
+
+
+@dataclass
+class StageStats:
+    name: str
+    items: int = 0
+    wait_seconds: float = 0.0
+    started_at: float | None = None
+    finished_at: float | None = None
+    input: "Channel | None" = field(default=None, repr=False)
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def busy_seconds(self) -> float:
+        return max(0.0, self.wall_seconds - self.wait_seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        wall = self.wall_seconds
+        return {
+            "items": self.items,
+            "wall_seconds": round(wall, 4),
+            "busy_seconds": round(self.busy_seconds, 4),
+            "items_per_second": round(self.items / wall, 2) if wall else 0.0,
+            "queue_depth": self.input.depth if self.input else 0,
+            "max_queue_depth": self.input.max_depth if self.input else 0,
+        }
+
+
+class Channel:
+    """Bounded FIFO between two stages; closing it ends the consumer loop."""
+
+    def __init__(self, name: str, capacity: int, stop: threading.Event) -> None:
+        self.name = name
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, capacity))
+        self._stop = stop
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def put(self, item: Any, stats: StageStats | None = None) -> None:
+        waited_from = time.perf_counter()
+        while True:
+            if self._stop.is_set():
+                raise PipelineCancelled(self.name)
+            try:
+                self._queue.put(item, timeout=_POLL_SECONDS)
+                break
+            except queue.Full:
+                continue
+        if stats is not None:
+            stats.wait_seconds += time.perf_counter() - waited_from
+            if item is not _CLOSED:
+                stats.items += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def close(self) -> None:
+        try:
+            self.put(_CLOSED)
+        except PipelineCancelled:
+            pass
+
+    def drain(self, stats: StageStats | None = None) -> Iterator[Any]:
+        """Yield items until the producer closes the channel."""
+
+        while True:
+            waited_from = time.perf_counter()
+            while True:
+                if self._stop.is_set():
+                    raise PipelineCancelled(self.name)
+                try:
+                    item = self._queue.get(timeout=_POLL_SECONDS)
+                    break
+                except queue.Empty:
+                    continue
+            if stats is not None:
+                stats.wait_seconds += time.perf_counter() - waited_from
+            if item is _CLOSED:
+                return
+            yield item
+
+
+class Pipeline:
+    """Owns the stage threads, their channels and their statistics."""
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.capacity = capacity
+        self.stages: Dict[str, StageStats] = {}
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._errors: List[BaseException] = []
+
+    def channel(self, name: str) -> Channel:
+        return Channel(name, self.capacity, self._stop)
+
+    def stats(self, name: str, input: Channel | None = None) -> StageStats:
+        stats = StageStats(name=name, input=input, started_at=time.perf_counter())
+        self.stages[name] = stats
+        return stats
+
+    def start(
+        self,
+        name: str,
+        target: Callable[[StageStats], None],
+        *,
+        input: Channel | None = None,
+        output: Channel | None = None,
+    ) -> None:
+        """Run ``target`` in a thread; ``output`` is closed when it returns."""
+
+        stats = self.stats(name, input)
+        thread = threading.Thread(
+            target=self._run_stage, args=(target, stats, output), name=f"pipeline-{name}", daemon=True
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def finish(self, stats: StageStats) -> None:
+        stats.finished_at = time.perf_counter()
+
+    def cancel(self) -> None:
+        self._stop.set()
+        self.join(raise_errors=False)
+
+    def join(self, raise_errors: bool = True) -> None:
+        for thread in self._threads:
+            thread.join()
+        if raise_errors and self._errors:
+            raise self._errors[0]
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.as_dict() for name, stats in self.stages.items()}
+
+    def _run_stage(self, target: Callable[[StageStats], None], stats: StageStats, output: Channel | None) -> None:
+        try:
+            target(stats)
+        except PipelineCancelled:
+            pass
+        except BaseException as exc:  # propagate to the caller through join()
+            self._errors.append(exc)
+            self._stop.set()
+        finally:
+            self.finish(stats)
+            if output is not None:
+                output.close()
@@ -8,18 +8,22 @@ from datetime import datetime
 from pathlib import Path
 from typing import Callable, Dict, List
 
+from ..config.defaults import defaults
+from .events import EventBus, Subscriber
 from .models import Job, JobSettings, JobSourceType, JobStatus
 from .runner import JobRunner
+from .scheduler import JobScheduler, ResourceHint
 
 
 class JobQueue:
-    """Queues jobs and dispatches them to worker threads."""
+    """Queues jobs and dispatches them to a bounded set of worker threads."""
 
-    def __init__(self, runner: JobRunner | None = None) -> None:
+    def __init__(self, runner: JobRunner | None = None, max_concurrent: int | None = None) -> None:
         self._runner = runner or JobRunner()
         self._jobs: Dict[str, Job] = {}
-        self._subscribers: List[Callable[[Job], None]] = []
+        self._events = EventBus(rate_hz=defaults.progress_rate_hz)
         self._lock = threading.Lock()
+        self._scheduler = JobScheduler(max_concurrent or defaults.max_concurrent_jobs)
 
     def submit_job(
         self,
@@ -28,6 +32,8 @@ class JobQueue:
         source: Path,
         source_type: JobSourceType,
         settings: JobSettings | None = None,
+        priority: int = 0,
+        hint: ResourceHint | None = None,
     ) -> Job:
         job_id = uuid.uuid4().hex[:8]
         job = Job(
@@ -37,28 +43,61 @@ class JobQueue:
             source_type=source_type,
             created_at=datetime.utcnow(),
             settings=settings or JobSettings(),
+            priority=priority,
         )
+        # Sizing a source walks the whole tree or archive; callers (the Tk UI
+        # thread among them) must not wait for it. Until the estimate lands
+        # the scheduler treats the job as large.
+        sizing = hint is None and getattr(self._runner, "estimate", None) is not None
         with self._lock:
             self._jobs[job_id] = job
+            self._scheduler.enqueue(job, hint, sizing=sizing)
         self._notify(job)
-        thread = threading.Thread(target=self._run_job, args=(job,), daemon=True)
-        thread.start()
+        self._dispatch()
+        if sizing:
+            threading.Thread(target=self._estimate, args=(job,), daemon=True).start()
         return job
 
     def list_jobs(self) -> List[Job]:
         with self._lock:
             return list(self._jobs.values())
 
-    def subscribe(self, callback: Callable[[Job], None]) -> None:
-        self._subscribers.append(callback)
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Receive coalesced :class:`ProgressSnapshot` updates off the job threads."""
+
+        return self._events.subscribe(callback)
+
+    def flush_events(self, timeout: float = 5.0) -> bool:
+        return self._events.flush(timeout)
 
     def get_job(self, job_id: str) -> Job | None:
         with self._lock:
             return self._jobs.get(job_id)
 
+    def queue_position(self, job: Job) -> int | None:
+        with self._lock:
+            return self._scheduler.position(job)
+
     def _notify(self, job: Job) -> None:
-        for callback in self._subscribers:
-            callback(job)
+        self._events.publish(job)
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._lock:
+                job = self._scheduler.next_job()
+            if job is None:
+                return
+            thread = threading.Thread(target=self._run_job, args=(job,), daemon=True)
+            thread.start()
+
+    def _estimate(self, job: Job) -> None:
+        try:
+            hint = self._runner.estimate(job)
+        except Exception:  # pragma: no cover - guard rail; never leave the job marked large
+            hint = ResourceHint()
+        with self._lock:
+            self._scheduler.update_hint(job, hint)
+        self._dispatch()
 
     def _run_job(self, job: Job) -> None:
         try:
@@ -66,4 +105,9 @@ class JobQueue:
         except Exception as exc:  # pragma: no cover - guard rail
             job.status = JobStatus.FAILED
             job.error = str(exc)
+            job.add_log(f"Job failed during {job.stage.value}: {exc}", level="error")
             self._notify(job)
+        finally:
+            with self._lock:
+                self._scheduler.release(job)
+            self._dispatch()
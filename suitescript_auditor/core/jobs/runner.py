@@ -4,21 +4,20 @@ from __future__ import annotations
 
 import json
 import shutil
-import threading
+import time
+import zipfile
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 
 from ..config.defaults import defaults
+from ..docs.aggregator import IndexAggregator
+from ..docs.artifact_store import ArtifactStore
 from ..docs.index_builder import build_index
 from ..docs.writer import DocsWriter, FileDocsPayload
-from ..io import discovery, hashing, workspace, zip_handler
-from ..parsing import module_resolver, suitescript_header
-from ..parsing.line_map import LineMap
-from ..parsing.symbol_index import build_symbol_index
-from ..rules import verifier
-from ..rules.base import RuleContext
-from ..rules.scoring import compute_score
+from ..io import discovery, snapshot, workspace, zip_handler
+from ..parsing.call_graph import CallIndex, CallSite
+from ..parsing.module_graph import ModuleGraph
 from ..rules.suitescript import (
     clientscript_rules,
     data_integrity_rules,
@@ -28,8 +27,10 @@ from ..rules.suitescript import (
     suitelet_rules,
     userevent_rules,
 )
-from ..rules.base import Hotspot, RuleEngine
-from ..llm import dossier, router
+from ..rules.base import RuleEngine
+from ..rules.packs import RulePackError, load_rule_packs
+from ..rules.profiler import RuleProfile
+from ..llm import router
 from ..llm.orchestrator import LLMOrchestrator
 from ..llm.experts.expert_clientscript import ClientScriptExpert
 from ..llm.experts.expert_mapreduce import MapReduceExpert
@@ -37,23 +38,61 @@ from ..llm.experts.expert_security import SecurityExpert
 from ..llm.experts.expert_suitelet import SuiteletExpert
 from ..llm.experts.expert_userevent import UserEventExpert
 from ..jobs.cost_tracker import CostTracker
-from .models import FileArtifact, Job, JobResult, JobStage, JobStatus
+from .analysis import FileAnalysis, LLMContext, analyze_files
+from .cache import AnalysisCache, CacheStats
+from .pipeline import Pipeline, PipelineCancelled, StageStats
+from .scheduler import ResourceHint
+from .timing import FileTiming, Span, measure
+from .models import ArtifactHandle, FileArtifact, Job, JobResult, JobStage, JobStatus
+
+
+def default_rule_engine(rule_packs: Iterable[Path] = (), pack_cache_dir: Path | None = None) -> RuleEngine:
+    """Rule engine with every built-in SuiteScript rule, in report order.
+
+    Rules of the ``rule_packs`` files and folders (see :mod:`..rules.packs`)
+    follow the built-in ones; compiled packs are cached in ``pack_cache_dir``.
+    """
+
+    rules = (
+        governance_rules.get_rules()
+        + data_integrity_rules.get_rules()
+        + security_rules.get_rules()
+        + userevent_rules.get_rules()
+        + suitelet_rules.get_rules()
+        + clientscript_rules.get_rules()
+        + mapreduce_rules.get_rules()
+    )
+    built_in = {rule.rule_id for rule in rules}
+    for rule in load_rule_packs(rule_packs, pack_cache_dir):
+        if rule.rule_id in built_in:
+            raise RulePackError(f"Rule pack id {rule.rule_id!r} clashes with a built-in rule")
+        rules.append(rule)
+    return RuleEngine(rules)
+
+
+# Per-file phases (see ``FileAnalysis.timings``) and the stage they count towards.
+PHASE_STAGES = {
+    "read": JobStage.PARSING,
+    "parse": JobStage.PARSING,
+    "rules": JobStage.RULES,
+    "llm": JobStage.LLM,
+    "write": JobStage.WRITING,
+}
 
 
 class JobRunner:
     """Executes a job pipeline in a worker thread."""
 
-    def __init__(self) -> None:
+    def __init__(self, cache_dir: Path | None = None, rule_packs: Iterable[Path] | None = None) -> None:
         self.workspace = workspace.WorkspaceManager()
-        self.rule_engine = RuleEngine(
-            governance_rules.get_rules()
-            + data_integrity_rules.get_rules()
-            + security_rules.get_rules()
-            + userevent_rules.get_rules()
-            + suitelet_rules.get_rules()
-            + clientscript_rules.get_rules()
-            + mapreduce_rules.get_rules()
+        self.cache = AnalysisCache(
+            cache_dir or self.workspace.root / "cache",
+            max_bytes=defaults.cache_max_mb * 1024 * 1024,
         )
+        if rule_packs is None:
+            rule_packs = [Path(path) for path in defaults.rule_packs]
+        # Kept apart from the analysis cache, which owns every entry under its root.
+        self.rule_engine = default_rule_engine(rule_packs, self.workspace.root / "rule_packs")
         self.orchestrator = LLMOrchestrator(
             {
                 "expert_clientscript": ClientScriptExpert(),
@@ -67,127 +106,165 @@ class JobRunner:
     def run(self, job: Job, on_update: Callable[[Job], None] | None = None) -> JobResult:
         job.status = JobStatus.RUNNING
         job.stage = JobStage.PREPARING
+        timer = job.timer
+        timer.start()
         self._notify(job, on_update)
 
-        workdir = self.workspace.create(job.id)
-        source_root = self._prepare_source(job, workdir)
+        with timer.stage(JobStage.PREPARING) as span:
+            workdir = self.workspace.create(job.id)
+            source_root = self._prepare_source(job, workdir)
+        job.add_log(f"Workspace ready in {span.wall_seconds:.2f}s")
 
+        for warning in self.rule_engine.lint:
+            job.add_log(f"Rule pattern warning: {warning}")
         job.stage = JobStage.DISCOVERING
         self._notify(job, on_update)
-        files = discovery.discover(source_root)
-        job.files_total = len(files)
 
         docs_dir = source_root / defaults.docs_dir_name
         writer = DocsWriter(docs_dir)
-        artifacts: List[FileArtifact] = []
+        artifacts: List[FileArtifact | ArtifactHandle] = []
+        artifact_store = ArtifactStore() if job.settings.artifact_mode == "lazy" else None
         cost_tracker = CostTracker()
+        aggregator = IndexAggregator()
+        rule_profile = RuleProfile() if job.settings.profile_rules else None
+        module_graph = ModuleGraph()
+        call_index = CallIndex(module_graph)
+
+        llm_context = (
+            LLMContext(project_name=job.project_name, settings=job.settings.__dict__)
+            if job.settings.llm_mode
+            else None
+        )
+        cache_stats = CacheStats()
+
+        # discovery -> parse/rules -> LLM -> docs writer (this thread); each
+        # arrow is a bounded queue so a slow stage throttles its producers.
+        pipeline = Pipeline(capacity=job.settings.pipeline_queue_size)
+        discovered = pipeline.channel("discovered")
+        analyzed = pipeline.channel("analyzed")
+        enriched = pipeline.channel("enriched")
+
+        def discovery_stage(stats: StageStats) -> None:
+            cpu = time.thread_time()
+            for source_file in discovery.iter_discover(source_root):
+                job.files_total += 1
+                module_graph.add_file(source_file)
+                discovered.put(source_file, stats)
+            # Time spent blocked on a full queue is backpressure, not discovery.
+            timer.add(JobStage.DISCOVERING, Span(stats.busy_seconds, time.thread_time() - cpu))
+            job.add_log(f"Discovered {job.files_total} files in {stats.busy_seconds:.2f}s")
+
+        def analysis_stage(stats: StageStats) -> None:
+            for analysis in self._analyze(job, discovered.drain(stats), llm_context, cache_stats):
+                analyzed.put(analysis, stats)
 
+        def llm_stage(stats: StageStats) -> None:
+            for analysis in analyzed.drain(stats):
+                if analysis.dossier is not None:
+                    with measure(analysis.timings.setdefault("llm", Span())):
+                        expert_route = router.route(analysis.header.script_type)
+                        self.orchestrator.analyze(analysis.dossier, expert_route.experts)
+                        cost_tracker.add_usage(tokens_in=200, tokens_out=50)
+                enriched.put(analysis, stats)
+
+        job.files_total = 0
+        pipeline.start("discovery", discovery_stage, output=discovered)
+        pipeline.start("analysis", analysis_stage, input=discovered, output=analyzed)
+        pipeline.start("llm", llm_stage, input=analyzed, output=enriched)
+        writer_stats = pipeline.stats("writer", enriched)
         job.stage = JobStage.PARSING
-        self._notify(job, on_update)
-        ranking_files: List[Dict] = []
-        global_hotspots: List[Dict] = []
-
-        for idx, source_file in enumerate(files, start=1):
-            job.current_file = str(source_file.rel_path)
-            job.files_processed = idx
-            job.progress = idx / max(1, job.files_total)
-            self._notify(job, on_update)
-
-            text = source_file.path.read_text(encoding="utf-8", errors="ignore")
-            line_map = LineMap.from_text(text)
-            header = suitescript_header.parse_header(text)
-            modules = module_resolver.find_modules(text)
-            symbols = build_symbol_index(text)
-            context = RuleContext(
-                path=str(source_file.rel_path),
-                text=text,
-                script_type=header.script_type,
-                api_version=header.api_version,
-                line_map=line_map,
-            )
-            hotspots = verifier.verify_ranges(self.rule_engine.run(context))
-
-            if job.settings.llm_mode:
-                expert_route = router.route(header.script_type)
-                dossier_payload = dossier.build_dossier(
-                    path=source_file.rel_path,
-                    text=text,
-                    line_map=line_map,
+
+        try:
+            for idx, analysis in enumerate(enriched.drain(writer_stats), start=1):
+                source_file = analysis.source_file
+                header = analysis.header
+                module_graph.set_imports(source_file.rel_path, (module.specifier for module in analysis.modules))
+                call_index.add_file(source_file.rel_path.as_posix(), analysis.calls)
+                hotspots = analysis.hotspots
+                job.current_file = str(source_file.rel_path)
+                job.files_processed = idx
+                job.progress = idx / max(1, job.files_total)
+                job.results["pipeline"] = pipeline.as_dict()
+                self._notify(job, on_update)
+
+                write_started, write_cpu = time.perf_counter(), time.thread_time()
+                file_score = analysis.score
+                audit = self._build_audit_payload(
+                    job=job,
+                    source_file=source_file,
+                    file_hash=analysis.file_hash,
                     header=header,
-                    modules=modules,
-                    symbols=symbols,
                     hotspots=hotspots,
-                    project_name=job.project_name,
-                    settings=job.settings.__dict__,
+                    score=file_score,
                 )
-                llm_result = self.orchestrator.analyze(dossier_payload, expert_route.experts)
-                cost_tracker.add_usage(tokens_in=200, tokens_out=50)
-            else:
-                llm_result = None
-
-            file_score = compute_score(hotspots)
-            audit = self._build_audit_payload(
-                job=job,
-                source_file=source_file,
-                header=header,
-                line_map=line_map,
-                hotspots=hotspots,
-                score=file_score,
-            )
-            summary = self._build_summary_payload(
-                job=job,
-                source_file=source_file,
-                header=header,
-                symbols=symbols,
-                modules=modules,
-            )
-            paths = writer.write(
-                FileDocsPayload(rel_path=source_file.rel_path, audit=audit, summary=summary)
-            )
-            artifacts.append(
-                FileArtifact(
-                    path=source_file.path,
-                    audit_json=audit,
-                    summary_json=summary,
-                    audit_markdown=paths["audit_md"].read_text(encoding="utf-8"),
-                    summary_markdown=paths["summary_md"].read_text(encoding="utf-8"),
+                summary = self._build_summary_payload(job=job, parsed=analysis.parsed, file_hash=analysis.file_hash)
+                docs_payload = writer.render(
+                    FileDocsPayload(rel_path=source_file.rel_path, audit=audit, summary=summary)
                 )
-            )
-            ranking_files.append(
-                {
-                    "path": str(source_file.rel_path),
-                    "score_overall": file_score.overall,
-                    "hotspots_high": len([h for h in hotspots if h.severity == "HIGH"]),
-                    "scriptType": header.script_type,
-                }
-            )
-            for hotspot in hotspots:
-                global_hotspots.append(
+                paths = writer.write(docs_payload)
+                writer_stats.items += 1
+                if artifact_store is not None:
+                    artifacts.append(
+                        ArtifactHandle(
+                            path=source_file.path,
+                            hash=analysis.file_hash,
+                            score=file_score.overall,
+                            audit_json_path=paths["audit_json"],
+                            summary_json_path=paths["summary_json"],
+                            audit_md_path=paths["audit_md"],
+                            summary_md_path=paths["summary_md"],
+                            store=artifact_store,
+                        )
+                    )
+                else:
+                    artifacts.append(
+                        FileArtifact(
+                            path=source_file.path,
+                            audit_json=audit,
+                            summary_json=summary,
+                            audit_markdown=docs_payload.audit_markdown,
+                            summary_markdown=docs_payload.summary_markdown,
+                        )
+                    )
+                aggregator.add_file(
                     {
-                        "severity": hotspot.severity,
-                        "title": hotspot.title,
-                        "file": str(source_file.rel_path),
-                        "line_range": f"{hotspot.start_line}-{hotspot.end_line}",
-                    }
+                        "path": str(source_file.rel_path),
+                        "score_overall": file_score.overall,
+                        "hotspots_high": len([h for h in hotspots if h.severity == "HIGH"]),
+                        "scriptType": header.script_type,
+                    },
+                    (
+                        {
+                            "severity": hotspot.severity,
+                            "title": hotspot.title,
+                            "file": str(source_file.rel_path),
+                            "line_range": f"{hotspot.start_line}-{hotspot.end_line}",
+                        }
+                        for hotspot in hotspots
+                    ),
                 )
+                write_span = Span(time.perf_counter() - write_started, time.thread_time() - write_cpu)
+                self._record_file(job, analysis, write_span)
+                if rule_profile is not None and analysis.rule_profile is not None:
+                    rule_profile.merge(analysis.rule_profile)
+        except PipelineCancelled:
+            pipeline.join()  # re-raises the failing stage's error
+            raise
+        except BaseException:
+            pipeline.cancel()
+            raise
+        pipeline.finish(writer_stats)
+        pipeline.join()
+        cached = sum(1 for timing in timer.files if timing.cached)
+        fast_path = sum(1 for timing in timer.files if timing.classification != "source")
+        job.add_log(
+            f"Analysed {job.files_processed} files ({cached} from cache, {fast_path} minified/bundled) "
+            f"in {writer_stats.wall_seconds:.2f}s"
+        )
 
         job.stage = JobStage.WRITING
         self._notify(job, on_update)
 
-        top_hotspots = sorted(
-            global_hotspots, key=lambda h: {"HIGH": 0, "MED": 1, "LOW": 2}.get(h["severity"], 3)
-        )[:10]
-
-        counts = {
-            "files": len(ranking_files),
-            "critical_files": sum(1 for r in ranking_files if r["score_overall"] <= 3),
-            "hotspots_high": sum(1 for h in global_hotspots if h["severity"] == "HIGH"),
-            "hotspots_med": sum(1 for h in global_hotspots if h["severity"] == "MED"),
-            "hotspots_low": sum(1 for h in global_hotspots if h["severity"] == "LOW"),
-        }
-        summary_scores = {
-            "overall": sum(r["score_overall"] for r in ranking_files) / max(1, len(ranking_files)),
-        }
         project_payload = {
             "name": job.project_name,
             "source": str(job.source),
@@ -195,35 +272,140 @@ class JobRunner:
             "timestamp": datetime.utcnow().isoformat(),
             "settings": job.settings.__dict__,
         }
-        build_index(
-            docs_root=docs_dir,
-            project=project_payload,
-            summary_scores=summary_scores,
-            counts=counts,
-            ranking_files=ranking_files,
-            top_hotspots=top_hotspots,
-            llm_usage={
-                "tokens_in": cost_tracker.tokens_input,
-                "tokens_out": cost_tracker.tokens_output,
-                "cost_total": cost_tracker.usd_cost,
-            },
-        )
+        with timer.stage(JobStage.WRITING):
+            build_index(
+                docs_root=docs_dir,
+                project=project_payload,
+                aggregator=aggregator,
+                llm_usage={
+                    "tokens_in": cost_tracker.tokens_input,
+                    "tokens_out": cost_tracker.tokens_output,
+                    "cost_total": cost_tracker.usd_cost,
+                },
+                extra={
+                    "timing": timer.as_dict(include_files=True),
+                    "module_graph": module_graph.as_dict(),
+                    "call_graph": call_index.as_dict(),
+                    "rule_engine": self.rule_engine.diagnostics(),
+                    **({"rule_profile": rule_profile.as_dict()} if rule_profile is not None else {}),
+                },
+            )
 
         job.stage = JobStage.PACKAGING
         self._notify(job, on_update)
-        archive_path = shutil.make_archive(str(docs_dir / "artifacts/Docs"), "zip", docs_dir)
-        job.results = {"docs_path": str(docs_dir), "archive": archive_path}
+        with timer.stage(JobStage.PACKAGING) as span:
+            archive_path = self._package(docs_dir, workdir)
+        job.add_log(f"Packaged {Path(archive_path).name} in {span.wall_seconds:.2f}s")
+        timer.finish()
+        # The index is final once packaged, so Docs.zip and the copy on disk
+        # agree; packaging time is reported in the job's own timing.
+        index_json = json.loads((docs_dir / "index.json").read_text(encoding="utf-8"))
+        job.results = {
+            "docs_path": str(docs_dir),
+            "archive": archive_path,
+            "cache": cache_stats.as_dict() if job.settings.use_cache else None,
+            "pipeline": pipeline.as_dict(),
+            "rule_profile": rule_profile.as_dict() if rule_profile is not None else None,
+        }
         job.stage = JobStage.COMPLETE
         job.status = JobStatus.COMPLETED
         job.llm_cost = cost_tracker.usd_cost
         job.progress = 1.0
+        throughput = timer.as_dict()["throughput"]
+        job.add_log(
+            f"Completed in {timer.elapsed_seconds:.2f}s "
+            f"({throughput['files_per_second']} files/s, {throughput['bytes_per_second'] / 1e6:.2f} MB/s)"
+        )
         self._notify(job, on_update)
 
-        return JobResult(
-            job=job,
-            artifacts=artifacts,
-            docs_path=docs_dir,
-            index_json=json.loads((docs_dir / "index.json").read_text(encoding="utf-8")),
+        return JobResult(job=job, artifacts=artifacts, docs_path=docs_dir, index_json=index_json)
+
+    def estimate(self, job: Job) -> ResourceHint:
+        """Cheap size estimate for the scheduler, taken before the job runs."""
+
+        hint = ResourceHint()
+        try:
+            if job.source_type.value == "zip":
+                for member in zip_handler.iter_members(job.source):
+                    if discovery.matches(member.filename):
+                        hint.file_count += 1
+                        hint.total_bytes += member.file_size
+            else:
+                for source_file in discovery.iter_discover(job.source):
+                    hint.file_count += 1
+                    hint.total_bytes += source_file.size
+        except (OSError, zipfile.BadZipFile):
+            pass
+        return hint
+
+    def _analyze(
+        self,
+        job: Job,
+        files: Iterable[discovery.SourceFile],
+        llm_context: LLMContext | None,
+        stats: CacheStats,
+    ) -> Iterator[FileAnalysis]:
+        """Read each file once, serve unchanged ones from the cache and analyse the rest."""
+
+        reads: Dict[Path, Span] = {}
+
+        def read(source_file: discovery.SourceFile) -> snapshot.FileSnapshot:
+            with measure(reads.setdefault(source_file.path, Span())):
+                return snapshot.read_snapshot(source_file)
+
+        snapshots = (read(source_file) for source_file in files)
+        lookup = None
+        if job.settings.use_cache:
+            ruleset = self.rule_engine.fingerprint()
+
+            def lookup(file_snapshot: snapshot.FileSnapshot) -> FileAnalysis | None:
+                key = self.cache.key(file_snapshot.sha256, ruleset, job.settings)
+                return self.cache.get(key, file_snapshot, stats)
+
+        for analysis in analyze_files(
+            snapshots,
+            self.rule_engine,
+            workers=job.settings.workers,
+            llm_context=llm_context,
+            lookup=lookup,
+            profile_rules=job.settings.profile_rules,
+            minified_policy=job.settings.minified_policy if job.settings.exclude_minified else None,
+            rule_budget=job.settings.rule_time_budget or None,
+        ):
+            # A timeout depends on the machine and its load, not on the file.
+            if job.settings.use_cache and not analysis.cached and not analysis.degraded:
+                self.cache.put(self.cache.key(analysis.file_hash, ruleset, job.settings), analysis, stats)
+            analysis.timings["read"] = reads.pop(analysis.source_file.path, Span())
+            yield analysis
+
+    def _package(self, docs_dir: Path, workdir: Path) -> str:
+        """Zip ``docs_dir`` into ``docs_dir/artifacts/Docs.zip``.
+
+        The archive is built in the job workspace and moved into place
+        afterwards; writing it straight into the tree being zipped makes
+        ``make_archive`` read its own growing output.
+        """
+
+        target = docs_dir / "artifacts" / "Docs.zip"
+        target.unlink(missing_ok=True)
+        staged = shutil.make_archive(str(workdir / "Docs-package"), "zip", docs_dir)
+        return str(shutil.move(staged, target))
+
+    def _record_file(self, job: Job, analysis: FileAnalysis, write_span: Span) -> None:
+        """Charge a finished file's phases to its stages and per-file timings."""
+
+        phases = {name: analysis.timings[name] for name in PHASE_STAGES if name in analysis.timings}
+        phases["write"] = write_span
+        for name, span in phases.items():
+            job.timer.add(PHASE_STAGES[name], span)
+        job.timer.add_file(
+            FileTiming(
+                path=str(analysis.source_file.rel_path),
+                bytes=analysis.source_file.size,
+                phases=phases,
+                cached=analysis.cached,
+                classification=analysis.classification,
+            )
         )
 
     def _prepare_source(self, job: Job, workdir: Path) -> Path:
@@ -231,8 +413,7 @@ class JobRunner:
             return zip_handler.extract(job.source, workdir)
         return job.source
 
-    def _build_audit_payload(self, job: Job, source_file, header, line_map, hotspots, score):
-        file_hash = hashing.sha256_file(source_file.path)
+    def _build_audit_payload(self, job: Job, source_file, file_hash, header, hotspots, score):
         formatted_hotspots = []
         for idx, h in enumerate(hotspots, start=1):
             formatted_hotspots.append(
@@ -262,8 +443,8 @@ class JobRunner:
             "fix_plan": [h.title for h in hotspots[:7]],
         }
 
-    def _build_summary_payload(self, job, source_file, header, symbols, modules):
-        file_hash = hashing.sha256_file(source_file.path)
+    def _build_summary_payload(self, job, parsed, file_hash):
+        header, symbols, modules = parsed.header, parsed.symbols, parsed.modules
         entry_points = [
             {
                 "name": fn.name,
@@ -285,17 +466,38 @@ class JobRunner:
             for fn in symbols
         ]
         return {
-            "path": str(source_file.rel_path),
+            "path": parsed.path,
             "hash": file_hash,
             "scriptType": header.script_type,
             "apiVersion": header.api_version,
-            "overview": f"{source_file.rel_path} contains {len(symbols)} functions and {len(modules)} modules.",
+            "overview": f"{parsed.path} contains {len(symbols)} functions and {len(modules)} modules.",
             "entry_points": entry_points,
             "functions": functions,
             "modules_used": [m.specifier for m in modules],
-            "call_graph_lite": [],
+            "call_graph_lite": _call_graph_lite(parsed.calls),
         }
 
     def _notify(self, job: Job, callback: Callable[[Job], None] | None) -> None:
         if callback:
             callback(job)
+
+
+def _call_graph_lite(calls: List[CallSite]) -> List[Dict[str, object]]:
+    """One edge per caller/callee pair: first line, call count, any call in a loop."""
+
+    edges: Dict[Tuple[str, str], Dict[str, object]] = {}
+    for call in calls:
+        edge = edges.get((call.caller, call.callee))
+        if edge is None:
+            edges[(call.caller, call.callee)] = {
+                "from": call.caller,
+                "to": call.callee,
+                "module": call.module,
+                "line": call.line,
+                "calls": 1,
+                "in_loop": call.in_loop,
+            }
+        else:
+            edge["calls"] += 1
+            edge["in_loop"] = edge["in_loop"] or call.in_loop
+    return list(edges.values())
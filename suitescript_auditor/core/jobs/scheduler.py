@@ -0,0 +1,131 @@
+"""Admission policy for queued jobs."""
+
+from __future__ import annotations
+
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from .models import Job
+
+
+@dataclass
+class ResourceHint:
+    """Cheap size estimate handed to the scheduler before a job runs."""
+
+    file_count: int = 0
+    total_bytes: int = 0
+
+
+@dataclass
+class _Ticket:
+    job: Job
+    hint: ResourceHint
+    seq: int
+    enqueued_at: float
+    large: bool = False
+
+
+class JobScheduler:
+    """Decides which pending job runs next under a concurrency cap.
+
+    Ordering rules, applied in turn:
+
+    * higher ``Job.priority`` first, where every ``aging_seconds`` spent
+      waiting adds one level so low-priority work cannot starve;
+    * round-robin across projects, so one team submitting many jobs does not
+      lock out the others;
+    * FIFO within a project.
+
+    Jobs whose hint exceeds ``large_job_files`` / ``large_job_bytes`` may hold
+    at most ``max_concurrent - 1`` slots, keeping one lane free for small jobs.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        *,
+        aging_seconds: float = 60.0,
+        large_job_files: int = 2000,
+        large_job_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.aging_seconds = aging_seconds
+        self.large_job_files = large_job_files
+        self.large_job_bytes = large_job_bytes
+        self._clock = clock
+        self._pending: List[_Ticket] = []
+        self._running: Dict[str, _Ticket] = {}
+        self._project_turns: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self._dispatches = itertools.count(1)
+
+    def enqueue(self, job: Job, hint: ResourceHint | None = None, *, sizing: bool = False) -> None:
+        """Queue ``job``; with ``sizing`` its size is still being estimated.
+
+        A job being sized counts as large until :meth:`update_hint` says
+        otherwise, so a big source cannot take the small-job lane meanwhile.
+        """
+
+        hint = hint or ResourceHint()
+        large = sizing or self._large(hint)
+        self._pending.append(_Ticket(job=job, hint=hint, seq=next(self._seq), enqueued_at=self._clock(), large=large))
+
+    def update_hint(self, job: Job, hint: ResourceHint) -> None:
+        """Replace the hint of a pending or running job once its size is known."""
+
+        ticket = self._running.get(job.id) or next((t for t in self._pending if t.job.id == job.id), None)
+        if ticket is not None:
+            ticket.hint = hint
+            ticket.large = self._large(hint)
+
+    def next_job(self) -> Job | None:
+        """Pop the next job to start, or ``None`` if none may start now."""
+
+        if len(self._running) >= self.max_concurrent or not self._pending:
+            return None
+        large_running = sum(1 for ticket in self._running.values() if ticket.large)
+        large_allowed = large_running < max(1, self.max_concurrent - 1)
+        candidates = [t for t in self._pending if large_allowed or not t.large]
+        if not candidates:
+            return None
+        now = self._clock()
+        ticket = min(candidates, key=lambda t: self._order_key(t, now))
+        self._pending.remove(ticket)
+        self._running[ticket.job.id] = ticket
+        self._project_turns[ticket.job.project_name] = next(self._dispatches)
+        return ticket.job
+
+    def release(self, job: Job) -> None:
+        self._running.pop(job.id, None)
+
+    def position(self, job: Job) -> int | None:
+        """1-based place of a pending job in the current dispatch order."""
+
+        now = self._clock()
+        ordered = sorted(self._pending, key=lambda t: self._order_key(t, now))
+        for idx, ticket in enumerate(ordered, start=1):
+            if ticket.job.id == job.id:
+                return idx
+        return None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def _large(self, hint: ResourceHint) -> bool:
+        return hint.file_count >= self.large_job_files or hint.total_bytes >= self.large_job_bytes
+
+    def _order_key(self, ticket: _Ticket, now: float) -> tuple:
+        aged = int((now - ticket.enqueued_at) // self.aging_seconds) if self.aging_seconds > 0 else 0
+        return (
+            -(ticket.job.priority + aged),
+            self._project_turns.get(ticket.job.project_name, 0),
+            ticket.seq,
+        )
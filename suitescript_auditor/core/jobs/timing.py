@@ -0,0 +1,199 @@
+"""Wall/CPU timing of job stages and individual files."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Tuple
+
+from ..docs.aggregator import percentile
+
+PERCENTILES = (50, 90, 99)
+# Per-file phases that depend on how a file is analysed (the fast path for
+# minified files and bundles shortens them; reading and writing do not change).
+ANALYSIS_PHASES = ("parse", "rules")
+
+
+@dataclass
+class Span:
+    """Accumulated wall-clock and CPU seconds.
+
+    CPU time is taken with :func:`time.thread_time`, so it only counts the
+    thread (or worker process) that did the work, even while other pipeline
+    stages run concurrently.
+    """
+
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+
+    def add(self, other: "Span") -> "Span":
+        self.wall_seconds += other.wall_seconds
+        self.cpu_seconds += other.cpu_seconds
+        return self
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"wall_seconds": round(self.wall_seconds, 6), "cpu_seconds": round(self.cpu_seconds, 6)}
+
+
+@contextmanager
+def measure(span: Span) -> Iterator[Span]:
+    """Add the wall and CPU time spent in the ``with`` block to ``span``."""
+
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield span
+    finally:
+        span.wall_seconds += time.perf_counter() - wall
+        span.cpu_seconds += time.thread_time() - cpu
+
+
+@dataclass
+class FileTiming:
+    path: str
+    bytes: int
+    phases: Dict[str, Span] = field(default_factory=dict)
+    cached: bool = False
+    classification: str = "source"
+
+    @property
+    def seconds(self) -> float:
+        return sum(span.wall_seconds for span in self.phases.values())
+
+    @property
+    def analysis_seconds(self) -> float:
+        return sum(self.phases[name].wall_seconds for name in ANALYSIS_PHASES if name in self.phases)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 6),
+            "cached": self.cached,
+            "classification": self.classification,
+            "phases": {name: round(span.wall_seconds, 6) for name, span in self.phases.items()},
+        }
+
+
+class JobTimer:
+    """Collects per-stage spans and per-file durations for one job.
+
+    Stage keys are ``JobStage`` values. Stages that overlap in the streaming
+    pipeline are charged only for their own busy time, so the per-stage
+    figures say where the work went rather than adding up to the job's
+    elapsed time (reported separately as ``elapsed_seconds``).
+    """
+
+    def __init__(self, slowest_n: int = 10) -> None:
+        self.slowest_n = slowest_n
+        self.stages: Dict[str, Span] = {}
+        self.files: List[FileTiming] = []
+        self.bytes_total = 0
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self._slowest: List[Tuple[float, int, FileTiming]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def finish(self) -> None:
+        self.finished_at = time.perf_counter()
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @contextmanager
+    def stage(self, stage: Any) -> Iterator[Span]:
+        span = Span()
+        try:
+            with measure(span):
+                yield span
+        finally:
+            self.add(stage, span)
+
+    def add(self, stage: Any, span: Span) -> None:
+        with self._lock:
+            self.stages.setdefault(getattr(stage, "value", stage), Span()).add(span)
+
+    def add_file(self, timing: FileTiming) -> None:
+        with self._lock:
+            self.files.append(timing)
+            self.bytes_total += timing.bytes
+            entry = (timing.seconds, -next(self._seq), timing)
+            if len(self._slowest) < self.slowest_n:
+                heapq.heappush(self._slowest, entry)
+            elif entry[:2] > self._slowest[0][:2]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest_files(self) -> List[FileTiming]:
+        return [entry[-1] for entry in sorted(self._slowest, reverse=True)]
+
+    def as_dict(self, *, include_files: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            durations = sorted(timing.seconds for timing in self.files)
+            histogram = [(seconds, 1) for seconds in durations]
+            elapsed = self.elapsed_seconds
+            data: Dict[str, Any] = {
+                "elapsed_seconds": round(elapsed, 6),
+                "stages": {name: span.as_dict() for name, span in self.stages.items()},
+                "files": {
+                    "count": len(durations),
+                    "total_seconds": round(sum(durations), 6),
+                    "max_seconds": round(durations[-1], 6) if durations else 0.0,
+                    **{
+                        f"p{pct}_seconds": round(percentile(histogram, len(durations), pct) or 0.0, 6)
+                        for pct in PERCENTILES
+                    },
+                },
+                "slowest_files": [timing.as_dict() for timing in self.slowest_files()],
+                "classification": _classification(self.files),
+                "throughput": {
+                    "bytes": self.bytes_total,
+                    "bytes_per_second": round(self.bytes_total / elapsed, 2) if elapsed else 0.0,
+                    "files_per_second": round(len(durations) / elapsed, 2) if elapsed else 0.0,
+                },
+            }
+            if include_files:
+                data["file_durations"] = [timing.as_dict() for timing in self.files]
+        return data
+
+
+def _classification(files: List[FileTiming]) -> Dict[str, Any]:
+    """Files, bytes and analysis seconds per classification, plus the fast path's savings.
+
+    The saving is an estimate: the bytes that took the fast path, priced at
+    the job's own full-analysis rate (seconds per byte of freshly analysed
+    ``source`` files), minus what the fast path actually cost.
+    """
+
+    kinds: Dict[str, Dict[str, Any]] = {}
+    full_seconds = full_bytes = fast_seconds = fast_bytes = 0.0
+    for timing in files:
+        entry = kinds.setdefault(timing.classification, {"files": 0, "bytes": 0, "analysis_seconds": 0.0})
+        entry["files"] += 1
+        entry["bytes"] += timing.bytes
+        entry["analysis_seconds"] += timing.analysis_seconds
+        if timing.cached:
+            continue
+        if timing.classification == "source":
+            full_seconds += timing.analysis_seconds
+            full_bytes += timing.bytes
+        else:
+            fast_seconds += timing.analysis_seconds
+            fast_bytes += timing.bytes
+    for entry in kinds.values():
+        entry["analysis_seconds"] = round(entry["analysis_seconds"], 6)
+    saved = fast_bytes * full_seconds / full_bytes - fast_seconds if full_bytes else 0.0
+    return {
+        "kinds": kinds,
+        "fast_path_files": sum(entry["files"] for kind, entry in kinds.items() if kind != "source"),
+        "estimated_seconds_saved": round(max(saved, 0.0), 6),
+    }
@@ -3,12 +3,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from pathlib import Path
 from typing import Any, Dict, List
 
 from ..parsing.line_map import LineMap
-from ..parsing.module_resolver import ModuleImport
-from ..parsing.symbol_index import FunctionEntry
+from ..parsing.parsed_file import ParsedFile
 from ..rules.base import Hotspot
 
 
@@ -23,25 +21,22 @@ class Snippet:
 
 def build_dossier(
     *,
-    path: Path,
-    text: str,
-    line_map: LineMap,
-    header: Any,
-    modules: List[ModuleImport],
-    symbols: List[FunctionEntry],
+    parsed: ParsedFile,
     hotspots: List[Hotspot],
     project_name: str,
     settings: Dict[str, Any],
 ) -> Dict[str, Any]:
+    header = parsed.header
+    line_map = parsed.line_map
     snippets = _build_snippets(hotspots, line_map)
     return {
-        "file_meta": {"path": str(path), "loc": line_map.loc},
+        "file_meta": {"path": parsed.path, "loc": line_map.loc},
         "suitescript_meta": {
             "NApiVersion": header.api_version,
             "NScriptType": header.script_type,
             "ModuleScope": header.module_scope,
         },
-        "modules": [{"specifier": m.specifier, "alias": m.alias} for m in modules],
+        "modules": [{"specifier": m.specifier, "alias": m.alias} for m in parsed.modules],
         "symbols": [
             {
                 "name": s.name,
@@ -50,7 +45,7 @@ def build_dossier(
                 "signature": s.signature,
                 "exported": s.exported,
             }
-            for s in symbols
+            for s in parsed.symbols
         ],
         "hotspots_static": [
             {
@@ -87,7 +82,9 @@ def _build_snippets(hotspots: List[Hotspot], line_map: LineMap) -> List[Snippet]
                 snippet_id=f"S{idx}",
                 start_line=hotspot.start_line,
                 end_line=hotspot.end_line,
-                text_numbered=line_map.numbered_text(hotspot.start_line, hotspot.end_line),
+                # Rules already number their evidence (and redact secrets in
+                # it); only hotspots without a snippet are sliced again.
+                text_numbered=hotspot.snippet or line_map.numbered_text(hotspot.start_line, hotspot.end_line),
                 hotspot_refs=[hotspot.rule_id],
             )
         )
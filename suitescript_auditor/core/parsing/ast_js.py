@@ -1,7 +1,7 @@
 """JavaScript AST helpers.
 
-For now we expose lightweight detection routines built on regular
-expressions while keeping the public API compatible with a future
+For now we expose lightweight detection routines built on the shared
+lexer's code view while keeping the public API compatible with a future
 Tree-sitter backed implementation.
 """
 
@@ -9,7 +9,10 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Iterable, List
+from typing import List, Set, Tuple
+
+from .lexer import lex, previous_char, word_before
+from .line_map import LineMap
 
 
 @dataclass
@@ -22,36 +25,303 @@ class FunctionSymbol:
     exported: bool
 
 
-FUNC_DECL_RE = re.compile(
-    r"(?P<export>exports\.)?(function|const|let|var)\s+(?P<name>[a-zA-Z0-9_]+)\s*"
-    r"(?P<signature>\([^)]*\))",
-    re.MULTILINE,
+# The code view has comments and literal contents blanked, so only braces
+# and ``=>`` shape the scan; the leading lookahead lets ``search`` jump
+# straight to candidate characters.
+TOKEN_RE = re.compile(r"(?=[={}])(?:(?P<arrow>=>)|(?P<brace>[{}]))")
+# While an arrow function with an expression body is open, the tokens that
+# can end it are scanned too.
+ARROW_BODY_TOKEN_RE = re.compile(
+    r"""
+    (?P<arrow>=>)
+    | (?P<brace>[{}])
+    | (?P<bracket>[()\[\]])
+    | (?P<separator>[;,])
+    | (?P<keyword>(?<![\w$.])(?:var|let|const|function|return|if|for|while|do|switch|try|throw|class)(?![\w$]))
+    """,
+    re.VERBOSE,
+)
+EXPORT_ENTRY_RE = re.compile(
+    r"""[{,]\s*(?:(?:[A-Za-z_$][\w$]*|'[^'\n]*'|"[^"\n]*")\s*:\s*)?(?P<name>[A-Za-z_$][\w$]*)\s*(?=[,}])"""
 )
 
+# Words that can precede ``(...) {`` without declaring a method.
+CONTROL_KEYWORDS = frozenset("if for while switch catch with".split())
+DECLARATION_KEYWORDS = frozenset({"var", "let", "const"})
+METHOD_MODIFIERS = frozenset({"async", "get", "set", "static"})
+# Characters searched backwards for a parameter list's "(" before falling
+# back to a scan from the start of the file.
+PAREN_WINDOW = 4000
+
+
+class _Function:
+    __slots__ = ("name", "kind", "start", "exported", "params", "symbol")
+
+    def __init__(self, name: str, kind: str, start: int, exported: bool) -> None:
+        self.name = name
+        self.kind = kind
+        self.start = start
+        self.exported = exported
+        self.params: Tuple[int, int] | None = None
+        self.symbol: FunctionSymbol | None = None
+
+
+class _Bracket:
+    __slots__ = ("char", "offset", "function", "exports")
+
+    def __init__(self, char: str, offset: int, function: _Function | None = None, exports: bool = False) -> None:
+        self.char = char
+        self.offset = offset
+        self.function = function  # set on a function body's "{"
+        self.exports = exports  # object literal returned from the module factory
+
 
-def extract_functions(text: str) -> List[FunctionSymbol]:
-    """Heuristic extraction of function declarations and arrow functions."""
-
-    lines = text.splitlines()
-    results: List[FunctionSymbol] = []
-    for match in FUNC_DECL_RE.finditer(text):
-        name = match.group("name")
-        signature = match.group("signature")
-        start_line = text[: match.start()].count("\n") + 1
-        snippet_after = text[match.start() :].split("{", 1)
-        block_body = snippet_after[1] if len(snippet_after) > 1 else ""
-        line_count = block_body.split("}", 1)[0].count("\n")
-        end_line = start_line + line_count
-        exported = bool(match.group("export"))
-        kind = "Arrow Function" if "=>" in lines[start_line - 1 : end_line + 1] else "Function Declaration"
-        results.append(
-            FunctionSymbol(
-                name=name,
-                kind=kind,
-                start_line=start_line,
-                end_line=end_line,
-                signature=signature,
-                exported=exported,
-            )
+def extract_functions(text: str, code: str | None = None, line_map: LineMap | None = None) -> List[FunctionSymbol]:
+    """Functions with exact start/end lines, in source order.
+
+    Recognises function declarations, function expressions and arrow
+    functions bound to a name (``var x = ...``, ``exports.x = ...``) and
+    object-literal or class methods (``beforeSubmit: function () {}``,
+    ``execute(context) {}``). A function is exported when it is assigned to
+    ``exports``/``module.exports``, declared with ``export``, or returned
+    from the outermost function (the AMD ``define`` factory), either inline
+    or by name.
+
+    ``code`` is the lexer's code view of ``text`` (lexed here when omitted)
+    and ``line_map`` the text's :class:`LineMap`, so lines agree with the
+    hotspots'. The code is scanned once, left to right, keeping a bracket
+    stack. Each ``{`` is classified by reading backwards
+    over the few tokens before it (``function name(...)``, ``key: (...) =>``,
+    ``name(...)``), so the cost stays linear in the file size. Names and
+    signatures are sliced from ``text`` at the same offsets.
+    """
+
+    if code is None:
+        code = lex(text).view("code")
+    line_at = (line_map or LineMap.from_text(text)).line_at
+    symbols: List[FunctionSymbol] = []
+    exported_names: Set[str] = set()
+    stack: List[_Bracket] = []
+    function_depth = 0
+    arrow: _Function | None = None  # ``=>`` followed by a block body
+    arrow_bodies: List[Tuple[int, FunctionSymbol]] = []  # expression-bodied arrows: (stack depth, symbol)
+    pos = 0
+
+    def open_function(function: _Function) -> FunctionSymbol:
+        params = function.params
+        start_line = line_at(function.start)
+        symbol = FunctionSymbol(
+            name=function.name,
+            kind=function.kind,
+            start_line=start_line,
+            end_line=start_line,
+            signature=text[params[0] : params[1]] if params else "()",
+            exported=function.exported,
         )
-    return results
+        if function.name:
+            symbols.append(symbol)
+        function.symbol = symbol
+        return symbol
+
+    def end_arrow_bodies(depth: int, offset: int) -> None:
+        while arrow_bodies and arrow_bodies[-1][0] >= depth:
+            arrow_bodies.pop()[1].end_line = line_at(max(previous_char(code, offset), 0))
+
+    while True:
+        match = (ARROW_BODY_TOKEN_RE if arrow_bodies else TOKEN_RE).search(code, pos)
+        if match is None:
+            break
+        kind = match.lastgroup
+        start, pos = match.span()
+        if kind == "brace":
+            if code[start] == "{":
+                function = arrow
+                arrow = None
+                if function is None:
+                    function = _block_function(text, code, start, stack)
+                if function is not None:
+                    open_function(function)
+                    stack.append(_Bracket("{", start, function))
+                    function_depth += 1
+                else:
+                    exports = function_depth <= 1 and word_before(code, previous_char(code, start))[1] == "return"
+                    stack.append(_Bracket("{", start, exports=exports))
+                continue
+            end_arrow_bodies(len(stack), start)
+            if not stack:
+                continue
+            bracket = stack.pop()
+            if bracket.function is not None:
+                bracket.function.symbol.end_line = line_at(start)
+                function_depth -= 1
+            elif bracket.exports:
+                for entry in EXPORT_ENTRY_RE.finditer(code, bracket.offset, pos):
+                    exported_names.add(entry.group("name"))
+        elif kind == "arrow":
+            function = _arrow_function(text, code, start, stack)
+            body = _next_char(code, pos)
+            if body < len(code) and code[body] == "{":
+                arrow = function
+            elif function.name:
+                arrow_bodies.append((len(stack), open_function(function)))
+        elif kind == "bracket":
+            char = code[start]
+            if char in "([":
+                stack.append(_Bracket(char, start))
+                continue
+            end_arrow_bodies(len(stack), start)
+            if stack and stack[-1].char == ("(" if char == ")" else "["):
+                stack.pop()
+        else:  # separator or statement keyword inside an arrow's expression body
+            end_arrow_bodies(len(stack), start)
+
+    end_arrow_bodies(0, len(code))
+    if stack:
+        last_line = line_at(max(previous_char(code, len(code)), 0))
+        for bracket in stack:
+            if bracket.function is not None:
+                bracket.function.symbol.end_line = last_line
+    for symbol in symbols:
+        if symbol.name in exported_names:
+            symbol.exported = True
+    symbols.sort(key=lambda symbol: symbol.start_line)
+    return symbols
+
+
+def _next_char(text: str, offset: int) -> int:
+    index = offset
+    length = len(text)
+    while index < length and text[index].isspace():
+        index += 1
+    return index
+
+
+def _open_paren(code: str, close: int) -> int:
+    """Offset of the "(" matching the ")" at ``close``, or -1."""
+
+    low = max(close - PAREN_WINDOW, 0)
+    index = close + 1
+    depth = 0
+    while True:
+        open_ = code.rfind("(", low, index)
+        if open_ < 0:
+            if not low:
+                return -1
+            low = 0  # e.g. a very long parameter list
+            continue
+        depth += code.count(")", open_, index) - 1
+        if depth == 0:
+            return open_
+        index = open_
+
+
+def _block_function(text: str, code: str, offset: int, stack: List[_Bracket]) -> _Function | None:
+    """The function whose body opens at ``offset``, if the ``{`` follows ``(...)``.
+
+    Handles ``function (...)``, ``function name(...)`` and method shorthand
+    ``name(...)`` inside an object literal or class body.
+    """
+
+    close = previous_char(code, offset)
+    if close < 0 or code[close] != ")":
+        return None
+    open_ = _open_paren(code, close)
+    if open_ < 0:
+        return None
+    name_start, name = word_before(code, previous_char(code, open_))
+    if name == "function":
+        function = _bound_function(text, code, name_start, stack, "Function Expression")
+    else:
+        keyword_index = previous_char(code, name_start)
+        if keyword_index >= 0 and code[keyword_index] == "*":  # generator
+            keyword_index = previous_char(code, keyword_index)
+        keyword_start, keyword = word_before(code, keyword_index)
+        if keyword == "function":
+            function = _bound_function(text, code, keyword_start, stack, "Function Expression")
+            if not function.name:
+                function.name = name
+                function.kind = "Function Declaration"
+        else:
+            function = _shorthand_method(code, name_start, name, stack)
+            if function is None:
+                return None
+    function.params = (open_, close + 1)
+    return function
+
+
+def _shorthand_method(code: str, name_start: int, name: str, stack: List[_Bracket]) -> _Function | None:
+    if not name or name in CONTROL_KEYWORDS or not stack or stack[-1].char != "{" or stack[-1].function:
+        return None
+    before = previous_char(code, name_start)
+    if before >= 0 and code[before] not in "{,;}*" and word_before(code, before)[1] not in METHOD_MODIFIERS:
+        return None
+    return _Function(name, "Method", name_start, stack[-1].exports)
+
+
+def _bound_function(text: str, code: str, offset: int, stack: List[_Bracket], kind: str) -> _Function:
+    """Name a function starting at ``offset`` from what precedes it.
+
+    Reads backwards over ``var x =``, ``exports.x =``, ``{ key:`` / ``, key:``
+    and ``export default``, skipping an ``async`` modifier.
+    """
+
+    index = previous_char(code, offset)
+    start, word = word_before(code, index)
+    if word == "async":
+        index = previous_char(code, start)
+        start, word = word_before(code, index)
+    if index < 0:
+        return _Function("", kind, offset, False)
+    char = code[index]
+    if char == "=" and (index == 0 or code[index - 1] not in "=!<>+-*/%&|^"):
+        chain: List[str] = []
+        start = index
+        word_start, word = word_before(code, previous_char(code, index))
+        while word and not word[0].isdigit():
+            chain.append(word)
+            start = word_start
+            dot = previous_char(code, start)
+            if dot < 0 or code[dot] != ".":
+                break
+            word_start, word = word_before(code, previous_char(code, dot))
+        if not chain:
+            return _Function("", kind, offset, False)
+        chain.reverse()
+        exported = chain[0] == "exports" or chain[:2] == ["module", "exports"]
+        decl_start, decl = word_before(code, previous_char(code, start))
+        return _Function(chain[-1], kind, decl_start if decl in DECLARATION_KEYWORDS else start, exported)
+    if char == ":":
+        key_end = previous_char(code, index)
+        if key_end >= 0 and code[key_end] in "'\"":
+            # Quoted key: the code view blanks its contents, the raw text has them.
+            key_start = code.rfind(code[key_end], 0, key_end)
+            key = text[key_start + 1 : key_end] if key_start >= 0 else ""
+        else:
+            key_start, key = word_before(code, key_end)
+        separator = previous_char(code, key_start)
+        if key and (separator < 0 or code[separator] in "{,"):
+            exported = bool(stack) and stack[-1].exports
+            return _Function(key, "Method" if kind == "Function Expression" else kind, key_start, exported)
+        return _Function("", kind, offset, False)
+    if word == "default":
+        start, word = word_before(code, previous_char(code, start))
+    return _Function("", kind, offset, word == "export")
+
+
+def _arrow_function(text: str, code: str, offset: int, stack: List[_Bracket]) -> _Function:
+    """Arrow function whose ``=>`` is at ``offset``, for ``(params) =>`` or ``param =>``."""
+
+    close = previous_char(code, offset)
+    if close >= 0 and code[close] == ")":
+        open_ = _open_paren(code, close)
+        params = (open_, close + 1)
+    else:
+        param_start, param = word_before(code, close)
+        params = (param_start, close + 1) if param else (-1, -1)
+    if params[0] < 0:
+        return _Function("", "Arrow Function", offset, False)
+    function = _bound_function(text, code, params[0], stack, "Arrow Function")
+    if not function.name:
+        function.start = params[0]
+    function.params = params
+    return function
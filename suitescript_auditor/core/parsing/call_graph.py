@@ -0,0 +1,196 @@
+"""Call sites of local functions and imported modules.
+
+:func:`extract_calls` walks the ``(`` of the lexer's code view once and
+keeps the calls the auditor can name: functions declared in the same file
+(``helper(...)``) and members of ``define`` aliases (``record.load(...)``,
+``utils.doThing(...)``). Each call records the named function it sits in
+and whether a loop or iteration callback encloses it.
+
+:class:`CallIndex` collects those per-file lists for a project and inverts
+them into a callee -> callers index, resolving module specifiers to
+project files through a :class:`~.module_graph.ModuleGraph`.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .lexer import previous_char, word_before
+from .line_map import LineMap
+from .module_graph import NETSUITE_PREFIX, ModuleGraph
+from .module_resolver import ModuleImport
+from .scopes import ScopeIndex
+from .symbol_index import FunctionEntry
+
+OPEN_PAREN_RE = re.compile(r"\(")
+TOP_LEVEL = "<module>"
+
+# Words followed by "(" that are not calls.
+NON_CALL_WORDS = frozenset(
+    "if for while switch catch with return typeof function new delete void throw await yield in of".split()
+)
+
+
+@dataclass
+class CallSite:
+    """``caller`` calls ``callee`` on ``line``.
+
+    ``callee`` is the expression as written (``utils.doThing`` or
+    ``helper``); ``module`` is the ``define`` specifier its receiver is bound
+    to, empty for a function of the same file.
+    """
+
+    caller: str
+    callee: str
+    module: str
+    line: int
+    in_loop: bool
+
+    @property
+    def name(self) -> str:
+        """The called function without its receiver."""
+
+        return self.callee.rpartition(".")[2]
+
+
+def extract_calls(
+    code: str,
+    line_map: LineMap,
+    scopes: ScopeIndex,
+    modules: List[ModuleImport],
+    symbols: List[FunctionEntry],
+) -> List[CallSite]:
+    """Calls in ``code`` (the lexer's code view) to local functions and module aliases."""
+
+    aliases = {module.alias: module.specifier for module in modules if module.alias}
+    local = {symbol.name for symbol in symbols} - aliases.keys()
+    if not aliases and not local:
+        return []
+    # Method shorthand ``name(...) {`` starts its own scope; it is a declaration.
+    declarations = {scope.start for scope in scopes.scopes if scope.kind == "function"}
+
+    found: List[Tuple[int, str, str, str]] = []
+    for match in OPEN_PAREN_RE.finditer(code):
+        name_start, name = word_before(code, previous_char(code, match.start()))
+        if not name or name in NON_CALL_WORDS or name_start in declarations:
+            continue
+        before = previous_char(code, name_start)
+        if before >= 0 and code[before] == ".":
+            receiver_start, receiver = word_before(code, previous_char(code, before))
+            chained = previous_char(code, receiver_start)
+            if receiver not in aliases or (chained >= 0 and code[chained] == "."):
+                continue
+            found.append((receiver_start, f"{receiver}.{name}", aliases[receiver], _caller(scopes, name_start)))
+        elif word_before(code, before)[1] == "function":
+            continue
+        elif name in local:
+            found.append((name_start, name, "", _caller(scopes, name_start)))
+
+    lines = line_map.iter_ranges((start, start + 1) for start, *_ in found)
+    return [
+        CallSite(caller=caller, callee=callee, module=module, line=line.start, in_loop=scopes.loop_depth(start) > 0)
+        for (start, callee, module, caller), line in zip(found, lines)
+    ]
+
+
+def _caller(scopes: ScopeIndex, offset: int) -> str:
+    """Name of the innermost named function around ``offset``; callbacks are skipped."""
+
+    scope = scopes.enclosing_function(offset)
+    while scope is not None:
+        if scope.kind == "function" and scope.name:
+            return scope.name
+        scope = scopes.scopes[scope.parent] if scope.parent >= 0 else None
+    return TOP_LEVEL
+
+
+# (caller path, caller, line, in_loop)
+Caller = Tuple[str, str, int, bool]
+
+
+class CallIndex:
+    """Project-wide callee -> callers index over the call sites of every file.
+
+    Callees are keyed ``"<path>:<function>"`` for project files (the module
+    resolved through ``graph``), ``"N/record.load"`` for NetSuite modules and
+    ``"<specifier>.<function>"`` when a specifier does not resolve. The
+    index is rebuilt lazily after files are added.
+    """
+
+    def __init__(self, graph: ModuleGraph) -> None:
+        self.graph = graph
+        self._calls: Dict[str, List[CallSite]] = {}
+        self._callers: Dict[str, List[Caller]] | None = None
+
+    def add_file(self, path: str, calls: Iterable[CallSite]) -> None:
+        self._calls[path] = list(calls)
+        self._callers = None
+
+    def target(self, path: str, call: CallSite) -> str:
+        """Index key of the function ``call`` (made in ``path``) reaches."""
+
+        if not call.module:
+            return f"{path}:{call.name}"
+        if call.module.startswith(NETSUITE_PREFIX):
+            return f"{call.module}.{call.name}"
+        resolved = self.graph.resolve(path, call.module)
+        if resolved is None:
+            return f"{call.module}.{call.name}"
+        return f"{resolved}:{call.name}"
+
+    def callers(self, target: str) -> List[Caller]:
+        return list(self._index().get(target, ()))
+
+    def called_in_loops(self, *, cross_file: bool = True) -> Dict[str, List[Caller]]:
+        """Project functions called inside loops, by callee.
+
+        With ``cross_file`` only loops in a file other than the callee's
+        count: helpers whose cost is invisible where they are defined.
+        """
+
+        found: Dict[str, List[Caller]] = {}
+        for target, callers in self._index().items():
+            path, sep, _ = target.partition(":")
+            if not sep:
+                continue
+            hits = [c for c in callers if c[3] and (not cross_file or c[0] != path)]
+            if hits:
+                found[target] = hits
+        return found
+
+    def as_dict(self) -> Dict[str, object]:
+        """Callers of project functions, and the ones called from loops in other files."""
+
+        index = self._index()
+        return {
+            "callers": {
+                target: [_caller_dict(caller) for caller in callers]
+                for target, callers in sorted(index.items())
+                if ":" in target
+            },
+            "netsuite_calls": {
+                target: len(callers) for target, callers in sorted(index.items()) if target.startswith(NETSUITE_PREFIX)
+            },
+            "called_in_loops": sorted(self.called_in_loops()),
+        }
+
+    def _index(self) -> Dict[str, List[Caller]]:
+        if self._callers is None:
+            callers: Dict[str, List[Caller]] = {}
+            seen: Set[Tuple[str, Caller]] = set()
+            for path, calls in self._calls.items():
+                for call in calls:
+                    target = self.target(path, call)
+                    entry = (path, call.caller, call.line, call.in_loop)
+                    if (target, entry) not in seen:
+                        seen.add((target, entry))
+                        callers.setdefault(target, []).append(entry)
+            self._callers = callers
+        return self._callers
+
+
+def _caller_dict(caller: Caller) -> Dict[str, object]:
+    path, name, line, in_loop = caller
+    return {"file": path, "caller": name, "line": line, "in_loop": in_loop}
@@ -0,0 +1,222 @@
+"""Single-pass JavaScript lexer producing offset-preserving source views.
+
+Rules and parsers match regular expressions against source text. Matching
+the raw text finds hits inside comments and string literals, so each file
+is lexed once here. The lexer records the spans of comments, string,
+template and regex literals, and derives views with some of those spans
+blanked:
+
+``raw``
+    The file as read.
+``no_comments``
+    Comments blanked; literals kept (for rules that inspect literal values,
+    e.g. URLs or credentials, and for ``define`` dependency lists).
+``code``
+    Comments blanked and the contents of string, template and regex
+    literals blanked. The delimiters stay, and so does code inside template
+    ``${...}`` substitutions.
+
+Blanking replaces characters with spaces but keeps line breaks, so every
+view has the same length and line boundaries as the raw text. Offsets from
+a match in any view map through the same :class:`LineMap`.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+
+VIEWS = ("raw", "no_comments", "code")
+
+# Only characters that can open a comment or literal are visited; braces
+# matter only inside template substitutions (see SUBSTITUTION_TOKEN_RE).
+TOKEN_RE = re.compile(
+    r"""(?=[/'"`])(?:
+        (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+        | (?P<string>'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?)
+        | (?P<template>`)
+        | (?P<slash>/)
+    )""",
+    re.DOTALL | re.VERBOSE,
+)
+SUBSTITUTION_TOKEN_RE = re.compile(
+    r"""(?=[/'"`{}])(?:
+        (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+        | (?P<string>'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?)
+        | (?P<template>`)
+        | (?P<slash>/)
+        | (?P<brace>[{}])
+    )""",
+    re.DOTALL | re.VERBOSE,
+)
+# Template text up to the closing backtick or the next ``${``.
+TEMPLATE_RE = re.compile(r"(?:[^`\\$]|\\.|\$(?!\{))*(`|\$\{)?", re.DOTALL)
+REGEX_LITERAL_RE = re.compile(r"/(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[\w$]*")
+# Everything ``str.splitlines`` does not treat as a line boundary.
+LINE_CONTENT_RE = re.compile("[^\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]+")
+
+# A ``/`` after one of these words starts a regular expression literal.
+REGEX_KEYWORDS = frozenset("return typeof case do else in of new delete void throw await yield instanceof".split())
+WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$")
+
+
+@dataclass(frozen=True)
+class Token:
+    """A comment or literal span: ``text[start:end]``.
+
+    ``kind`` is ``comment``, ``string``, ``template`` or ``regex``. A
+    template literal with substitutions is split into one token per text
+    chunk (from a backtick or ``}`` through ``${`` or the closing backtick).
+    """
+
+    kind: str
+    start: int
+    end: int
+
+
+class LexedSource:
+    """The tokens of one file and its lazily built views."""
+
+    def __init__(self, text: str, tokens: List[Token]) -> None:
+        self.text = text
+        self.tokens = tokens
+        self._views: Dict[str, str] = {"raw": text}
+
+    def view(self, name: str) -> str:
+        """Return the ``raw``, ``no_comments`` or ``code`` view of the text."""
+
+        cached = self._views.get(name)
+        if cached is not None:
+            return cached
+        if name == "no_comments":
+            view = _blank(self.text, (token for token in self.tokens if token.kind == "comment"), inner=False)
+        elif name == "code":
+            view = _blank(self.text, self.tokens, inner=True)
+        else:
+            raise ValueError(f"Unknown source view {name!r}; expected one of {', '.join(VIEWS)}")
+        self._views[name] = view
+        return view
+
+
+def lex(text: str) -> LexedSource:
+    """Tokenize ``text`` in one left-to-right pass."""
+
+    tokens: List[Token] = []
+    depths: List[int] = []  # brace depth inside each open ``${`` substitution
+    pos = 0
+    while True:
+        match = (SUBSTITUTION_TOKEN_RE if depths else TOKEN_RE).search(text, pos)
+        if match is None:
+            break
+        kind = match.lastgroup
+        start, pos = match.span()
+        if kind == "comment" or kind == "string":
+            tokens.append(Token(kind, start, pos))
+        elif kind == "template":
+            pos = _template_chunk(text, start, pos, tokens, depths)
+        elif kind == "slash":
+            if starts_regex(text, start):
+                literal = REGEX_LITERAL_RE.match(text, start)
+                if literal is not None:
+                    pos = literal.end()
+                    tokens.append(Token("regex", start, pos))
+        elif text[start] == "{":
+            depths[-1] += 1
+        elif depths[-1]:
+            depths[-1] -= 1
+        else:  # the "}" closing a substitution resumes the template text
+            depths.pop()
+            pos = _template_chunk(text, start, pos, tokens, depths)
+    return LexedSource(text, tokens)
+
+
+def starts_regex(text: str, offset: int) -> bool:
+    """Whether the ``/`` at ``offset`` opens a regex literal rather than dividing."""
+
+    index = previous_char(text, offset)
+    if index < 0:
+        return True
+    char = text[index]
+    if char in ")]'\"`":
+        return False
+    if char in WORD_CHARS:
+        return word_before(text, index)[1] in REGEX_KEYWORDS
+    return True
+
+
+def previous_char(text: str, offset: int) -> int:
+    """Index of the last non-whitespace character before ``offset`` (-1 if none)."""
+
+    index = offset - 1
+    stop = max(index - 8, -1)
+    while index > stop and text[index].isspace():
+        index -= 1
+    if index > stop or index < 0:
+        return index
+    # Long runs (blanked comments in a view) are stripped in chunks.
+    while index >= 0:
+        low = max(index - 255, 0)
+        stripped = len(text[low : index + 1].rstrip())
+        if stripped:
+            return low + stripped - 1
+        index = low - 1
+    return -1
+
+
+def word_before(text: str, index: int) -> tuple[int, str]:
+    """Identifier ending at ``index`` as ``(start, word)``; empty when there is none."""
+
+    end = index + 1
+    while index >= 0 and text[index] in WORD_CHARS:
+        index -= 1
+    return index + 1, text[index + 1 : end]
+
+
+def _template_chunk(text: str, start: int, pos: int, tokens: List[Token], depths: List[int]) -> int:
+    match = TEMPLATE_RE.match(text, pos)
+    tokens.append(Token("template", start, match.end()))
+    if match.group(1) == "${":
+        depths.append(0)
+    return match.end()
+
+
+def _blank(text: str, tokens, *, inner: bool) -> str:
+    """Copy ``text`` with token spans blanked (only between delimiters if ``inner``)."""
+
+    parts: List[str] = []
+    last = 0
+    for token in tokens:
+        start, end = token.start, token.end
+        if inner and token.kind != "comment":
+            start, end = _contents(text, token)
+        if start >= end:
+            continue
+        parts.append(text[last:start])
+        segment = text[start:end]
+        parts.append(" " * len(segment) if segment.isprintable() else LINE_CONTENT_RE.sub(_spaces, segment))
+        last = end
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+def _contents(text: str, token: Token) -> tuple[int, int]:
+    """Span between a literal's delimiters."""
+
+    start, end = token.start + 1, token.end
+    if token.kind == "regex":
+        end = text.rindex("/", start, end)
+    elif token.kind == "template":
+        if text.endswith("${", start, end):
+            end -= 2
+        elif end > start and text[end - 1] == "`":
+            end -= 1
+    elif end > start and text[end - 1] == text[token.start]:
+        end -= 1
+    return start, end
+
+
+def _spaces(match: re.Match[str]) -> str:
+    return " " * (match.end() - match.start())
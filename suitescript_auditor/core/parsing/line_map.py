@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Tuple
+from itertools import accumulate
+from typing import Iterable, Iterator, List, Tuple
 
 
 @dataclass
@@ -13,41 +16,79 @@ class LineRange:
 
 
 class LineMap:
+    """Offset to line lookups over a text split like ``str.splitlines``.
+
+    Line start offsets live in a compact ``array('q')`` (with a trailing
+    end-of-text sentinel) and lookups are binary searches; lines are sliced
+    from the original text only when :meth:`numbered_text` needs them.
+    """
+
     def __init__(self, lines: List[str]) -> None:
-        self._lines = lines
-        self._offsets: List[int] = []
-        offset = 0
-        for line in lines:
-            self._offsets.append(offset)
-            offset += len(line)
+        self._init("".join(lines), map(len, lines))
 
     @classmethod
     def from_text(cls, text: str) -> "LineMap":
-        lines = text.splitlines(keepends=True)
-        if not lines:
-            lines = [""]
-        return cls(lines)
+        line_map = cls.__new__(cls)
+        # ``splitlines`` defines the line boundaries (``\r\n``, ``\r``, form
+        # feeds, Unicode separators...); only the lengths are kept.
+        line_map._init(text, map(len, text.splitlines(keepends=True)) if text else [0])
+        return line_map
+
+    def _init(self, text: str, lengths: Iterable[int]) -> None:
+        self._text = text
+        self._starts = array("q", accumulate(lengths, initial=0))
+        self._count = len(self._starts) - 1
 
     def to_range(self, start_offset: int, end_offset: int) -> LineRange:
         start = self._offset_to_line(start_offset)
         adjusted_end = max(end_offset - 1, start_offset)
-        end = self._offset_to_line(adjusted_end)
+        end = self._offset_to_line(adjusted_end, lo=start)
         return LineRange(start=start + 1, end=end + 1)
 
-    def _offset_to_line(self, offset: int) -> int:
-        for idx, start in enumerate(self._offsets):
-            next_start = self._offsets[idx + 1] if idx + 1 < len(self._offsets) else None
-            if next_start is None or offset < next_start:
-                return idx
-        return len(self._offsets) - 1
+    def to_ranges(self, spans: Iterable[Tuple[int, int]]) -> List[LineRange]:
+        """Convert ``(start, end)`` offset pairs, e.g. from ``finditer``.
+
+        Spans sorted by start are resolved in one merge pass over the line
+        starts; an out-of-order span falls back to a binary search.
+        """
+
+        return list(self.iter_ranges(spans))
+
+    def iter_ranges(self, spans: Iterable[Tuple[int, int]]) -> Iterator[LineRange]:
+        starts, last = self._starts, self._count - 1
+        line = 0
+        previous = None
+        for start_offset, end_offset in spans:
+            if previous is not None and start_offset < previous:
+                line = self._offset_to_line(start_offset)
+            else:
+                while line < last and starts[line + 1] <= start_offset:
+                    line += 1
+            previous = start_offset
+            end = self._offset_to_line(max(end_offset - 1, start_offset), lo=line)
+            yield LineRange(start=line + 1, end=end + 1)
+
+    def line_at(self, offset: int) -> int:
+        """1-based line holding ``offset``."""
+
+        return self._offset_to_line(offset) + 1
+
+    def _offset_to_line(self, offset: int, lo: int = 0) -> int:
+        index = bisect_right(self._starts, offset, max(lo, 0), self._count) - 1
+        return min(max(index, 0), self._count - 1)
+
+    def line_text(self, line: int) -> str:
+        """Text of 1-based ``line`` including its line break."""
+
+        return self._text[self._starts[line - 1] : self._starts[line]]
 
     def numbered_text(self, start_line: int, end_line: int) -> List[str]:
         text = []
-        for idx in range(start_line - 1, min(end_line, len(self._lines))):
+        for idx in range(max(start_line, 1) - 1, min(end_line, self._count)):
             prefix = f"{idx + 1:04}| "
-            text.append(prefix + self._lines[idx].rstrip("\n"))
+            text.append(prefix + self._text[self._starts[idx] : self._starts[idx + 1]].rstrip("\n"))
         return text
 
     @property
     def loc(self) -> int:
-        return len(self._lines)
+        return self._count
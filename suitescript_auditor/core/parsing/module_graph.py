@@ -0,0 +1,189 @@
+"""Project-wide AMD import graph.
+
+Discovery registers every file with :meth:`ModuleGraph.add_file`; once a
+file is analysed its ``define``/``require`` specifiers are recorded with
+:meth:`ModuleGraph.set_imports`. Specifiers are resolved to project files
+lazily, on the first query after the file set changes, so files may arrive
+in any order. Resolution results are cached per importing directory and
+specifier since most files import the same handful of modules.
+
+``N/...`` specifiers are NetSuite modules and never resolve to a project
+file. Relative specifiers (``./lib/utils``) resolve against the importing
+file's directory. Absolute (``/SuiteScripts/lib/utils``) and bare
+specifiers resolve by path suffix when exactly one project file matches,
+since the File Cabinet root rarely matches the audited folder.
+"""
+
+from __future__ import annotations
+
+import posixpath
+import threading
+from pathlib import PurePath
+from typing import Dict, Iterable, List, Set, Tuple
+
+from ..io.discovery import SourceFile
+
+NETSUITE_PREFIX = "N/"
+
+
+class ModuleGraph:
+    """Import edges between the files of one project, keyed by relative path."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._files: Dict[str, SourceFile] = {}
+        self._imports: Dict[str, List[str]] = {}
+        # Path without ".js" -> path, and path suffix -> paths ending with it.
+        self._stems: Dict[str, str] = {}
+        self._suffixes: Dict[str, Set[str]] = {}
+        self._resolved: Dict[Tuple[str, str], str | None] = {}
+        self._edges: Dict[str, List[str]] | None = None
+        self._reverse: Dict[str, List[str]] | None = None
+
+    # -- building ----------------------------------------------------------
+
+    def add_file(self, source_file: SourceFile) -> None:
+        path = _key(source_file.rel_path)
+        with self._lock:
+            if path in self._files:
+                self._files[path] = source_file
+                return
+            self._files[path] = source_file
+            stem = _stem(path)
+            self._stems[stem] = path
+            parts = stem.split("/")
+            for index in range(len(parts)):
+                self._suffixes.setdefault("/".join(parts[index:]), set()).add(path)
+            # A new file can turn an unresolved or ambiguous specifier into a hit.
+            self._resolved.clear()
+            self._edges = self._reverse = None
+
+    def set_imports(self, path: str | PurePath, specifiers: Iterable[str]) -> None:
+        with self._lock:
+            self._imports[_key(path)] = list(dict.fromkeys(specifiers))
+            self._edges = self._reverse = None
+
+    # -- queries -----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, (str, PurePath)) and _key(path) in self._files
+
+    def source_file(self, path: str | PurePath) -> SourceFile | None:
+        return self._files.get(_key(path))
+
+    def resolve(self, importer: str | PurePath, specifier: str) -> str | None:
+        """Relative path of the project file ``specifier`` names, or None."""
+
+        with self._lock:
+            return self._resolve(_key(importer), specifier)
+
+    def dependencies(self, path: str | PurePath) -> List[str]:
+        """Project files ``path`` imports."""
+
+        return list(self._graph()[0].get(_key(path), ()))
+
+    def dependents(self, path: str | PurePath) -> List[str]:
+        """Project files importing ``path``."""
+
+        return list(self._graph()[1].get(_key(path), ()))
+
+    def fan_out(self, path: str | PurePath) -> int:
+        return len(self._graph()[0].get(_key(path), ()))
+
+    def fan_in(self, path: str | PurePath) -> int:
+        return len(self._graph()[1].get(_key(path), ()))
+
+    def affected(self, changed: Iterable[str | PurePath]) -> Set[str]:
+        """``changed`` plus every file depending on them, directly or not.
+
+        The set of files an incremental run has to re-audit.
+        """
+
+        reverse = self._graph()[1]
+        seen = {_key(path) for path in changed}
+        stack = list(seen)
+        while stack:
+            for dependent in reverse.get(stack.pop(), ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return seen
+
+    def as_dict(self) -> Dict[str, object]:
+        """Per-file imports with fan-in/fan-out, plus NetSuite and unresolved specifiers."""
+
+        edges, reverse = self._graph()
+        netsuite: Dict[str, int] = {}
+        unresolved: Dict[str, List[str]] = {}
+        with self._lock:
+            for path, specifiers in self._imports.items():
+                for specifier in specifiers:
+                    if specifier.startswith(NETSUITE_PREFIX):
+                        netsuite[specifier] = netsuite.get(specifier, 0) + 1
+                    elif self._resolve(path, specifier) is None:
+                        unresolved.setdefault(path, []).append(specifier)
+        files = {
+            path: {
+                "imports": edges.get(path, []),
+                "fan_in": len(reverse.get(path, ())),
+                "fan_out": len(edges.get(path, ())),
+            }
+            for path in sorted(self._files)
+        }
+        return {
+            "files": files,
+            "netsuite_modules": dict(sorted(netsuite.items())),
+            "unresolved": dict(sorted(unresolved.items())),
+        }
+
+    # -- internals ---------------------------------------------------------
+
+    def _graph(self) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        with self._lock:
+            if self._edges is None or self._reverse is None:
+                edges: Dict[str, List[str]] = {}
+                reverse: Dict[str, List[str]] = {}
+                for path, specifiers in self._imports.items():
+                    targets = []
+                    for specifier in specifiers:
+                        target = self._resolve(path, specifier)
+                        if target is not None and target != path and target not in targets:
+                            targets.append(target)
+                            reverse.setdefault(target, []).append(path)
+                    edges[path] = targets
+                self._edges, self._reverse = edges, reverse
+            return self._edges, self._reverse
+
+    def _resolve(self, importer: str, specifier: str) -> str | None:
+        if not specifier or specifier.startswith(NETSUITE_PREFIX):
+            return None
+        relative = specifier.startswith(("./", "../"))
+        # Relative specifiers depend on the importer's directory; others do not.
+        cache_key = (posixpath.dirname(importer) if relative else "", specifier)
+        if cache_key in self._resolved:
+            return self._resolved[cache_key]
+        stem = _stem(specifier)
+        if relative:
+            target = self._stems.get(posixpath.normpath(posixpath.join(cache_key[0], stem)))
+        else:
+            # Drop leading folders (the File Cabinet root) until a suffix matches.
+            target = None
+            parts = stem.strip("/").split("/")
+            for index in range(len(parts)):
+                candidates = self._suffixes.get("/".join(parts[index:]))
+                if candidates:
+                    target = next(iter(candidates)) if len(candidates) == 1 else None
+                    break
+        self._resolved[cache_key] = target
+        return target
+
+
+def _key(path: str | PurePath) -> str:
+    return PurePath(path).as_posix()
+
+
+def _stem(path: str) -> str:
+    return path[:-3] if path.endswith(".js") else path
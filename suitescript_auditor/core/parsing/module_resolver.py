@@ -7,7 +7,12 @@ from dataclasses import dataclass
 from typing import List
 
 
-DEFINE_RE = re.compile(r"define\(\s*\[(?P<deps>[^\]]+)\]\s*,\s*function\s*\((?P<params>[^)]+)\)", re.MULTILINE)
+# ``define([...], factory)`` and ``require([...], callback)``, with an
+# optional module id, and a ``function (...)`` or arrow ``(...) =>`` factory.
+DEFINE_RE = re.compile(
+    r"""\b(?:define|require)\(\s*(?:(['"])[^'"\n]*\1\s*,\s*)?\[(?P<deps>[^\]]*)\]"""
+    r"""(?:\s*,\s*(?:async\s+)?(?:function\b[^(]*)?\((?P<params>[^)]*)\))?"""
+)
 
 
 @dataclass
@@ -17,14 +22,21 @@ class ModuleImport:
 
 
 def find_modules(text: str) -> List[ModuleImport]:
-    match = DEFINE_RE.search(text)
-    if not match:
-        return []
-    deps_raw = match.group("deps").split(",")
-    params_raw = match.group("params").split(",")
+    """Dependencies of every ``define``/``require`` call, in source order.
+
+    ``text`` should have comments blanked (the lexer's ``no_comments`` view)
+    so commented-out calls are ignored. Aliases pair dependencies with the
+    factory's parameters by position; a dependency without a parameter has
+    an empty alias.
+    """
+
     modules = []
-    for dep, param in zip(deps_raw, params_raw):
-        spec = dep.strip().strip("'\"")
-        alias = param.strip()
-        modules.append(ModuleImport(specifier=spec, alias=alias))
+    for match in DEFINE_RE.finditer(text):
+        deps_raw = [dep.strip().strip("'\"") for dep in match.group("deps").split(",")]
+        params_raw = [param.strip() for param in (match.group("params") or "").split(",")]
+        for index, spec in enumerate(deps_raw):
+            if not spec:
+                continue
+            alias = params_raw[index] if index < len(params_raw) else ""
+            modules.append(ModuleImport(specifier=spec, alias=alias))
     return modules
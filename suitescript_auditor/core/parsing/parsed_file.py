@@ -0,0 +1,98 @@
+"""One source file and the parsing products derived from it."""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Any, Dict, List
+
+from . import module_resolver, suitescript_header
+from .call_graph import CallSite, extract_calls
+from .lexer import LexedSource, lex
+from .line_map import LineMap
+from .module_resolver import ModuleImport
+from .scopes import ScopeIndex, build_scope_index
+from .suitescript_header import SuiteScriptHeader
+from .symbol_index import FunctionEntry, build_symbol_index
+
+# Products small enough to send between processes; the others are rebuilt
+# from the text on demand.
+PORTABLE = ("header", "modules", "symbols", "calls")
+
+
+class ParsedFile:
+    """Text of one file with lazily computed, cached parsing products.
+
+    Each product (``line_map``, ``source`` -- the lexer's tokens and views --
+    ``header``, ``modules``, ``symbols``, ``scopes`` and ``calls``) is computed on first
+    access and reused by every consumer afterwards: rules, the LLM dossier
+    and the docs payloads. Products already known, e.g. restored from the
+    analysis cache, can be passed as keyword arguments and are never
+    recomputed.
+    """
+
+    def __init__(self, text: str, path: str = "", **known: Any) -> None:
+        self.text = text
+        self.path = path
+        for name, value in known.items():
+            if not isinstance(getattr(type(self), name, None), cached_property):
+                raise TypeError(f"ParsedFile has no product named {name!r}")
+            if value is not None:
+                self.__dict__[name] = value
+
+    @cached_property
+    def line_map(self) -> LineMap:
+        return LineMap.from_text(self.text)
+
+    @cached_property
+    def source(self) -> LexedSource:
+        return lex(self.text)
+
+    def view(self, name: str = "code") -> str:
+        """The ``raw``, ``no_comments`` or ``code`` view of the text (see :mod:`.lexer`)."""
+
+        if name == "raw":
+            return self.text
+        return self.source.view(name)
+
+    @cached_property
+    def header(self) -> SuiteScriptHeader:
+        # The JSDoc header is a comment, so it is read from the raw text.
+        return suitescript_header.parse_header(self.text)
+
+    @cached_property
+    def modules(self) -> List[ModuleImport]:
+        return module_resolver.find_modules(self.view("no_comments"))
+
+    @cached_property
+    def symbols(self) -> List[FunctionEntry]:
+        return build_symbol_index(self.text, self.view("code"), self.line_map)
+
+    @cached_property
+    def scopes(self) -> ScopeIndex:
+        return build_scope_index(self.view("code"), self.text)
+
+    @cached_property
+    def calls(self) -> List[CallSite]:
+        return extract_calls(self.view("code"), self.line_map, self.scopes, self.modules, self.symbols)
+
+    def compute(self, *names: str) -> "ParsedFile":
+        """Compute the named products now (e.g. inside a timed section)."""
+
+        for name in names:
+            getattr(self, name)
+        return self
+
+    def computed(self) -> List[str]:
+        """Names of the products computed (or provided) so far."""
+
+        return [name for name in vars(self) if isinstance(getattr(type(self), name, None), cached_property)]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes send analyses back to the job; views, tokens and
+        # indexes are cheap to rebuild compared to pickling them.
+        state = {"text": self.text, "path": self.path}
+        state.update((name, self.__dict__[name]) for name in PORTABLE if name in self.__dict__)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
@@ -0,0 +1,300 @@
+"""Brace-paired scope index for "inside a loop / function" queries.
+
+Every brace and parenthesis of the lexer's code view is paired in one
+left-to-right pass. Braces that open a loop body (``for``, ``while``,
+``do``), a function body or an iteration callback (a function passed to
+``.forEach(``, ``.each(``...) become :class:`Scope` records; other blocks
+and object literals are paired but not recorded. A ``for`` or ``while``
+without braces gets a loop scope that ends with its single statement.
+
+Scopes nest, so the text splits into segments within which the innermost
+loop, function and entry point do not change. Each segment boundary stores
+that state. A query bisects the boundaries, which makes
+:meth:`ScopeIndex.loop_depth` and friends O(log n) however deep the code
+nests.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from .lexer import previous_char, word_before
+
+BRACKET_RE = re.compile(r"[{}()]")
+# While a braceless loop body is open its statement's ";" matters too.
+STATEMENT_RE = re.compile(r"[{}();]")
+NON_SPACE_RE = re.compile(r"\S")
+
+LOOP_KEYWORDS = frozenset({"for", "while"})
+# Words that can precede ``(...) {`` without declaring a function.
+CONTROL_KEYWORDS = frozenset("if switch catch with".split()) | LOOP_KEYWORDS
+# Array / search result methods that run their callback once per element.
+ITERATION_METHODS = frozenset("forEach each map filter reduce some every find findIndex flatMap".split())
+# SuiteScript entry point names (User Event, Client, Suitelet, RESTlet,
+# Scheduled, Map/Reduce, Workflow Action and localization hooks).
+ENTRY_POINTS = frozenset(
+    """
+    beforeLoad beforeSubmit afterSubmit
+    pageInit fieldChanged postSourcing sublistChanged lineInit validateField
+    validateLine validateInsert validateDelete saveRecord
+    localizationContextEnter localizationContextExit
+    onRequest get post put delete execute onAction
+    getInputData map reduce summarize
+    """.split()
+)
+LOOP_KINDS = frozenset({"loop", "callback"})
+FUNCTION_KINDS = frozenset({"function", "callback"})
+
+State = Tuple[int, int, int, int]
+
+
+@dataclass
+class Scope:
+    """A loop body, function body or iteration callback.
+
+    ``start`` is where the construct begins (the loop keyword, or the
+    function's name or keyword), ``body`` the offset of its ``{`` and
+    ``end`` the offset just past its ``}`` (the text length when it is never
+    closed). A braceless loop's ``body`` is just past its ``)`` and its
+    ``end`` just past the statement's ``;`` or closing ``}``. ``name`` is the loop keyword, the function name (empty when
+    anonymous) or, for a callback, the iteration method. ``parent`` indexes
+    the enclosing scope in :attr:`ScopeIndex.scopes` (-1 at top level).
+    """
+
+    kind: str
+    name: str
+    start: int
+    body: int
+    end: int
+    parent: int
+    entry_point: bool = False
+
+
+class ScopeIndex:
+    """Scopes of one file plus the segment table answering offset queries."""
+
+    def __init__(self, scopes: List[Scope], offsets: List[int], states: List[State]) -> None:
+        self.scopes = scopes
+        self._offsets = offsets
+        # (loop depth, innermost loop, innermost function, innermost entry point)
+        self._states = states
+
+    def _state(self, offset: int) -> State:
+        return self._states[bisect_right(self._offsets, offset) - 1]
+
+    def _scope(self, index: int) -> Scope | None:
+        return self.scopes[index] if index >= 0 else None
+
+    def loop_depth(self, offset: int) -> int:
+        """Number of loop bodies and iteration callbacks enclosing ``offset``."""
+
+        return self._state(offset)[0]
+
+    def enclosing_loop(self, offset: int) -> Scope | None:
+        return self._scope(self._state(offset)[1])
+
+    def enclosing_function(self, offset: int) -> Scope | None:
+        return self._scope(self._state(offset)[2])
+
+    def entry_point(self, offset: int) -> Scope | None:
+        """The entry point function (e.g. ``afterSubmit``) whose body holds ``offset``."""
+
+        return self._scope(self._state(offset)[3])
+
+    def entry_points(self, name: str) -> List[Scope]:
+        return [scope for scope in self.scopes if scope.entry_point and scope.name == name]
+
+
+def build_scope_index(code: str, text: str | None = None) -> ScopeIndex:
+    """Index the scopes of ``code``, the lexer's code view of ``text``.
+
+    ``text`` (the raw source) is only read for quoted object keys, whose
+    contents the code view blanks.
+    """
+
+    text = code if text is None else text
+    scopes: List[Scope] = []
+    offsets = [0]
+    states: List[State] = [(0, -1, -1, -1)]
+    # Per open "{": the scope it opened (-1 for a plain block) and the state
+    # and function depth to restore when it closes.
+    braces: List[Tuple[int, State, int]] = []
+    parens: List[int] = []  # offsets of open "("
+    last_parens = (-1, -1)  # the most recently closed "(" ... ")"
+    function_depth = 0
+    # Per open braceless loop body: its scope, the state to restore when its
+    # statement ends and the brace and paren depth the statement is at.
+    statements: List[Tuple[int, State, int, int]] = []
+    do_end = -1  # just past the "}" of the last closed do loop
+
+    pos = 0
+    while True:
+        match = (STATEMENT_RE if statements else BRACKET_RE).search(code, pos)
+        if match is None:
+            break
+        offset = match.start()
+        pos = offset + 1
+        char = code[offset]
+        if char == "(":
+            parens.append(offset)
+        elif char == ")":
+            if parens:
+                last_parens = (parens.pop(), offset)
+                before = previous_char(code, last_parens[0])
+                if before < 0 or code[before] not in "re":  # for / while
+                    continue
+                word_start, word = word_before(code, before)
+                if word in LOOP_KEYWORDS and _braceless(code, offset, word_start, do_end):
+                    state = states[-1]
+                    depth, loop, function, entry = state
+                    index = len(scopes)
+                    scopes.append(Scope("loop", word, word_start, offset + 1, len(code), max(loop, function)))
+                    statements.append((index, state, len(braces), len(parens)))
+                    _push_state(offsets, states, offset + 1, (depth + 1, index, function, entry))
+        elif char == ";":
+            # Nested braceless loops can end on the same ";".
+            while statements and statements[-1][2:] == (len(braces), len(parens)):
+                index, state, _, _ = statements.pop()
+                scopes[index].end = offset + 1
+                _push_state(offsets, states, offset + 1, state)
+        elif char == "{":
+            found = _classify(code, text, offset, last_parens, parens)
+            if found is None:
+                braces.append((-1, states[-1], function_depth))
+                continue
+            kind, name, start = found
+            state = states[-1]
+            depth, loop, function, entry = state
+            index = len(scopes)
+            scope = Scope(kind, name, start, offset, len(code), max(loop, function))
+            scopes.append(scope)
+            braces.append((index, state, function_depth))
+            if kind in LOOP_KINDS:
+                depth, loop = depth + 1, index
+            if kind in FUNCTION_KINDS:
+                # Iteration callbacks are named after their method (``map``,
+                # ``reduce``), never after a handler.
+                if kind == "function" and name in ENTRY_POINTS and function_depth <= 1 and _declared(code, start):
+                    scope.entry_point = True
+                    entry = index
+                function_depth += 1
+                function = index
+            _push_state(offsets, states, offset, (depth, loop, function, entry))
+        elif braces:
+            index, state, function_depth = braces.pop()
+            if index >= 0:
+                scopes[index].end = offset + 1
+                _push_state(offsets, states, offset + 1, state)
+                if scopes[index].name == "do":
+                    do_end = offset + 1
+            # A braceless body ends with the block it is made of, or with the
+            # block it sits in.
+            while statements and (
+                statements[-1][2] > len(braces) or statements[-1][2:] == (len(braces), len(parens))
+            ):
+                loop_index, loop_state, braces_open, _ = statements.pop()
+                scopes[loop_index].end = offset + 1
+                _push_state(offsets, states, offset + 1, loop_state if braces_open == len(braces) else state)
+    return ScopeIndex(scopes, offsets, states)
+
+
+def _declared(code: str, start: int) -> bool:
+    """Whether the function starting at ``start`` is declared or assigned, not passed as an argument."""
+
+    if not code.startswith("function", start):
+        return True
+    before = previous_char(code, start)
+    return before < 0 or code[before] not in "(,"
+
+
+def _braceless(code: str, close: int, word_start: int, do_end: int) -> bool:
+    """Whether the loop header ending at ``close`` has a single-statement body.
+
+    An empty body (``;``) and the ``while (...)`` tail of a ``do`` loop are
+    not bodies.
+    """
+
+    after = NON_SPACE_RE.search(code, close + 1)
+    if after is None or after.group() in "{;":
+        return False
+    return do_end < 0 or previous_char(code, word_start) != do_end - 1
+
+
+def _push_state(offsets: List[int], states: List[State], offset: int, state: State) -> None:
+    if offsets[-1] == offset:
+        states[-1] = state
+    else:
+        offsets.append(offset)
+        states.append(state)
+
+
+def _classify(
+    code: str, text: str, offset: int, last_parens: Tuple[int, int], parens: List[int]
+) -> Tuple[str, str, int] | None:
+    """``(kind, name, start)`` for the ``{`` at ``offset``, or None for a plain block."""
+
+    before = previous_char(code, offset)
+    if before < 0:
+        return None
+    char = code[before]
+    if char == ")" and before == last_parens[1]:
+        open_ = last_parens[0]
+        word_start, word = word_before(code, previous_char(code, open_))
+        if word in LOOP_KEYWORDS:
+            return "loop", word, word_start
+        if word in CONTROL_KEYWORDS:
+            return None
+        if word == "function":
+            return _function(code, text, word_start, parens)
+        keyword_index = previous_char(code, word_start)
+        if keyword_index >= 0 and code[keyword_index] == "*":  # generator
+            keyword_index = previous_char(code, keyword_index)
+        keyword_start, keyword = word_before(code, keyword_index)
+        if not word:
+            return None
+        # ``function name(...) {`` or method shorthand ``name(...) {``
+        return "function", word, keyword_start if keyword == "function" else word_start
+    if char == ">" and before > 0 and code[before - 1] == "=":
+        params = previous_char(code, before - 1)
+        if params >= 0 and code[params] == ")":
+            start = last_parens[0] if params == last_parens[1] else params
+        else:
+            start = word_before(code, params)[0]
+        return _function(code, text, start, parens)
+    word_start, word = word_before(code, before)
+    if word == "do":
+        return "loop", word, word_start
+    return None
+
+
+def _function(code: str, text: str, start: int, parens: List[int]) -> Tuple[str, str, int]:
+    """Name an unnamed function expression from what precedes ``start``."""
+
+    index = previous_char(code, start)
+    word_start, word = word_before(code, index)
+    if word == "async":
+        index = previous_char(code, word_start)
+    if index < 0:
+        return "function", "", start
+    char = code[index]
+    if char == "=" and (index == 0 or code[index - 1] not in "=!<>+-*/%&|^"):
+        name_start, name = word_before(code, previous_char(code, index))
+        return "function", name, name_start if name else start
+    if char == ":":
+        key_end = previous_char(code, index)
+        if key_end >= 0 and code[key_end] in "'\"":
+            key_start = code.rfind(code[key_end], 0, key_end)
+            return "function", text[key_start + 1 : key_end] if key_start >= 0 else "", max(key_start, 0)
+        key_start, key = word_before(code, key_end)
+        return "function", key, key_start if key else start
+    if char in "(," and parens:
+        call = parens[-1]
+        method_end = previous_char(code, call)
+        method_start, method = word_before(code, method_end)
+        dot = previous_char(code, method_start)
+        if method in ITERATION_METHODS and dot >= 0 and code[dot] == ".":
+            return "callback", method, start
+    return "function", "", start
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from typing import List
 
 from .ast_js import FunctionSymbol, extract_functions
+from .line_map import LineMap
 
 
 @dataclass
@@ -17,9 +18,9 @@ class FunctionEntry:
     exported: bool
 
 
-def build_symbol_index(text: str) -> List[FunctionEntry]:
+def build_symbol_index(text: str, code: str | None = None, line_map: LineMap | None = None) -> List[FunctionEntry]:
     functions: List[FunctionEntry] = []
-    for symbol in extract_functions(text):
+    for symbol in extract_functions(text, code, line_map):
         functions.append(
             FunctionEntry(
                 name=symbol.name,
@@ -2,11 +2,29 @@
 
 from __future__ import annotations
 
+import hashlib
+import re
+import time
 from dataclasses import dataclass
-from typing import Iterable, List, Protocol, TYPE_CHECKING
+from typing import Dict, Iterable, List, Protocol, Sequence, Tuple, TYPE_CHECKING
+
+from .budget import Deadline, RuleTimeout, time_budget
+from .lint import lint_rules
+from .prefilter import KeywordPrefilter
+from .scanner import MultiPatternScanner, combinable
 
 if TYPE_CHECKING:  # pragma: no cover
     from ..parsing.line_map import LineMap
+    from ..parsing.parsed_file import ParsedFile
+    from ..parsing.scopes import ScopeIndex
+    from .profiler import RuleProfile
+
+# Bump when rule behaviour changes in a way the rule fingerprint cannot see
+# (e.g. edits to an ``evaluate`` body that keep the same regex).
+RULESET_VERSION = 5
+
+# Severity of the placeholder finding for a rule that ran out of time.
+DEGRADED_SEVERITY = "DEGRADED"
 
 
 @dataclass
@@ -16,6 +34,42 @@ class RuleContext:
     script_type: str | None
     api_version: str | None
     line_map: "LineMap"
+    parsed: "ParsedFile | None" = None
+
+    @classmethod
+    def from_parsed(cls, parsed: "ParsedFile") -> "RuleContext":
+        header = parsed.header
+        return cls(
+            path=parsed.path,
+            text=parsed.text,
+            script_type=header.script_type,
+            api_version=header.api_version,
+            line_map=parsed.line_map,
+            parsed=parsed,
+        )
+
+    def parsed_file(self) -> "ParsedFile":
+        """The shared :class:`ParsedFile`, created on first use for hand-built contexts."""
+
+        if self.parsed is None:
+            from ..parsing.parsed_file import ParsedFile
+
+            self.parsed = ParsedFile(self.text, self.path, line_map=self.line_map)
+        return self.parsed
+
+    def view(self, name: str = "code") -> str:
+        """Text with comments (``no_comments``) or comments and literals (``code``) blanked.
+
+        Views keep the offsets and line breaks of ``text``, so matches map
+        through ``line_map`` unchanged. ``raw`` is ``text`` itself.
+        """
+
+        return self.parsed_file().view(name)
+
+    def scopes(self) -> "ScopeIndex":
+        """Loop, function and entry point scopes of the code view."""
+
+        return self.parsed_file().scopes
 
 
 @dataclass
@@ -45,15 +99,298 @@ class Rule(Protocol):
         ...
 
 
+def script_type_matches(script_types: Sequence[str], script_type: str | None) -> bool:
+    """Whether a rule declaring ``script_types`` applies to a file of ``script_type``."""
+
+    if not script_types or not script_type:
+        return True
+    script_type = script_type.casefold()
+    return any(declared.casefold() == script_type for declared in script_types)
+
+
+class PatternRule:
+    """Base for rules built around one regular expression.
+
+    Subclasses set ``pattern`` and the source ``view`` it runs on, and turn
+    matches into findings in :meth:`build` (by default one finding per
+    match, see :meth:`build_hotspot`). :class:`RuleEngine` finds the matches
+    of all pattern rules in one pass per view and hands each rule its own;
+    :meth:`evaluate` runs the rule alone.
+
+    ``script_types`` lists the ``@NScriptType`` values the rule is meant
+    for; files of other types never reach it (see
+    :meth:`RuleEngine.rules_for`). Empty means every script type. Files
+    without an ``@NScriptType`` tag get every rule.
+
+    ``required_literals`` lists strings of which at least one occurs in the
+    view of any file the rule reports on (usually literals of the pattern);
+    the engine skips the rule on files where none does (see
+    :mod:`.prefilter`). Leave it empty when no such literal exists.
+    """
+
+    rule_id: str
+    severity: str
+    title: str
+    pattern: "re.Pattern[str]"
+    view = "code"
+    script_types: Sequence[str] = ()
+    required_literals: Sequence[str] = ()
+    description = ""
+    recommendations: Sequence[str] = ()
+    score_1_10: float = 5.0
+
+    def applies(self, context: RuleContext) -> bool:
+        return script_type_matches(self.script_types, context.script_type)
+
+    def evaluate(self, context: RuleContext) -> Iterable[Hotspot]:
+        return self.build(context, self.find(context))
+
+    def find(self, context: RuleContext, deadline: Deadline | None = None) -> List["re.Match[str]"]:
+        """Matches of ``pattern`` in the rule's view; ``deadline`` is checked after every match."""
+
+        matches = self.pattern.finditer(context.view(self.view))
+        if deadline is None:
+            return list(matches)
+        found = []
+        for match in matches:
+            deadline.check()
+            found.append(match)
+        return found
+
+    def build(self, context: RuleContext, matches: List["re.Match[str]"]) -> Iterable[Hotspot]:
+        spans = [match.span() for match in matches]
+        for line_range in context.line_map.iter_ranges(spans):
+            yield self.build_hotspot(context, line_range.start, line_range.end)
+
+    def build_hotspot(
+        self, context: RuleContext, start_line: int, end_line: int, *, snippet: List[str] | None = None
+    ) -> Hotspot:
+        if snippet is None:
+            snippet = context.line_map.numbered_text(start_line, end_line)
+        return Hotspot(
+            rule_id=self.rule_id,
+            severity=self.severity,
+            title=self.title,
+            description=self.description,
+            start_line=start_line,
+            end_line=end_line,
+            snippet=snippet,
+            recommendations=list(self.recommendations),
+            score_1_10=self.score_1_10,
+        )
+
+
 class RuleEngine:
     def __init__(self, rules: Iterable[Rule]) -> None:
         self.rules = list(rules)
+        # Rules that declare ``fast_path = True`` are cheap enough to run on
+        # minified and bundled files (see ``parsing.minified``).
+        self.fast_path_rules = [rule for rule in self.rules if getattr(rule, "fast_path", False)]
+        # Pattern rules whose regex can join a combined scanner, by rule id;
+        # the value is the view the rule matches against.
+        self.scanned_views: Dict[str, str] = {
+            rule.rule_id: rule.view
+            for rule in self.rules
+            if isinstance(rule, PatternRule) and combinable(rule.pattern)
+        }
+        self._scanners: Dict[Tuple[str, ...], MultiPatternScanner] = {}
+        self.prefilter = KeywordPrefilter(self.rules)
+        # Patterns prone to catastrophic backtracking (see ``rules.lint``).
+        self.lint = lint_rules(self.rules)
+        # Rules whose applies() only checks script_types: dispatch alone
+        # decides for them, so applies() is not called per file.
+        self._dispatched = {
+            rule.rule_id for rule in self.rules if getattr(type(rule), "applies", None) is PatternRule.applies
+        }
+        # Rules whose evaluate() is find() then build(): the engine runs the
+        # two steps itself so a cooperative deadline reaches find().
+        self._found_by_engine = {
+            rule.rule_id
+            for rule in self.rules
+            if isinstance(rule, PatternRule) and getattr(type(rule), "evaluate", None) is PatternRule.evaluate
+        }
+        self._buckets: Dict[Tuple[str | None, bool], Tuple[List[Rule], List[Rule]]] = {}
 
-    def run(self, context: RuleContext) -> List[Hotspot]:
-        findings: List[Hotspot] = []
+    def rules_for(self, script_type: str | None, *, fast_path: bool = False) -> List[Rule]:
+        """Rules to run on a file of ``script_type``, in load order.
+
+        Rules are grouped by the ``script_types`` they declare; the list for
+        each distinct script type is built once and then found by a dict
+        lookup.
+        """
+
+        return self._bucket(script_type, fast_path)[0]
+
+    def _bucket(self, script_type: str | None, fast_path: bool) -> Tuple[List[Rule], List[Rule]]:
+        key = (script_type.casefold() if script_type else None, fast_path)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rules = self.fast_path_rules if fast_path else self.rules
+            selected: List[Rule] = []
+            excluded: List[Rule] = []
+            for rule in rules:
+                matched = script_type_matches(getattr(rule, "script_types", ()), script_type)
+                (selected if matched else excluded).append(rule)
+            bucket = self._buckets[key] = (selected, excluded)
+        return bucket
+
+    def dispatch_counts(self) -> Dict[str, int]:
+        """Number of rules per declared script type; ``*`` counts rules for every type."""
+
+        counts: Dict[str, int] = {}
         for rule in self.rules:
-            if not rule.applies(context):
-                continue
-            for finding in rule.evaluate(context):
-                findings.append(finding)
+            for script_type in getattr(rule, "script_types", ()) or ("*",):
+                counts[script_type] = counts.get(script_type, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def diagnostics(self) -> Dict[str, object]:
+        """Rule set summary for reports: dispatch, scanning, prefilter and lint."""
+
+        return {
+            "rules": len(self.rules),
+            "by_script_type": self.dispatch_counts(),
+            "scanned": len(self.scanned_views),
+            "prefiltered": len(self.prefilter),
+            "fast_path": len(self.fast_path_rules),
+            "lint": [str(warning) for warning in self.lint],
+        }
+
+    def run(
+        self,
+        context: RuleContext,
+        profile: "RuleProfile | None" = None,
+        *,
+        fast_path: bool = False,
+        budget: float | None = None,
+    ) -> List[Hotspot]:
+        """Findings of every applicable rule on one file.
+
+        ``budget`` bounds each rule (and each combined scan) to that many
+        seconds on this file (see :mod:`.budget`); a rule that runs out
+        yields one ``DEGRADED`` finding instead of its results. Where no
+        alarm can interrupt it, a rule that finishes over budget degrades
+        the same way. With a ``profile`` the combined scans are skipped and
+        each rule matches its own pattern, so its regex time is charged to
+        the rule rather than shared by the whole scan.
+        """
+
+        rules, excluded = self._bucket(context.script_type, fast_path)
+        if profile is not None:
+            profile.files += 1
+            for rule in excluded:
+                profile.record(rule.rule_id, context.path, applied=False, seconds=0.0)
+        active: List[Rule] = []
+        keywords = self.prefilter.matcher(context)
+        for rule in rules:
+            started = time.perf_counter()
+            applies = rule.rule_id in self._dispatched or rule.applies(context)
+            admitted = applies and keywords.admits(rule)
+            if admitted:
+                active.append(rule)
+            elif profile is not None:
+                profile.record(
+                    rule.rule_id,
+                    context.path,
+                    applied=False,
+                    seconds=time.perf_counter() - started,
+                    prefiltered=applies,
+                )
+        matches = self._scan(context, active, budget) if profile is None else {}
+
+        findings: List[Hotspot] = []
+        for rule in active:
+            started = time.perf_counter()
+            rule_matches = matches.get(rule.rule_id)
+            timed_out = False
+            try:
+                with time_budget(budget) as deadline:
+                    if rule_matches is None and rule.rule_id in self._found_by_engine:
+                        rule_matches = rule.find(context, deadline)
+                    if rule_matches is None:
+                        found = list(rule.evaluate(context))
+                    else:
+                        found = list(rule.build(context, rule_matches))
+                    if deadline is not None:
+                        deadline.check()
+            except RuleTimeout:
+                found, timed_out = [self._degraded(rule, budget)], True
+            if profile is not None:
+                profile.record(
+                    rule.rule_id,
+                    context.path,
+                    applied=True,
+                    seconds=time.perf_counter() - started,
+                    matches=0 if timed_out else len(found),
+                    timed_out=timed_out,
+                )
+            findings.extend(found)
         return findings
+
+    @staticmethod
+    def _degraded(rule: Rule, budget: float | None) -> Hotspot:
+        return Hotspot(
+            rule_id=rule.rule_id,
+            severity=DEGRADED_SEVERITY,
+            title=f"{rule.title} (not evaluated)",
+            description=f"The rule exceeded its {budget:g}s time budget on this file; findings may be missing.",
+            start_line=1,
+            end_line=1,
+            snippet=[],
+            recommendations=["Review this file manually for the rule.", "Simplify the rule pattern or raise the budget."],
+            verified=False,
+        )
+
+    def _scan(self, context: RuleContext, rules: List[Rule], budget: float | None) -> Dict[str, List["re.Match[str]"]]:
+        """Matches of the scannable ``rules``, one combined pass per view.
+
+        A view whose scan runs out of time is left out; its rules then run
+        alone, each within its own budget, so only the slow one degrades.
+        """
+
+        by_view: Dict[str, List[Rule]] = {}
+        for rule in rules:
+            view = self.scanned_views.get(rule.rule_id)
+            if view is not None:
+                by_view.setdefault(view, []).append(rule)
+        matches: Dict[str, List[re.Match[str]]] = {}
+        for view, group in by_view.items():
+            key = (view, *(rule.rule_id for rule in group))
+            scanner = self._scanners.get(key)
+            if scanner is None:
+                scanner = self._scanners[key] = MultiPatternScanner([rule.pattern for rule in group])
+            try:
+                with time_budget(budget) as deadline:
+                    found = scanner.scan(context.view(view), deadline)
+                    if deadline is not None:
+                        deadline.check()
+            except RuleTimeout:
+                continue
+            matches.update(zip((rule.rule_id for rule in group), found))
+        return matches
+
+    def fingerprint(self) -> str:
+        """Stable digest of the loaded rule set, used to invalidate caches."""
+
+        digest = hashlib.sha256(f"ruleset:{RULESET_VERSION}".encode("utf-8"))
+        for rule in self.rules:
+            pattern = getattr(rule, "pattern", None)
+            parts = [
+                type(rule).__module__,
+                type(rule).__qualname__,
+                rule.rule_id,
+                rule.severity,
+                getattr(pattern, "pattern", ""),
+                str(getattr(pattern, "flags", "")),
+                str(getattr(rule, "fast_path", False)),
+                "\x1f".join(getattr(rule, "required_literals", ())),
+                "\x1f".join(getattr(rule, "script_types", ())),
+                str(getattr(rule, "view", "")),
+                # Cached hotspots embed the rule's text and score.
+                rule.title,
+                str(getattr(rule, "description", "")),
+                "\x1f".join(getattr(rule, "recommendations", ())),
+                str(getattr(rule, "score_1_10", "")),
+                getattr(rule, "digest", ""),
+            ]
+            digest.update("\0".join(parts).encode("utf-8"))
+        return digest.hexdigest()
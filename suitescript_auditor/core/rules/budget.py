@@ -0,0 +1,72 @@
+"""Per-rule time budgets.
+
+A rule whose regular expression backtracks badly on one large file must
+not stall the whole job. :func:`time_budget` bounds a block of rule work:
+
+* In the main thread of a process on platforms with ``setitimer`` (every
+  analysis worker process on Linux and macOS) a ``SIGALRM`` timer raises
+  :class:`RuleTimeout` when the budget runs out. CPython's ``re`` checks
+  for pending signals while matching, so this interrupts a runaway match.
+* Elsewhere (the serial analysis thread, Windows) only the returned
+  :class:`Deadline` is available. The combined scanner and
+  :meth:`~.base.PatternRule.find` check it between matches, and the engine
+  checks it once more when a rule or scan returns, so work that ran over
+  budget still degrades; a single runaway match, though, runs to
+  completion.
+"""
+
+from __future__ import annotations
+
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class RuleTimeout(Exception):
+    """A rule exceeded its time budget on one file."""
+
+
+class Deadline:
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.expires = time.perf_counter() + seconds
+
+    def check(self) -> None:
+        if time.perf_counter() > self.expires:
+            raise RuleTimeout(f"time budget of {self.seconds:g}s exceeded")
+
+
+def alarm_available() -> bool:
+    """Whether :func:`time_budget` can interrupt a match in this thread."""
+
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def time_budget(seconds: float | None) -> Iterator[Deadline | None]:
+    """Raise :class:`RuleTimeout` from the block once ``seconds`` have passed.
+
+    ``None`` or ``0`` disables the budget and yields ``None``.
+    """
+
+    if not seconds:
+        yield None
+        return
+    deadline = Deadline(seconds)
+    # Never replace a timer someone else armed.
+    if not alarm_available() or signal.getitimer(signal.ITIMER_REAL)[0]:
+        yield deadline
+        return
+    previous = signal.signal(signal.SIGALRM, _expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield deadline
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _expire(signum, frame) -> None:
+    raise RuleTimeout("time budget exceeded")
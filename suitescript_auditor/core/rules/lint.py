@@ -0,0 +1,105 @@
+"""Load-time checks for rule patterns prone to catastrophic backtracking.
+
+Two shapes are reported:
+
+``nested-quantifier``
+    A repeated group containing an unbounded repeat, e.g. ``(\\s+)*`` or
+    ``(a|b+)+``: a failing match tries exponentially many splits.
+``unbounded-span``
+    An unbounded repeat of a class that also matches line breaks, e.g.
+    ``[\\s\\S]*``, ``[^}]*`` or ``.*`` under ``DOTALL``: every candidate
+    start may scan (and backtrack over) the rest of the file. Bound the
+    repeat (``[^)]{0,400}``) or exclude ``\\n`` from the class.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, List
+
+from .scanner import sre_constants, sre_parse
+
+# Category pairs whose union matches every character.
+COMPLEMENTS = (("SPACE", "NOT_SPACE"), ("WORD", "NOT_WORD"), ("DIGIT", "NOT_DIGIT"))
+
+
+@dataclass
+class PatternWarning:
+    rule_id: str
+    kind: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.rule_id}: {self.kind}: {self.message}"
+
+
+def lint_pattern(pattern: "re.Pattern[str]") -> List[tuple[str, str]]:
+    """``(kind, message)`` for each risky construct in ``pattern``."""
+
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except (re.error, RecursionError):
+        return []
+    found: List[tuple[str, str]] = []
+    _walk(list(parsed), bool(pattern.flags & re.DOTALL), 0, found)
+    return list(dict.fromkeys(found))
+
+
+def lint_rules(rules: Iterable[object]) -> List[PatternWarning]:
+    """Warnings for every rule pattern; rules may carry precomputed ``lint_warnings``."""
+
+    warnings: List[PatternWarning] = []
+    for rule in rules:
+        pattern = getattr(rule, "pattern", None)
+        if isinstance(pattern, re.Pattern):
+            found = getattr(rule, "lint_warnings", None)
+            for kind, message in lint_pattern(pattern) if found is None else found:
+                warnings.append(PatternWarning(getattr(rule, "rule_id", type(rule).__name__), kind, message))
+    return warnings
+
+
+def _walk(items: list, dotall: bool, repeats: int, found: List[tuple[str, str]]) -> None:
+    """Visit parsed ``items``; ``repeats`` counts the enclosing repeated groups."""
+
+    c = sre_constants
+    for op, av in items:
+        if op in (c.MAX_REPEAT, c.MIN_REPEAT):
+            low, high, body = av
+            unbounded = high == c.MAXREPEAT
+            body = list(body)
+            if unbounded and repeats:
+                found.append(("nested-quantifier", "unbounded repeat inside a repeated group"))
+            if unbounded and _spans_lines(body, dotall):
+                found.append(("unbounded-span", "unbounded repeat of a class that matches line breaks"))
+            _walk(body, dotall, repeats + (high > 1), found)
+        elif op is c.SUBPATTERN:
+            add_flags, del_flags = av[1], av[2]
+            scoped = (dotall or bool(add_flags & re.DOTALL)) and not del_flags & re.DOTALL
+            _walk(list(av[-1]), scoped, repeats, found)
+        elif op is c.BRANCH:
+            for alternative in av[1]:
+                _walk(list(alternative), dotall, repeats, found)
+        elif op in (c.ASSERT, c.ASSERT_NOT):
+            _walk(list(av[1]), dotall, repeats, found)
+
+
+def _spans_lines(body: list, dotall: bool) -> bool:
+    """Whether a repeat body is a single class matching ``\\n`` and most other characters."""
+
+    if len(body) != 1:
+        return False
+    op, av = body[0]
+    c = sre_constants
+    if op is c.ANY:
+        return dotall
+    if op is c.NOT_LITERAL:
+        return av != ord("\n")
+    if op is not c.IN:
+        return False
+    if av and av[0][0] is c.NEGATE:
+        return not any(item == (c.LITERAL, ord("\n")) for item in av[1:]) and not any(
+            kind is c.CATEGORY and str(value).endswith(("SPACE", "LINEBREAK")) for kind, value in av[1:]
+        )
+    categories = {str(value).rpartition("CATEGORY_")[2] for kind, value in av if kind is c.CATEGORY}
+    return any(a in categories and b in categories for a, b in COMPLEMENTS)
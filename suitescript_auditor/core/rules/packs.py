@@ -0,0 +1,323 @@
+"""Declarative rule packs: site-specific pattern rules without Python.
+
+A pack is a TOML or JSON file holding a list of rules::
+
+    [[rules]]
+    id = "acme.legacy_load_loop"
+    severity = "HIGH"
+    title = "SuiteScript 1.0 record load inside loop"
+    pattern = '\\bnlapiLoadRecord\\b'
+    required_literals = ["nlapiLoadRecord"]
+    script_types = ["UserEventScript", "ScheduledScript"]
+    scope = "loop"
+    recommendations = ["Load the records once, outside the loop."]
+
+A JSON pack holds the same object, ``{"rules": [{"id": ...}, ...]}``.
+``id``, ``severity`` (``HIGH``, ``MED`` or ``LOW``) and ``pattern`` are
+required. Optional fields mirror :class:`~.base.PatternRule`: ``title``,
+``description``, ``recommendations``, ``score``, ``view`` (``code``,
+``no_comments`` or ``raw``), ``script_types``, ``required_literals``,
+``fast_path`` and ``flags`` (names such as ``IGNORECASE`` or ``DOTALL``).
+
+``scope`` restricts where a match counts:
+
+``any`` (default)
+    Every match is a finding.
+``loop``
+    Only matches inside a loop body or iteration callback; the finding
+    spans from the loop keyword to the match, like the governance rules.
+``entry_point``
+    Only matches inside an entry point function, limited to the names in
+    ``entry_points`` when it is given.
+
+Each rule compiles to a :class:`PackRule`, a plain :class:`~.base.PatternRule`
+that the engine scans, prefilters and dispatches like the built-in rules.
+
+Loading validates every rule and lints its pattern (see :mod:`.lint`). With
+a ``cache_dir`` the validated rules and lint results are stored as JSON under
+the sha256 of the pack's bytes, so an unchanged pack is not parsed, checked or
+linted again; editing a pack simply produces a new key.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tomllib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .base import Hotspot, PatternRule, RuleContext
+from .lint import lint_pattern
+from .scanner import matches_empty
+
+# Bump when the normalized rule layout stored in the cache, or validation, changes.
+PACK_CACHE_FORMAT = 2
+
+PACK_SUFFIXES = (".toml", ".json")
+SEVERITIES = ("HIGH", "MED", "LOW")
+VIEWS = ("code", "no_comments", "raw")
+SCOPES = ("any", "loop", "entry_point")
+FLAGS = {"IGNORECASE": re.IGNORECASE, "MULTILINE": re.MULTILINE, "DOTALL": re.DOTALL, "VERBOSE": re.VERBOSE}
+
+FIELDS = frozenset(
+    {
+        "id",
+        "severity",
+        "title",
+        "pattern",
+        "flags",
+        "view",
+        "script_types",
+        "required_literals",
+        "scope",
+        "entry_points",
+        "description",
+        "recommendations",
+        "score",
+        "fast_path",
+    }
+)
+
+LintResult = Tuple[Tuple[str, str], ...]
+
+
+class RulePackError(ValueError):
+    """A rule pack cannot be read, or one of its rules is invalid."""
+
+
+class PackRule(PatternRule):
+    """A pattern rule compiled from one normalized rule pack entry."""
+
+    def __init__(
+        self,
+        spec: Dict[str, Any],
+        lint_warnings: LintResult | None = None,
+        pattern: "re.Pattern[str] | None" = None,
+    ) -> None:
+        self.spec = spec
+        self.rule_id = spec["id"]
+        self.severity = spec["severity"]
+        self.title = spec["title"]
+        if pattern is None:
+            pattern = re.compile(spec["pattern"], _flags(spec["flags"]))
+        self.pattern = pattern
+        self.view = spec["view"]
+        self.script_types = tuple(spec["script_types"])
+        self.required_literals = tuple(spec["required_literals"])
+        self.scope = spec["scope"]
+        self.entry_points = tuple(spec["entry_points"])
+        self.description = spec["description"]
+        self.recommendations = tuple(spec["recommendations"])
+        self.score_1_10 = spec["score"]
+        self.fast_path = spec["fast_path"]
+        # Read by ``lint_rules`` instead of parsing the pattern again.
+        if lint_warnings is None:
+            lint_warnings = tuple(lint_pattern(self.pattern))
+        self.lint_warnings = lint_warnings
+        # Covers the fields the rule-set fingerprint does not list.
+        self.digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def __repr__(self) -> str:
+        return f"PackRule({self.rule_id!r})"
+
+    def build(self, context: RuleContext, matches: List[re.Match[str]]) -> Iterable[Hotspot]:
+        if self.scope == "any":
+            yield from super().build(context, matches)
+            return
+        if not matches:
+            return
+        scopes = context.scopes()
+        spans = []
+        for match in matches:
+            if self.scope == "loop":
+                loop = scopes.enclosing_loop(match.start())
+                if loop is not None:
+                    spans.append((loop.start, match.end()))
+            else:
+                entry = scopes.entry_point(match.start())
+                if entry is not None and (not self.entry_points or entry.name in self.entry_points):
+                    spans.append(match.span())
+        for line_range in context.line_map.iter_ranges(spans):
+            yield self.build_hotspot(context, line_range.start, line_range.end)
+
+
+def compile_pack(data: Any, source: str = "<pack>") -> List[PackRule]:
+    """Validate the parsed contents of a pack and compile its rules."""
+
+    if not isinstance(data, dict) or not isinstance(data.get("rules"), list):
+        raise RulePackError(f"{source}: expected a top-level 'rules' list")
+    rules: List[PackRule] = []
+    seen: set[str] = set()
+    for index, entry in enumerate(data["rules"]):
+        spec, pattern = _normalize(entry, f"{source}: rules[{index}]")
+        rule = PackRule(spec, pattern=pattern)
+        if rule.rule_id in seen:
+            raise RulePackError(f"{source}: rules[{index}]: duplicate id {rule.rule_id!r}")
+        seen.add(rule.rule_id)
+        rules.append(rule)
+    return rules
+
+
+def load_pack(path: Path, cache_dir: Path | None = None) -> List[PackRule]:
+    """Rules of the pack at ``path``, read from ``cache_dir`` when unchanged."""
+
+    try:
+        raw = path.read_bytes()
+    except OSError as exc:
+        raise RulePackError(f"{path}: {exc.strerror or exc}") from exc
+    key = hashlib.sha256(f"pack:{PACK_CACHE_FORMAT}:{path.suffix.lower()}\0".encode("utf-8") + raw).hexdigest()
+    cache_path = cache_dir / f"{key}.json" if cache_dir is not None else None
+    if cache_path is not None:
+        rules = _read_cache(cache_path)
+        if rules is not None:
+            return rules
+    rules = compile_pack(_parse(raw, path), str(path))
+    if cache_path is not None:
+        _write_cache(cache_path, path, rules)
+    return rules
+
+
+def pack_files(paths: Iterable[Path]) -> List[Path]:
+    """Pack files among ``paths``; directories contribute their packs in name order."""
+
+    found: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            found.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in PACK_SUFFIXES and p.is_file()))
+        else:
+            found.append(path)
+    return found
+
+
+def load_rule_packs(paths: Iterable[Path], cache_dir: Path | None = None) -> List[PackRule]:
+    """Rules of every pack file or pack directory in ``paths``, in load order."""
+
+    rules: List[PackRule] = []
+    origin: Dict[str, Path] = {}
+    for path in pack_files(paths):
+        for rule in load_pack(path, cache_dir):
+            if rule.rule_id in origin:
+                raise RulePackError(f"{path}: rule id {rule.rule_id!r} is already defined in {origin[rule.rule_id]}")
+            origin[rule.rule_id] = path
+            rules.append(rule)
+    return rules
+
+
+def _parse(raw: bytes, path: Path) -> Any:
+    try:
+        text = raw.decode("utf-8")
+        if path.suffix.lower() == ".toml":
+            return tomllib.loads(text)
+        return json.loads(text)
+    except ValueError as exc:  # TOMLDecodeError, JSONDecodeError and UnicodeDecodeError
+        raise RulePackError(f"{path}: {exc}") from exc
+
+
+def _normalize(entry: Any, where: str) -> Tuple[Dict[str, Any], "re.Pattern[str]"]:
+    """``entry`` with every field present and checked, and its compiled pattern.
+
+    Raises :class:`RulePackError` for an invalid entry.
+    """
+
+    if not isinstance(entry, dict):
+        raise RulePackError(f"{where}: expected a table of rule fields")
+    unknown = sorted(set(entry) - FIELDS)
+    if unknown:
+        raise RulePackError(f"{where}: unknown field(s) {', '.join(unknown)}")
+    rule_id = _string(entry, "id", where, required=True)
+    where = f"{where} ({rule_id})"
+    spec = {
+        "id": rule_id,
+        "severity": _choice(entry, "severity", SEVERITIES, where, default=None),
+        "title": _string(entry, "title", where) or rule_id,
+        "pattern": _string(entry, "pattern", where, required=True),
+        "flags": _strings(entry, "flags", where),
+        "view": _choice(entry, "view", VIEWS, where, default="code"),
+        "script_types": _strings(entry, "script_types", where),
+        "required_literals": _strings(entry, "required_literals", where),
+        "scope": _choice(entry, "scope", SCOPES, where, default="any"),
+        "entry_points": _strings(entry, "entry_points", where),
+        "description": _string(entry, "description", where),
+        "recommendations": _strings(entry, "recommendations", where),
+        "score": entry.get("score", PatternRule.score_1_10),
+        "fast_path": entry.get("fast_path", False),
+    }
+    unknown_flags = [name for name in spec["flags"] if name not in FLAGS]
+    if unknown_flags:
+        raise RulePackError(f"{where}: unknown flag(s) {', '.join(unknown_flags)}; expected {', '.join(FLAGS)}")
+    if spec["entry_points"] and spec["scope"] != "entry_point":
+        raise RulePackError(f"{where}: 'entry_points' needs scope = \"entry_point\"")
+    score = spec["score"]
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or not 1 <= score <= 10:
+        raise RulePackError(f"{where}: 'score' must be a number from 1 to 10")
+    spec["score"] = float(score)
+    if not isinstance(spec["fast_path"], bool):
+        raise RulePackError(f"{where}: 'fast_path' must be true or false")
+    try:
+        pattern = re.compile(spec["pattern"], _flags(spec["flags"]))
+    except re.error as exc:
+        raise RulePackError(f"{where}: invalid pattern: {exc}") from exc
+    # It would hit at every offset of every file.
+    if matches_empty(pattern):
+        raise RulePackError(f"{where}: pattern can match the empty string")
+    return spec, pattern
+
+
+def _string(entry: Dict[str, Any], name: str, where: str, *, required: bool = False) -> str:
+    value = entry.get(name, "")
+    if not isinstance(value, str) or (required and not value):
+        kind = "a non-empty string" if required else "a string"
+        raise RulePackError(f"{where}: '{name}' must be {kind}")
+    return value
+
+
+def _strings(entry: Dict[str, Any], name: str, where: str) -> List[str]:
+    value = entry.get(name, [])
+    if not isinstance(value, list) or not all(isinstance(item, str) and item for item in value):
+        raise RulePackError(f"{where}: '{name}' must be a list of non-empty strings")
+    return value
+
+
+def _choice(entry: Dict[str, Any], name: str, choices: Sequence[str], where: str, *, default: str | None) -> str:
+    value = entry.get(name, default)
+    if value not in choices:
+        raise RulePackError(f"{where}: '{name}' must be one of {', '.join(choices)}")
+    return value
+
+
+def _flags(names: Iterable[str]) -> int:
+    flags = 0
+    for name in names:
+        flags |= FLAGS[name]
+    return flags
+
+
+def _read_cache(cache_path: Path) -> List[PackRule] | None:
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        if data.get("format") != PACK_CACHE_FORMAT:
+            return None
+        return [
+            PackRule(entry["spec"], tuple((kind, message) for kind, message in entry["lint"]))
+            for entry in data["rules"]
+        ]
+    except (OSError, ValueError, KeyError, TypeError, re.error):
+        return None
+
+
+def _write_cache(cache_path: Path, source: Path, rules: List[PackRule]) -> None:
+    payload = {
+        "format": PACK_CACHE_FORMAT,
+        "source": str(source),
+        "rules": [{"spec": rule.spec, "lint": [list(warning) for warning in rule.lint_warnings]} for rule in rules],
+    }
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # the cache only saves work; the rules are already compiled
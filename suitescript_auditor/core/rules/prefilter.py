@@ -0,0 +1,86 @@
+"""Keyword prefilter: skip rules whose literals do not occur in a file.
+
+Most rules can only match where a fixed string appears (``record.load``,
+``ignoreMandatoryFields``...). A rule lists such strings in
+``required_literals``: it cannot report on a file where none of them
+occurs. :class:`KeywordPrefilter` collects the distinct literals of all rules
+once, and for each file looks every literal up at most once, in the view
+the rule matches against, before any rule runs. Case-insensitive patterns
+have their literals looked up in a case-folded copy of the view.
+
+Lookups use ``str.__contains__``, CPython's fast substring search: a
+literal that is present is usually found within the first few kilobytes,
+and even a dozen absent literals cost less than one regular expression
+pass over the file.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .base import Rule, RuleContext
+
+# (view, case folded, literal)
+Keyword = Tuple[str, bool, str]
+
+
+def required_keywords(rule: "Rule") -> List[Keyword]:
+    """The keywords of ``rule``; empty when it declares no literals."""
+
+    literals = getattr(rule, "required_literals", ())
+    pattern = getattr(rule, "pattern", None)
+    folded = bool(pattern is not None and pattern.flags & re.IGNORECASE)
+    view = getattr(rule, "view", "code")
+    return [(view, folded, literal.casefold() if folded else literal) for literal in literals]
+
+
+class KeywordPrefilter:
+    """Decides per file which rules can possibly match."""
+
+    def __init__(self, rules: Iterable["Rule"]) -> None:
+        self.keywords: Dict[str, List[Keyword]] = {}
+        for rule in rules:
+            keywords = required_keywords(rule)
+            if keywords:
+                self.keywords[rule.rule_id] = keywords
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def matcher(self, context: "RuleContext") -> "FileKeywords":
+        return FileKeywords(self, context)
+
+
+class FileKeywords:
+    """Keyword lookups for one file, each done at most once."""
+
+    def __init__(self, prefilter: KeywordPrefilter, context: "RuleContext") -> None:
+        self._keywords = prefilter.keywords
+        self._context = context
+        self._found: Dict[Keyword, bool] = {}
+        self._folded: Dict[str, str] = {}
+
+    def admits(self, rule: "Rule") -> bool:
+        """False when none of the rule's literals occurs in the file."""
+
+        keywords = self._keywords.get(rule.rule_id)
+        if keywords is None:
+            return True
+        return any(self._present(keyword) for keyword in keywords)
+
+    def _present(self, keyword: Keyword) -> bool:
+        found = self._found.get(keyword)
+        if found is None:
+            view, folded, literal = keyword
+            found = self._found[keyword] = literal in self._text(view, folded)
+        return found
+
+    def _text(self, view: str, folded: bool) -> str:
+        if not folded:
+            return self._context.view(view)
+        text = self._folded.get(view)
+        if text is None:
+            text = self._folded[view] = self._context.view(view).casefold()
+        return text
@@ -0,0 +1,115 @@
+"""Per-rule execution statistics collected by :class:`RuleEngine`."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List
+
+
+@dataclass
+class RuleStats:
+    rule_id: str
+    calls: int = 0  # files where ``applies()`` was True and ``evaluate`` ran
+    skipped: int = 0  # files where ``applies()`` returned False
+    prefiltered: int = 0  # files without any of the rule's required literals
+    timeouts: int = 0  # files where the rule ran out of its time budget
+    matches: int = 0
+    seconds: float = 0.0
+    worst_seconds: float = 0.0
+    worst_file: str | None = None
+
+    def merge(self, other: "RuleStats") -> None:
+        self.calls += other.calls
+        self.skipped += other.skipped
+        self.prefiltered += other.prefiltered
+        self.timeouts += other.timeouts
+        self.matches += other.matches
+        self.seconds += other.seconds
+        if other.worst_seconds > self.worst_seconds:
+            self.worst_seconds = other.worst_seconds
+            self.worst_file = other.worst_file
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["seconds"] = round(self.seconds, 6)
+        data["worst_seconds"] = round(self.worst_seconds, 6)
+        data["mean_seconds"] = round(self.seconds / self.calls, 6) if self.calls else 0.0
+        return data
+
+
+class RuleProfile:
+    """Accumulates :class:`RuleStats` per ``rule_id``.
+
+    Profiles are plain data so they can be filled in worker processes, sent
+    back with each file's analysis and combined in the parent with
+    :meth:`merge`. ``files`` counts engine runs, so files served from the
+    analysis cache are not part of the profile.
+    """
+
+    def __init__(self) -> None:
+        self.files = 0
+        self.rules: Dict[str, RuleStats] = {}
+
+    def record(
+        self,
+        rule_id: str,
+        path: str,
+        *,
+        applied: bool,
+        seconds: float,
+        matches: int = 0,
+        prefiltered: bool = False,
+        timed_out: bool = False,
+    ) -> None:
+        """Record one file; ``prefiltered`` marks a rule that applied but was skipped for lack of literals."""
+
+        stats = self.rules.get(rule_id)
+        if stats is None:
+            stats = self.rules[rule_id] = RuleStats(rule_id)
+        stats.seconds += seconds
+        if prefiltered:
+            stats.prefiltered += 1
+            return
+        if not applied:
+            stats.skipped += 1
+            return
+        stats.calls += 1
+        stats.matches += matches
+        stats.timeouts += timed_out
+        if seconds > stats.worst_seconds:
+            stats.worst_seconds = seconds
+            stats.worst_file = path
+
+    def merge(self, other: "RuleProfile") -> "RuleProfile":
+        self.files += other.files
+        for rule_id, stats in other.rules.items():
+            self.rules.setdefault(rule_id, RuleStats(rule_id)).merge(stats)
+        return self
+
+    def table(self) -> List[Dict[str, Any]]:
+        """Rows ordered from the most to the least expensive rule."""
+
+        ordered = sorted(self.rules.values(), key=lambda stats: (-stats.seconds, stats.rule_id))
+        return [stats.as_dict() for stats in ordered]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"files": self.files, "rules": self.table()}
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    """Render :meth:`RuleProfile.table` rows as fixed-width text."""
+
+    header = (
+        f"{'rule_id':<36} {'seconds':>9} {'calls':>7} {'skipped':>8} {'prefilt':>8} {'matches':>8} {'worst':>9}"
+        "  worst_file"
+    )
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['rule_id']:<36} {row['seconds']:>9.4f} {row['calls']:>7} {row['skipped']:>8} {row['prefiltered']:>8} "
+            f"{row['matches']:>8} {row['worst_seconds']:>9.4f}  {row['worst_file'] or '-'}"
+        )
+    return "\n".join(lines)
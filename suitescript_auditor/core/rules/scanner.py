@@ -0,0 +1,198 @@
+"""Single-pass matching of many rule patterns over one text.
+
+:class:`MultiPatternScanner` joins the patterns into one alternation with a
+named group per pattern and searches the text once. Python's ``re`` reports
+only the first alternative matching at a position, so at every hit the
+alternatives after the one that matched are tried at the same offset, and
+the search resumes one character later so matches starting inside a hit
+are found too. Each pattern keeps its own ``finditer`` semantics (leftmost,
+non-overlapping): a pattern's hit is dropped when it starts inside that
+pattern's previous match.
+
+The per-pattern result is the ``Match`` of the pattern itself, re-run at
+the hit offset, so groups and spans are exactly what ``finditer`` yields.
+
+``re`` only skips ahead quickly when a pattern starts with a literal or a
+character set, which an alternation of groups hides. The scanner works out
+the characters each pattern can start with and puts them in a leading
+lookahead, so the search jumps between candidate offsets in C.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, FrozenSet, List, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .budget import Deadline
+
+try:  # the regex parser moved in Python 3.11
+    import re._parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # pragma: no cover
+    import sre_constants  # type: ignore[no-redef]
+    import sre_parse  # type: ignore[no-redef]
+
+# Flags that can be scoped to one alternative with ``(?imsx:...)``.
+SCOPED_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s", re.VERBOSE: "x"}
+# Numbered backreferences and conditionals break once groups are renumbered.
+GROUP_REFERENCE_RE = re.compile(r"\\[1-9]|\(\?\(")
+GLOBAL_FLAGS_RE = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+def combinable(pattern: "re.Pattern[str]") -> bool:
+    """Whether ``pattern`` can be one alternative of a combined scanner."""
+
+    if not isinstance(pattern.pattern, str) or pattern.groupindex:
+        return False
+    flags = pattern.flags & ~re.UNICODE
+    if flags & ~sum(SCOPED_FLAGS):
+        return False
+    if GROUP_REFERENCE_RE.search(pattern.pattern) or GLOBAL_FLAGS_RE.match(pattern.pattern):
+        return False
+    # A pattern that can match the empty string hits at every offset; it
+    # keeps its own ``finditer`` loop.
+    return not matches_empty(pattern)
+
+
+def matches_empty(pattern: "re.Pattern[str]") -> bool:
+    """Whether ``pattern`` can match the empty string somewhere (``x*``, ``\\b``, ``(?=a)``)."""
+
+    if pattern.match("") is not None:
+        return True
+    try:
+        return sre_parse.parse(pattern.pattern, pattern.flags).getwidth()[0] == 0
+    except (re.error, RecursionError):
+        return True
+
+
+def _alternative(index: int, pattern: "re.Pattern[str]") -> str:
+    letters = "".join(letter for flag, letter in SCOPED_FLAGS.items() if pattern.flags & flag)
+    # In verbose mode a line break ends a trailing comment before the ")".
+    end = "\n)" if pattern.flags & re.VERBOSE else ")"
+    return f"(?P<p{index}>(?{letters}:{pattern.pattern}{end})"
+
+
+# Character classes larger than this are treated as "any character".
+MAX_FIRST_CHARS = 128
+
+
+def first_chars(pattern: "re.Pattern[str]") -> FrozenSet[str] | None:
+    """Characters a match of ``pattern`` can start with; None when unbounded."""
+
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except (re.error, RecursionError):
+        return None
+    chars, nullable = _first(list(parsed))
+    if chars is None or nullable:
+        return None
+    if pattern.flags & re.IGNORECASE:
+        chars = chars | {c.lower() for c in chars} | {c.upper() for c in chars}
+    return frozenset(chars)
+
+
+def _first(items: list) -> Tuple[set | None, bool]:
+    """First characters of a parsed sequence, and whether it can match empty."""
+
+    c = sre_constants
+    chars: set = set()
+    for op, av in items:
+        if op is c.AT or op is c.ASSERT or op is c.ASSERT_NOT:
+            continue  # zero width; the next item decides
+        if op is c.LITERAL:
+            return chars | {chr(av)}, False
+        if op is c.IN:
+            found = _in_chars(av)
+            return (None if found is None else chars | found), False
+        if op is c.SUBPATTERN:
+            found, nullable = _first(list(av[-1]))
+        elif op is c.BRANCH:
+            found, nullable = set(), False
+            for alternative in av[1]:
+                branch, empty = _first(list(alternative))
+                if branch is None:
+                    return None, False
+                found |= branch
+                nullable = nullable or empty
+        elif op in (c.MAX_REPEAT, c.MIN_REPEAT, getattr(c, "POSSESSIVE_REPEAT", None)):
+            found, nullable = _first(list(av[2]))
+            nullable = nullable or av[0] == 0
+        else:
+            return None, False
+        if found is None:
+            return None, False
+        chars |= found
+        if not nullable:
+            return chars, False
+    return chars, True
+
+
+def _in_chars(items: list) -> set | None:
+    c = sre_constants
+    chars: set = set()
+    for op, av in items:
+        if op is c.LITERAL:
+            chars.add(chr(av))
+        elif op is c.RANGE and av[1] - av[0] < MAX_FIRST_CHARS:
+            chars.update(map(chr, range(av[0], av[1] + 1)))
+        else:  # negated sets, categories (\w, \s...) and wide ranges
+            return None
+    return chars if len(chars) <= MAX_FIRST_CHARS else None
+
+
+class MultiPatternScanner:
+    """Finds the matches of every pattern in one left-to-right search."""
+
+    def __init__(self, patterns: Sequence["re.Pattern[str]"]) -> None:
+        for pattern in patterns:
+            if not combinable(pattern):
+                raise ValueError(f"Pattern cannot be combined: {pattern.pattern!r}")
+        self.patterns = list(patterns)
+        alternatives = [_alternative(index, pattern) for index, pattern in enumerate(self.patterns)]
+        # _tails[k] holds alternatives k.. so that, after alternative k - 1
+        # matched at an offset, the later ones are tried at that offset.
+        self._tails = [re.compile("|".join(alternatives[start:])) for start in range(len(alternatives))]
+        starts = [first_chars(pattern) for pattern in self.patterns]
+        self._search = self._tails[0].search if self._tails else None
+        if self._tails and all(chars is not None for chars in starts):
+            charset = "".join(sorted(re.escape(char) for chars in starts for char in chars))
+            # Case folding also maps a few non-ASCII letters (e.g. "\u017f" to "s").
+            if any(pattern.flags & re.IGNORECASE for pattern in self.patterns):
+                charset = f"(?i:[{charset}])"
+            else:
+                charset = f"[{charset}]"
+            self._search = re.compile(f"(?={charset})(?:{self._tails[0].pattern})").search
+
+    def scan(self, text: str, deadline: "Deadline | None" = None) -> List[List["re.Match[str]"]]:
+        """Per pattern, in order, the matches ``pattern.finditer(text)`` yields.
+
+        ``deadline`` is checked after every hit.
+        """
+
+        count = len(self.patterns)
+        found: List[List[re.Match[str]]] = [[] for _ in range(count)]
+        if not count:
+            return found
+        blocked = [0] * count  # end of each pattern's last match
+        search, tails, patterns = self._search, self._tails, self.patterns
+        pos = 0
+        while True:
+            hit = search(text, pos)
+            if hit is None:
+                return found
+            start = hit.start()
+            if deadline is not None:
+                deadline.check()
+            while hit is not None:
+                index = int(hit.lastgroup[1:])
+                if start >= blocked[index]:
+                    match = patterns[index].match(text, start)
+                    if match is not None:
+                        found[index].append(match)
+                        blocked[index] = max(match.end(), start + 1)
+                index += 1
+                hit = tails[index].match(text, start) if index < count else None
+            pos = start + 1
+            if pos > len(text):  # ``search`` clamps ``pos`` and would find the same hit again
+                return found
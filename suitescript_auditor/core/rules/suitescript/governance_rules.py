@@ -3,67 +3,58 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable
+from typing import Iterable, List
 
-from ..base import Hotspot, Rule, RuleContext
+from ..base import Hotspot, PatternRule, Rule, RuleContext
 
 
-class SearchEachLoopRule:
-    rule_id = "governance.search_each_loop"
-    severity = "HIGH"
-    title = "search.run().each inside loop"
+class LoopCallRule(PatternRule):
+    """Reports matches inside a loop body or iteration callback.
 
-    pattern = re.compile(r"(for|while)\s*\([^)]*\)\s*{[^}]*search\.run\(\)\.each", re.DOTALL)
+    Calls are matched on their own; the scope index decides whether a loop
+    encloses them, however deeply nested. A finding spans from the loop
+    keyword to the call.
+    """
 
-    def applies(self, context: RuleContext) -> bool:
-        return True
+    def build(self, context: RuleContext, matches: List[re.Match[str]]) -> Iterable[Hotspot]:
+        if not matches:
+            return
+        scopes = context.scopes()
+        spans = []
+        for match in matches:
+            loop = scopes.enclosing_loop(match.start())
+            if loop is not None:
+                spans.append((loop.start, match.end()))
+        for line_range in context.line_map.iter_ranges(spans):
+            yield self.build_hotspot(context, line_range.start, line_range.end)
 
-    def evaluate(self, context: RuleContext) -> Iterable[Hotspot]:
-        for match in self.pattern.finditer(context.text):
-            lr = context.line_map.to_range(match.start(), match.end())
-            yield Hotspot(
-                rule_id=self.rule_id,
-                severity=self.severity,
-                title=self.title,
-                description="search.run().each inside tight loop may exhaust governance units.",
-                start_line=lr.start,
-                end_line=lr.end,
-                snippet=context.line_map.numbered_text(lr.start, lr.end),
-                recommendations=[
-                    "Move the each() call outside the loop or paginate results.",
-                    "Cache search results before iterating.",
-                ],
-                score_1_10=2,
-            )
+
+class SearchEachLoopRule(LoopCallRule):
+    rule_id = "governance.search_each_loop"
+    severity = "HIGH"
+    title = "search.run().each inside loop"
+    pattern = re.compile(r"search\.run\(\)\.each")
+    required_literals = ("search.run().each",)
+    description = "search.run().each inside tight loop may exhaust governance units."
+    recommendations = (
+        "Move the each() call outside the loop or paginate results.",
+        "Cache search results before iterating.",
+    )
+    score_1_10 = 2
 
 
-class RecordLoadInLoopRule:
+class RecordLoadInLoopRule(LoopCallRule):
     rule_id = "governance.record_load_loop"
     severity = "MED"
     title = "Repeated record.load/save inside loop"
-
-    pattern = re.compile(r"(for|while)[^{]+{[^}]*record\.(load|save)", re.DOTALL)
-
-    def applies(self, context: RuleContext) -> bool:
-        return True
-
-    def evaluate(self, context: RuleContext) -> Iterable[Hotspot]:
-        for match in self.pattern.finditer(context.text):
-            lr = context.line_map.to_range(match.start(), match.end())
-            yield Hotspot(
-                rule_id=self.rule_id,
-                severity=self.severity,
-                title=self.title,
-                description="record.load/save in loops is prone to governance spikes.",
-                start_line=lr.start,
-                end_line=lr.end,
-                snippet=context.line_map.numbered_text(lr.start, lr.end),
-                recommendations=[
-                    "Batch record updates and persist outside of iteration.",
-                    "Review whether field changes require multiple saves.",
-                ],
-                score_1_10=4,
-            )
+    pattern = re.compile(r"\brecord\.(load|save)\b")
+    required_literals = ("record.load", "record.save")
+    description = "record.load/save in loops is prone to governance spikes."
+    recommendations = (
+        "Batch record updates and persist outside of iteration.",
+        "Review whether field changes require multiple saves.",
+    )
+    score_1_10 = 4
 
 
 def get_rules() -> list[Rule]:
@@ -3,39 +3,37 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable
+from typing import Iterable, List
 
-from ..base import Hotspot, Rule, RuleContext
+from ..base import Hotspot, PatternRule, Rule, RuleContext
 
 
-class MissingRetryRule:
+class MissingRetryRule(PatternRule):
     rule_id = "mapreduce.missing_retry"
     severity = "HIGH"
     title = "Map/Reduce summarize lacks retry guard"
-    pattern = re.compile(r"summarize\s*:\s*function\s*\([^)]*\)\s*{[^}]*log\.", re.DOTALL)
-
-    def applies(self, context: RuleContext) -> bool:
-        return not context.script_type or "MapReduce" in context.script_type
-
-    def evaluate(self, context: RuleContext) -> Iterable[Hotspot]:
-        if "summarize" not in context.text:
-            return []
-        for match in self.pattern.finditer(context.text):
-            lr = context.line_map.to_range(match.start(), match.end())
-            yield Hotspot(
-                rule_id=self.rule_id,
-                severity=self.severity,
-                title=self.title,
-                description="Summarize stage logs errors but does not reschedule or retry.",
-                start_line=lr.start,
-                end_line=lr.end,
-                snippet=context.line_map.numbered_text(lr.start, lr.end),
-                recommendations=[
-                    "Use summarize.output.iterator() to reschedule failed keys.",
-                    "Set summary.resume and call mapContext.isRestarted for dedupe.",
-                ],
-                score_1_10=4,
-            )
+    pattern = re.compile(r"\blog\.")
+    script_types = ("MapReduceScript",)
+    required_literals = ("summarize",)
+    description = "Summarize stage logs errors but does not reschedule or retry."
+    recommendations = (
+        "Use summarize.output.iterator() to reschedule failed keys.",
+        "Set summary.resume and call mapContext.isRestarted for dedupe.",
+    )
+    score_1_10 = 4
+
+    def build(self, context: RuleContext, matches: List[re.Match[str]]) -> Iterable[Hotspot]:
+        if not matches or "summarize" not in context.view("code"):
+            return
+        scopes = context.scopes()
+        # One finding per summarize body, up to its first log call.
+        first_log = {}
+        for match in matches:
+            entry = scopes.entry_point(match.start())
+            if entry is not None and entry.name == "summarize":
+                first_log.setdefault(entry.start, match.end())
+        for line_range in context.line_map.iter_ranges(first_log.items()):
+            yield self.build_hotspot(context, line_range.start, line_range.end)
 
 
 def get_rules() -> list[Rule]:
@@ -3,94 +3,62 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable
+from typing import Iterable, List
 
-from ..base import Hotspot, Rule, RuleContext
+from ..base import Hotspot, PatternRule, Rule, RuleContext
 
 
-class HttpsAllowlistRule:
+class HttpsAllowlistRule(PatternRule):
     rule_id = "security.https_allowlist"
     severity = "HIGH"
     title = "HTTPS request without allowlist"
-    pattern = re.compile(r"https\.request\([^)]*['\"]http", re.IGNORECASE)
-
-    def applies(self, context: RuleContext) -> bool:
-        return True
-
-    def evaluate(self, context: RuleContext) -> Iterable[Hotspot]:
-        for match in self.pattern.finditer(context.text):
-            lr = context.line_map.to_range(match.start(), match.end())
-            yield Hotspot(
-                rule_id=self.rule_id,
-                severity=self.severity,
-                title=self.title,
-                description="External call lacks explicit allowlist mention.",
-                start_line=lr.start,
-                end_line=lr.end,
-                snippet=context.line_map.numbered_text(lr.start, lr.end),
-                recommendations=[
-                    "Inject target URL only from configuration or allowlist.",
-                    "Document the remote endpoint in Settings > Git section.",
-                ],
-                score_1_10=2,
-            )
-
-
-class SecretLiteralRule:
+    fast_path = True
+    pattern = re.compile(r"https\.request\([^)]{0,400}['\"]http", re.IGNORECASE)
+    required_literals = ("https.request",)
+    view = "no_comments"
+    description = "External call lacks explicit allowlist mention."
+    recommendations = (
+        "Inject target URL only from configuration or allowlist.",
+        "Document the remote endpoint in Settings > Git section.",
+    )
+    score_1_10 = 2
+
+
+class SecretLiteralRule(PatternRule):
     rule_id = "security.secret_literal"
     severity = "HIGH"
     title = "Possible secret literal"
+    fast_path = True
     pattern = re.compile(r"(token|secret|password)\s*[:=]\s*['\"][A-Za-z0-9+/=]{8,}", re.IGNORECASE)
-
-    def applies(self, context: RuleContext) -> bool:
-        return True
-
-    def evaluate(self, context: RuleContext) -> Iterable[Hotspot]:
-        for match in self.pattern.finditer(context.text):
-            lr = context.line_map.to_range(match.start(), match.end())
+    required_literals = ("token", "secret", "password")
+    view = "no_comments"
+    description = "Potential secret embedded directly in source."
+    recommendations = (
+        "Move credentials to keyring-backed storage.",
+        "Replace literals with configuration references.",
+    )
+    score_1_10 = 1
+
+    def build(self, context: RuleContext, matches: List[re.Match[str]]) -> Iterable[Hotspot]:
+        spans = [match.span() for match in matches]
+        for match, lr in zip(matches, context.line_map.iter_ranges(spans)):
             redacted = [line.replace(match.group(0), "***REDACTED***") for line in context.line_map.numbered_text(lr.start, lr.end)]
-            yield Hotspot(
-                rule_id=self.rule_id,
-                severity=self.severity,
-                title=self.title,
-                description="Potential secret embedded directly in source.",
-                start_line=lr.start,
-                end_line=lr.end,
-                snippet=redacted,
-                recommendations=[
-                    "Move credentials to keyring-backed storage.",
-                    "Replace literals with configuration references.",
-                ],
-                score_1_10=1,
-            )
+            yield self.build_hotspot(context, lr.start, lr.end, snippet=redacted)
 
 
-class EvalUsageRule:
+class EvalUsageRule(PatternRule):
     rule_id = "security.eval_usage"
     severity = "HIGH"
     title = "Use of eval/new Function"
+    fast_path = True
     pattern = re.compile(r"\b(eval|new\s+Function)\b")
-
-    def applies(self, context: RuleContext) -> bool:
-        return True
-
-    def evaluate(self, context: RuleContext) -> Iterable[Hotspot]:
-        for match in self.pattern.finditer(context.text):
-            lr = context.line_map.to_range(match.start(), match.end())
-            yield Hotspot(
-                rule_id=self.rule_id,
-                severity=self.severity,
-                title=self.title,
-                description="Dynamic code execution is risky in SuiteScript.",
-                start_line=lr.start,
-                end_line=lr.end,
-                snippet=context.line_map.numbered_text(lr.start, lr.end),
-                recommendations=[
-                    "Remove eval usage and rely on explicit module references.",
-                    "Validate inputs before executing dynamic expressions.",
-                ],
-                score_1_10=2,
-            )
+    required_literals = ("eval", "Function")
+    description = "Dynamic code execution is risky in SuiteScript."
+    recommendations = (
+        "Remove eval usage and rely on explicit module references.",
+        "Validate inputs before executing dynamic expressions.",
+    )
+    score_1_10 = 2
 
 
 def get_rules() -> list[Rule]:
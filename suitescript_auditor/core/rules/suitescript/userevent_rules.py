@@ -3,41 +3,37 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable
+from typing import Iterable, List
 
-from ..base import Hotspot, Rule, RuleContext
+from ..base import Hotspot, PatternRule, Rule, RuleContext
 
 
-class AfterSubmitRewriteRule:
+class AfterSubmitRewriteRule(PatternRule):
     rule_id = "userevent.after_submit_rewrite"
     severity = "HIGH"
     title = "afterSubmit rewriting transactions without idempotency"
-    pattern = re.compile(r"afterSubmit[\s\S]*record\.(submitFields|save)", re.IGNORECASE)
-
-    def applies(self, context: RuleContext) -> bool:
-        if not context.script_type:
-            return True
-        return "UserEvent" in context.script_type
-
-    def evaluate(self, context: RuleContext) -> Iterable[Hotspot]:
-        if "afterSubmit" not in context.text:
-            return []
-        for match in self.pattern.finditer(context.text):
-            lr = context.line_map.to_range(match.start(), match.end())
-            yield Hotspot(
-                rule_id=self.rule_id,
-                severity=self.severity,
-                title=self.title,
-                description="afterSubmit modifies records without idempotent guard (newRecord type?).",
-                start_line=lr.start,
-                end_line=lr.end,
-                snippet=context.line_map.numbered_text(lr.start, lr.end),
-                recommendations=[
-                    "Check executionContext to avoid recursive writes.",
-                    "Introduce before/after flag or hash comparison.",
-                ],
-                score_1_10=3,
-            )
+    pattern = re.compile(r"\brecord\.(submitFields|save)\b")
+    script_types = ("UserEventScript",)
+    required_literals = ("record.submitFields", "record.save")
+    description = "afterSubmit modifies records without idempotent guard (newRecord type?)."
+    recommendations = (
+        "Check executionContext to avoid recursive writes.",
+        "Introduce before/after flag or hash comparison.",
+    )
+    score_1_10 = 3
+
+    def build(self, context: RuleContext, matches: List[re.Match[str]]) -> Iterable[Hotspot]:
+        if not matches or "afterSubmit" not in context.view("code"):
+            return
+        scopes = context.scopes()
+        # One finding per afterSubmit body, from its start to its last write.
+        last_write = {}
+        for match in matches:
+            entry = scopes.entry_point(match.start())
+            if entry is not None and entry.name == "afterSubmit":
+                last_write[entry.start] = match.end()
+        for line_range in context.line_map.iter_ranges(last_write.items()):
+            yield self.build_hotspot(context, line_range.start, line_range.end)
 
 
 def get_rules() -> list[Rule]:
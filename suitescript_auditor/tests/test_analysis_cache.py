@@ -0,0 +1,94 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+from suitescript_auditor.core.io.discovery import SourceFile
+from suitescript_auditor.core.io.snapshot import read_snapshot
+from suitescript_auditor.core.jobs.analysis import analyze_file
+from suitescript_auditor.core.jobs.cache import AnalysisCache, CacheStats
+from suitescript_auditor.core.jobs.models import Job, JobSettings, JobSourceType
+from suitescript_auditor.core.jobs.runner import JobRunner, default_rule_engine
+from suitescript_auditor.tests.test_job_runner import SAMPLE_JS
+
+
+def _job(project, job_id):
+    return Job(
+        id=job_id,
+        project_name="Cache Demo",
+        source=project,
+        source_type=JobSourceType.REPOSITORY,
+        created_at=datetime.utcnow(),
+        settings=JobSettings(),
+    )
+
+
+def test_runner_reuses_cached_analysis(tmp_path):
+    project = tmp_path / "repo"
+    project.mkdir()
+    (project / "a.js").write_text(SAMPLE_JS, encoding="utf-8")
+    (project / "b.js").write_text(SAMPLE_JS.replace("salesorder", "invoice"), encoding="utf-8")
+    runner = JobRunner(cache_dir=tmp_path / "cache")
+
+    first_job = _job(project, "first")
+    first = runner.run(first_job)
+    first_audit = json.loads((first.docs_path / "audit" / "a.js.audit.json").read_text(encoding="utf-8"))
+    assert first_job.results["cache"]["misses"] == 2
+
+    (project / "b.js").write_text(SAMPLE_JS + "\n// edited\n", encoding="utf-8")
+    second_job = _job(project, "second")
+    second = runner.run(second_job)
+    assert second_job.results["cache"]["hits"] == 1
+    assert second_job.results["cache"]["misses"] == 1
+    second_audit = json.loads((second.docs_path / "audit" / "a.js.audit.json").read_text(encoding="utf-8"))
+    assert second_audit == first_audit
+
+
+def test_cache_key_tracks_rules_and_settings(tmp_path):
+    cache = AnalysisCache(tmp_path)
+    base = cache.key("abc", "rules-v1", JobSettings())
+    assert base == cache.key("abc", "rules-v1", JobSettings(workers=4, llm_mode=True))
+    assert base != cache.key("abc", "rules-v2", JobSettings())
+    assert base != cache.key("abc", "rules-v1", JobSettings(exclude_minified=False))
+
+
+def test_ruleset_fingerprint_tracks_rule_text_and_score():
+    engine = default_rule_engine()
+    base = engine.fingerprint()
+    rule = engine.rules[0]
+    for name, value in [
+        ("title", "Renamed"),
+        ("description", "Reworded."),
+        ("recommendations", ("Do something else.",)),
+        ("score_1_10", 9),
+    ]:
+        original = getattr(rule, name)
+        setattr(rule, name, value)
+        assert engine.fingerprint() != base, name
+        setattr(rule, name, original)
+    assert engine.fingerprint() == base
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    source = tmp_path / "script.js"
+    source.write_text(SAMPLE_JS, encoding="utf-8")
+    source_file = SourceFile(path=source, rel_path=Path("script.js"), size=source.stat().st_size)
+    snapshot = read_snapshot(source_file)
+    analysis = analyze_file(snapshot, JobRunner(cache_dir=tmp_path / "unused").rule_engine)
+
+    probe = AnalysisCache(tmp_path / "probe")
+    probe.put("probe", analysis)
+    entry_size = probe.total_bytes
+
+    cache = AnalysisCache(tmp_path / "cache", max_bytes=entry_size * 2)
+    stats = CacheStats()
+    cache.put("k1", analysis, stats)
+    cache.put("k2", analysis, stats)
+    assert cache.get("k1", snapshot, stats) is not None
+    cache.put("k3", analysis, stats)
+
+    assert stats.evictions == 1
+    assert cache.get("k2", snapshot, stats) is None
+    restored = cache.get("k1", snapshot, stats)
+    assert restored.hotspots == analysis.hotspots
+    assert restored.symbols == analysis.symbols
+    assert len(AnalysisCache(tmp_path / "cache")) == 2
@@ -0,0 +1,68 @@
+import json
+
+from suitescript_auditor.benchmarks import CorpusSpec, compare, generate_corpus, run_benchmarks
+from suitescript_auditor.benchmarks.__main__ import main
+from suitescript_auditor.benchmarks.corpus import SCRIPT_TYPES
+from suitescript_auditor.core.parsing import module_resolver, suitescript_header
+
+SMALL = CorpusSpec(files=12, min_blocks=2, max_blocks=6, helper_modules=2, pathological_kb=4)
+
+
+def test_corpus_is_deterministic_and_covers_script_types(tmp_path):
+    first = generate_corpus(tmp_path / "a", SMALL)
+    second = generate_corpus(tmp_path / "b", SMALL)
+    assert [f.path for f in first.files] == [f.path for f in second.files]
+    assert (tmp_path / "a" / first.files[-1].path).read_bytes() == (tmp_path / "b" / second.files[-1].path).read_bytes()
+
+    scripts = [f for f in first.files if f.kind == "script"]
+    assert {f.script_type for f in scripts} == set(SCRIPT_TYPES)
+    text = (tmp_path / "a" / scripts[0].path).read_text(encoding="utf-8")
+    assert suitescript_header.parse_header(text).script_type == scripts[0].script_type
+    assert any(m.specifier.startswith("N/") for m in module_resolver.find_modules(text))
+
+
+def test_corpus_includes_minified_and_pathological_files(tmp_path):
+    spec = CorpusSpec(files=6, minified_ratio=0.5, pathological_ratio=0.5, pathological_kb=2, helper_modules=0)
+    manifest = generate_corpus(tmp_path, spec)
+    kinds = {f.kind for f in manifest.files}
+    assert kinds == {"minified", "pathological"}
+    assert all(f.bytes >= 2 * 1024 for f in manifest.files)
+
+
+def test_benchmark_report_times_each_stage_and_rule(tmp_path):
+    generate_corpus(tmp_path, SMALL)
+    report = run_benchmarks(tmp_path, repeat=1)
+    assert set(report["stages"]) == {
+        "discovery", "snapshot", "line_map", "lexer", "scopes", "header", "modules",
+        "extract_functions", "rules", "docs_writer", "packaging", "job",
+    }
+    assert report["stages"]["discovery"]["items"] == report["corpus"]["files"]
+    assert "security.eval_usage" in report["rules"]
+    assert not (tmp_path / "Docs").exists()
+    json.dumps(report)
+
+
+def test_compare_flags_regressions():
+    baseline = {"stages": {"rules": {"min_seconds": 1.0}, "job": {"min_seconds": 2.0}}}
+    current = {"stages": {"rules": {"min_seconds": 1.5}, "job": {"min_seconds": 2.1}}}
+    rows = {row["metric"]: row for row in compare(baseline, current, threshold=0.1)}
+    assert rows["stages.rules"]["regression"]
+    assert not rows["stages.job"]["regression"]
+
+
+def test_cli_writes_report_and_fails_on_regression(tmp_path):
+    output = tmp_path / "report.json"
+    args = ["--corpus", str(tmp_path / "corpus"), "--files", "4", "--min-blocks", "1", "--max-blocks", "4"]
+    args += ["--repeat", "1"]
+    assert main(args + ["--stage", "header", "--output", str(output)]) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert list(report["stages"]) == ["header"]
+
+    assert main(args + ["--stage", "header", "--profile-rules", "--output", str(output)]) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["rule_profile"]["files"] == report["corpus"]["files"]
+
+    report["stages"]["header"]["min_seconds"] = 1e-9
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report), encoding="utf-8")
+    assert main(args + ["--stage", "header", "--output", str(output), "--compare", str(baseline)]) == 1
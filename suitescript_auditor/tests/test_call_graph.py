@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from suitescript_auditor.core.io.discovery import SourceFile
+from suitescript_auditor.core.parsing.call_graph import CallIndex
+from suitescript_auditor.core.parsing.module_graph import ModuleGraph
+from suitescript_auditor.core.parsing.parsed_file import ParsedFile
+
+MAIN = """define(['N/record', './lib/utils'], function (record, utils) {
+    function helper(id) {
+        return record.load({ type: 'salesorder', id: id });
+    }
+    function execute(context) {
+        // utils.ignored(1);
+        var label = "utils.alsoIgnored()";
+        ids.forEach(function (id) {
+            utils.doThing(id);
+            helper(id);
+        });
+        context.newRecord.getValue('x');
+        utils.log(label);
+    }
+    return { execute: execute };
+});
+"""
+
+UTILS = """define(['N/record'], function (record) {
+    function doThing(id) {
+        record.submitFields({ type: 'customer', id: id, values: {} });
+    }
+    function log(message) {}
+    return { doThing: doThing, log: log };
+});
+"""
+
+
+def test_extract_calls_names_local_and_module_calls():
+    calls = ParsedFile(MAIN, "main.js").calls
+    assert [(c.caller, c.callee, c.module, c.line, c.in_loop) for c in calls] == [
+        ("helper", "record.load", "N/record", 3, False),
+        ("execute", "utils.doThing", "./lib/utils", 9, True),
+        ("execute", "helper", "", 10, True),
+        ("execute", "utils.log", "./lib/utils", 13, False),
+    ]
+
+
+def test_call_index_maps_callees_to_callers_across_files():
+    graph = ModuleGraph()
+    index = CallIndex(graph)
+    for path, text in {"main.js": MAIN, "lib/utils.js": UTILS}.items():
+        graph.add_file(SourceFile(path=Path("/p") / path, rel_path=Path(path), size=len(text)))
+        parsed = ParsedFile(text, path)
+        graph.set_imports(path, [m.specifier for m in parsed.modules])
+        index.add_file(path, parsed.calls)
+
+    assert index.callers("lib/utils.js:doThing") == [("main.js", "execute", 9, True)]
+    assert index.callers("N/record.load") == [("main.js", "helper", 3, False)]
+    assert index.called_in_loops() == {"lib/utils.js:doThing": [("main.js", "execute", 9, True)]}
+    assert set(index.called_in_loops(cross_file=False)) == {"lib/utils.js:doThing", "main.js:helper"}
+    payload = index.as_dict()
+    assert payload["called_in_loops"] == ["lib/utils.js:doThing"]
+    assert payload["netsuite_calls"] == {"N/record.load": 1, "N/record.submitFields": 1}
@@ -0,0 +1,71 @@
+import json
+import subprocess
+import sys
+import zipfile
+
+from suitescript_auditor.cli import EXIT_FAILED, EXIT_OK, EXIT_THRESHOLD, EXIT_USAGE, main
+
+from .test_job_runner import SAMPLE_JS
+
+
+def _repo(path):
+    path.mkdir()
+    (path / "script.js").write_text(SAMPLE_JS, encoding="utf-8")
+    return path
+
+
+def test_audit_runs_repos_and_zips_in_parallel(tmp_path, capsys):
+    repo = _repo(tmp_path / "repo")
+    archive = tmp_path / "export.zip"
+    with zipfile.ZipFile(archive, "w") as handle:
+        handle.writestr("src/script.js", SAMPLE_JS)
+
+    code = main(["audit", str(repo), str(archive), "--jobs", "2", "--no-cache"])
+    out, err = capsys.readouterr()
+
+    assert code == EXIT_OK
+    jobs = json.loads(out)["jobs"]
+    assert [job["project_name"] for job in jobs] == ["repo", "export"]
+    assert all(job["status"] == "completed" and job["counts"]["files"] == 1 for job in jobs)
+    events = [json.loads(line) for line in err.splitlines()]
+    assert {event["id"] for event in events if event["status"] == "completed"} == {job["id"] for job in jobs}
+
+
+def test_audit_exit_codes_follow_thresholds_and_failures(tmp_path, capsys):
+    repo = _repo(tmp_path / "repo")
+
+    assert main(["audit", str(repo), "--fail-under", "9.5", "--progress", "none"]) == EXIT_THRESHOLD
+    job = json.loads(capsys.readouterr().out)["jobs"][0]
+    assert job["violations"] == [f"summary_scores.overall {job['summary_scores']['overall']:.2f} < 9.5"]
+
+    assert main(["audit", str(repo), "--fail-under", "1", "--max-critical-files", "0"]) == EXIT_OK
+    capsys.readouterr()
+
+    broken = tmp_path / "broken.zip"
+    broken.write_bytes(b"not a zip")
+    assert main(["audit", str(broken), "--progress", "none"]) == EXIT_FAILED
+    assert json.loads(capsys.readouterr().out)["jobs"][0]["error"]
+
+    assert main(["audit", str(tmp_path / "missing")]) == EXIT_USAGE
+
+
+def test_audit_loads_rule_packs(tmp_path, capsys):
+    repo = _repo(tmp_path / "repo")
+    pack = tmp_path / "site.toml"
+    pack.write_text('[[rules]]\nid = "site.any_define"\nseverity = "LOW"\npattern = "define"\n', encoding="utf-8")
+    assert main(["audit", str(repo), "--rule-pack", str(pack), "--no-cache", "--progress", "none"]) == EXIT_OK
+    capsys.readouterr()
+
+    pack.write_text('[[rules]]\nid = "site.broken"\nseverity = "LOW"\npattern = "("\n', encoding="utf-8")
+    assert main(["audit", str(repo), "--rule-pack", str(pack)]) == EXIT_USAGE
+    error = json.loads(capsys.readouterr().err)
+    assert error["message"] == "invalid rule pack" and "site.broken" in error["detail"]
+
+
+def test_cli_does_not_import_tkinter():
+    probe = (
+        "import sys, suitescript_auditor.cli as cli, suitescript_auditor.core.jobs.queue;"
+        "cli.build_parser(); print('tkinter' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
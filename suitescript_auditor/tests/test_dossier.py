@@ -1,19 +1,16 @@
-from pathlib import Path
-
 from suitescript_auditor.core.llm import dossier
-from suitescript_auditor.core.parsing.line_map import LineMap
 from suitescript_auditor.core.parsing.module_resolver import ModuleImport
+from suitescript_auditor.core.parsing.parsed_file import ParsedFile
 from suitescript_auditor.core.parsing.symbol_index import FunctionEntry
 from suitescript_auditor.core.rules.base import Hotspot
 
 
 def test_dossier_builder_creates_snippets():
-    path = Path("example.js")
     text = "function onRequest() { return true; }"
-    line_map = LineMap.from_text(text)
     header = type("Header", (), {"api_version": "2.x", "script_type": "Suitelet", "module_scope": None})
     modules = [ModuleImport(specifier="N/record", alias="record")]
     symbols = [FunctionEntry(name="onRequest", kind="Function", lines=(1, 1), signature="()", exported=True)]
+    parsed = ParsedFile(text, "example.js", header=header, modules=modules, symbols=symbols)
     hotspots = [
         Hotspot(
             rule_id="x",
@@ -24,18 +21,28 @@ def test_dossier_builder_creates_snippets():
             end_line=1,
             snippet=["0001| code"],
             recommendations=["fix"],
-        )
+        ),
+        Hotspot(
+            rule_id="y",
+            severity="LOW",
+            title="no evidence",
+            description="desc",
+            start_line=1,
+            end_line=1,
+            snippet=[],
+            recommendations=[],
+        ),
     ]
     data = dossier.build_dossier(
-        path=path,
-        text=text,
-        line_map=line_map,
-        header=header,
-        modules=modules,
-        symbols=symbols,
+        parsed=parsed,
         hotspots=hotspots,
         project_name="proj",
         settings={"tier": "Economic"},
     )
-    assert data["file_meta"]["path"] == "example.js"
+    assert data["file_meta"] == {"path": "example.js", "loc": 1}
+    assert data["symbols"][0]["name"] == "onRequest"
     assert data["snippets"][0]["snippet_id"] == "S1"
+    # The hotspot's own (possibly redacted) evidence is reused as is.
+    assert data["snippets"][0]["text_numbered"] == ["0001| code"]
+    assert data["snippets"][1]["text_numbered"] == ["0001| function onRequest() { return true; }"]
+    assert sorted(parsed.computed()) == ["header", "line_map", "modules", "symbols"]
@@ -0,0 +1,72 @@
+import threading
+import time
+from dataclasses import FrozenInstanceError
+from datetime import datetime
+
+import pytest
+
+from suitescript_auditor.core.jobs.events import EventBus, ProgressSnapshot
+from suitescript_auditor.core.jobs.models import Job, JobSettings, JobSourceType, JobStatus
+
+
+def _job():
+    return Job(
+        id="job1",
+        project_name="Demo",
+        source=".",
+        source_type=JobSourceType.REPOSITORY,
+        created_at=datetime.utcnow(),
+        settings=JobSettings(),
+    )
+
+
+def test_event_bus_coalesces_updates_and_delivers_terminal_state():
+    bus = EventBus(rate_hz=20)
+    received = []
+    bus.subscribe(received.append)
+    job = _job()
+    for idx in range(1, 2001):
+        job.files_processed = idx
+        bus.publish(job)
+    job.status = JobStatus.COMPLETED
+    bus.publish(job)
+    assert bus.flush()
+
+    assert 1 <= len(received) < 100
+    assert received[-1].status == JobStatus.COMPLETED
+    assert received[-1].files_processed == 2000
+    with pytest.raises(FrozenInstanceError):
+        received[-1].progress = 0.5
+    bus.close()
+
+
+def test_slow_or_broken_subscribers_do_not_block_publishers():
+    bus = EventBus(rate_hz=0)
+    gate = threading.Event()
+    fast = []
+
+    def slow(snapshot: ProgressSnapshot) -> None:
+        gate.wait(timeout=5)
+
+    def broken(snapshot: ProgressSnapshot) -> None:
+        raise RuntimeError("subscriber bug")
+
+    bus.subscribe(slow)
+    bus.subscribe(broken)
+    bus.subscribe(fast.append)
+    job = _job()
+
+    started = time.perf_counter()
+    for idx in range(500):
+        job.files_processed = idx
+        bus.publish(job)
+    assert time.perf_counter() - started < 1.0
+
+    deadline = time.monotonic() + 5
+    while (not fast or fast[-1].files_processed != 499) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert fast[-1].files_processed == 499
+    assert bus.subscriber_errors >= 1
+    gate.set()
+    assert bus.flush()
+    bus.close()
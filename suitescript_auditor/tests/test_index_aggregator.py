@@ -0,0 +1,61 @@
+import random
+
+from suitescript_auditor.core.docs.aggregator import IndexAggregator
+
+
+def _files(count, seed=7):
+    rng = random.Random(seed)
+    files = []
+    for idx in range(count):
+        hotspots = [
+            {"severity": rng.choice(["HIGH", "MED", "LOW"]), "title": f"t{idx}-{pos}", "file": f"f{idx}.js"}
+            for pos in range(rng.randint(0, 4))
+        ]
+        ranking = {"path": f"f{idx}.js", "score_overall": rng.choice([1.0, 2.5, 7.6, 10.0]), "hotspots_high": 0}
+        files.append((ranking, hotspots))
+    return files
+
+
+def _reference_top(files):
+    hotspots = [h for _, hs in files for h in hs]
+    return sorted(hotspots, key=lambda h: {"HIGH": 0, "MED": 1, "LOW": 2}.get(h["severity"], 3))[:10]
+
+
+def test_aggregator_matches_full_sort():
+    files = _files(200)
+    aggregator = IndexAggregator()
+    for ranking, hotspots in files:
+        aggregator.add_file(ranking, hotspots)
+
+    assert aggregator.top_hotspots() == _reference_top(files)
+    all_hotspots = [h for _, hs in files for h in hs]
+    assert aggregator.counts() == {
+        "files": 200,
+        "critical_files": sum(1 for r, _ in files if r["score_overall"] <= 3),
+        "hotspots_high": sum(1 for h in all_hotspots if h["severity"] == "HIGH"),
+        "hotspots_med": sum(1 for h in all_hotspots if h["severity"] == "MED"),
+        "hotspots_low": sum(1 for h in all_hotspots if h["severity"] == "LOW"),
+    }
+    assert aggregator.summary_scores()["overall"] == sum(r["score_overall"] for r, _ in files) / 200
+
+
+def test_aggregator_merges_partials_deterministically():
+    files = _files(50, seed=3)
+    left, right = IndexAggregator(), IndexAggregator()
+    for order, (ranking, hotspots) in enumerate(files):
+        (left if order % 2 else right).add_file(ranking, hotspots, order=order)
+
+    merged = IndexAggregator().merge(right).merge(left)
+    assert merged.top_hotspots() == _reference_top(files)
+    assert merged.counts()["files"] == 50
+
+
+def test_aggregator_score_distribution():
+    aggregator = IndexAggregator()
+    for score in [1.0, 2.0, 2.0, 9.5]:
+        aggregator.add_file({"path": "x", "score_overall": score, "hotspots_high": 0}, [])
+    distribution = aggregator.score_distribution()
+    assert distribution["histogram"] == {"1.0": 1, "2.0": 2, "9.5": 1}
+    assert distribution["percentiles"]["p50"] == 2.0
+    assert distribution["percentiles"]["p99"] == 9.5
+    assert IndexAggregator().score_distribution()["percentiles"]["p50"] is None
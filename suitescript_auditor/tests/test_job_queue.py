@@ -1,10 +1,11 @@
+import threading
 from datetime import datetime
+from pathlib import Path
 from types import SimpleNamespace
 
-import pytest
-
 from suitescript_auditor.core.jobs.models import Job, JobSettings, JobSourceType, JobStatus
 from suitescript_auditor.core.jobs.queue import JobQueue
+from suitescript_auditor.core.jobs.scheduler import JobScheduler, ResourceHint
 
 
 class DummyThread:
@@ -34,3 +35,138 @@ def test_job_queue_submit_executes_runner(monkeypatch, tmp_path):
     assert job.status == JobStatus.COMPLETED
     assert calls == [job.id]
     assert queue.list_jobs()
+
+
+def _job(job_id, project, priority=0):
+    return Job(
+        id=job_id,
+        project_name=project,
+        source=Path("."),
+        source_type=JobSourceType.REPOSITORY,
+        created_at=datetime.utcnow(),
+        settings=JobSettings(),
+        priority=priority,
+    )
+
+
+def test_scheduler_orders_by_priority_then_project_fairness():
+    scheduler = JobScheduler(max_concurrent=1)
+    for job in [_job("a1", "A"), _job("a2", "A"), _job("b1", "B"), _job("c1", "C", priority=5)]:
+        scheduler.enqueue(job)
+
+    order = []
+    while scheduler.pending:
+        job = scheduler.next_job()
+        assert scheduler.next_job() is None  # concurrency cap
+        order.append(job.id)
+        scheduler.release(job)
+    assert order == ["c1", "a1", "b1", "a2"]
+
+
+def test_scheduler_keeps_a_lane_for_small_jobs_and_ages_waiting_jobs():
+    now = [0.0]
+    scheduler = JobScheduler(max_concurrent=2, aging_seconds=10, large_job_files=100, clock=lambda: now[0])
+    scheduler.enqueue(_job("big1", "A"), ResourceHint(file_count=500))
+    scheduler.enqueue(_job("big2", "B"), ResourceHint(file_count=500))
+    scheduler.enqueue(_job("small", "C"), ResourceHint(file_count=3))
+    assert scheduler.next_job().id == "big1"
+    assert scheduler.next_job().id == "small"
+
+    now[0] = 25.0  # big2 has waited long enough to outrank a fresh priority 1 job
+    scheduler.enqueue(_job("urgent", "D", priority=1), ResourceHint(file_count=3))
+    scheduler.release(_job("small", "C"))
+    assert scheduler.position(_job("big2", "B")) == 1
+    assert scheduler.next_job().id == "urgent"  # big lane is still occupied by big1
+
+
+def test_job_queue_caps_concurrent_runs(monkeypatch, tmp_path):
+    started = []
+    release = threading.Event()
+
+    def fake_run(job, on_update=None):
+        started.append(job.id)
+        release.wait(timeout=5)
+        job.status = JobStatus.COMPLETED
+
+    queue = JobQueue(runner=SimpleNamespace(run=fake_run), max_concurrent=1)
+    first = queue.submit_job(project_name="A", source=tmp_path, source_type=JobSourceType.REPOSITORY)
+    second = queue.submit_job(project_name="B", source=tmp_path, source_type=JobSourceType.REPOSITORY)
+    assert second.status == JobStatus.PENDING
+    assert queue.queue_position(second) == 1
+    release.set()
+    for _ in range(100):
+        if second.status == JobStatus.COMPLETED:
+            break
+        threading.Event().wait(0.05)
+    assert started == [first.id, second.id]
+
+
+def test_job_queue_sizes_sources_off_the_submitting_thread(tmp_path):
+    estimating = threading.Event()
+    finish_estimate = threading.Event()
+    release = threading.Event()
+
+    def estimate(job):
+        estimating.set()
+        finish_estimate.wait(timeout=5)
+        return ResourceHint(file_count=5000)
+
+    def fake_run(job, on_update=None):
+        release.wait(timeout=5)
+        job.status = JobStatus.COMPLETED
+
+    queue = JobQueue(runner=SimpleNamespace(run=fake_run, estimate=estimate), max_concurrent=2)
+    big = queue.submit_job(project_name="A", source=tmp_path, source_type=JobSourceType.REPOSITORY)
+    assert estimating.wait(timeout=5)  # submit_job returned while the estimate is still running
+    assert big.status != JobStatus.COMPLETED
+    finish_estimate.set()
+    for _ in range(100):
+        if queue._scheduler._running[big.id].large:
+            break
+        threading.Event().wait(0.05)
+    assert queue._scheduler._running[big.id].large
+    release.set()
+
+
+def test_scheduler_update_hint_marks_running_job_large():
+    scheduler = JobScheduler(max_concurrent=2, large_job_files=100)
+    scheduler.enqueue(_job("a", "A"))
+    scheduler.enqueue(_job("b", "B"))
+    scheduler.enqueue(_job("c", "C"))
+    first = scheduler.next_job()
+    scheduler.update_hint(first, ResourceHint(file_count=500))
+    scheduler.update_hint(_job("b", "B"), ResourceHint(file_count=500))
+    # The large lane is taken by "a", so the large pending "b" waits for "c".
+    assert scheduler.next_job().id == "c"
+
+
+def test_job_queue_keeps_the_small_lane_while_sizing_large_jobs(tmp_path):
+    started = []
+    estimated = threading.Event()
+    release = threading.Event()
+    sized = []
+
+    def estimate(job):
+        sized.append(job.id)
+        if len(sized) == 2:
+            estimated.set()
+        return ResourceHint(file_count=5000)
+
+    def fake_run(job, on_update=None):
+        started.append(job.id)
+        release.wait(timeout=5)
+        job.status = JobStatus.COMPLETED
+
+    queue = JobQueue(runner=SimpleNamespace(run=fake_run, estimate=estimate), max_concurrent=2)
+    first = queue.submit_job(project_name="A", source=tmp_path, source_type=JobSourceType.REPOSITORY)
+    second = queue.submit_job(project_name="B", source=tmp_path, source_type=JobSourceType.REPOSITORY)
+    assert estimated.wait(timeout=5)
+    threading.Event().wait(0.1)
+    assert started == [first.id]
+    assert second.status == JobStatus.PENDING
+    release.set()
+    for _ in range(100):
+        if second.status == JobStatus.COMPLETED:
+            break
+        threading.Event().wait(0.05)
+    assert started == [first.id, second.id]
@@ -1,4 +1,5 @@
 import json
+import zipfile
 from datetime import datetime
 
 from suitescript_auditor.core.jobs.models import Job, JobSettings, JobSourceType, JobStatus, JobStage
@@ -49,3 +50,175 @@ def test_job_runner_generates_docs(tmp_path):
     assert index_data["project"]["name"] == "Demo Project"
     assert result.artifacts
     assert (result.docs_path / "artifacts/Docs.zip").exists()
+
+
+def _run_project(project, job_id, settings):
+    job = Job(
+        id=job_id,
+        project_name="Demo Project",
+        source=project,
+        source_type=JobSourceType.REPOSITORY,
+        created_at=datetime.utcnow(),
+        settings=settings,
+    )
+    result = JobRunner().run(job)
+    return json.loads((result.docs_path / "index.json").read_text(encoding="utf-8"))
+
+
+def test_job_runner_parallel_matches_serial(tmp_path):
+    serial_project = tmp_path / "serial"
+    parallel_project = tmp_path / "parallel"
+    for project in (serial_project, parallel_project):
+        for idx in range(6):
+            folder = project / f"pkg{idx % 2}"
+            folder.mkdir(parents=True, exist_ok=True)
+            (folder / f"script{idx}.js").write_text(SAMPLE_JS * (idx + 1), encoding="utf-8")
+
+    serial = _run_project(serial_project, "serial", JobSettings(workers=1, use_cache=False))
+    parallel = _run_project(parallel_project, "parallel", JobSettings(workers=2, use_cache=False))
+
+    for key in ("ranking_files", "top_hotspots", "counts", "summary_scores"):
+        assert json.dumps(parallel[key]) == json.dumps(serial[key])
+
+
+def test_job_runner_reports_stage_throughput(tmp_path):
+    project = tmp_path / "repo"
+    project.mkdir()
+    for idx in range(3):
+        (project / f"script{idx}.js").write_text(SAMPLE_JS, encoding="utf-8")
+
+    job = Job(
+        id="stages",
+        project_name="Demo Project",
+        source=project,
+        source_type=JobSourceType.REPOSITORY,
+        created_at=datetime.utcnow(),
+        settings=JobSettings(use_cache=False, pipeline_queue_size=1),
+    )
+    JobRunner().run(job)
+
+    stages = job.results["pipeline"]
+    assert list(stages) == ["discovery", "analysis", "llm", "writer"]
+    assert all(stage["items"] == 3 for stage in stages.values())
+    assert job.files_total == 3
+
+
+def test_job_runner_lazy_artifacts_load_from_docs(tmp_path):
+    project = tmp_path / "repo"
+    project.mkdir()
+    (project / "script.js").write_text(SAMPLE_JS, encoding="utf-8")
+    runner = JobRunner()
+
+    def run(job_id, mode):
+        job = Job(
+            id=job_id,
+            project_name="Demo Project",
+            source=project,
+            source_type=JobSourceType.REPOSITORY,
+            created_at=datetime.utcnow(),
+            settings=JobSettings(use_cache=False, artifact_mode=mode),
+        )
+        return runner.run(job).artifacts[0]
+
+    full = run("full", "full")
+    handle = run("lazy", "lazy")
+
+    assert handle.hash == full.audit_json["hash"]
+    assert handle.score == full.audit_json["score_1_10"]["overall"]
+    assert handle.audit_json == full.audit_json
+    assert handle.summary_json == full.summary_json
+    assert handle.audit_markdown == full.audit_markdown
+    assert handle.summary_markdown == full.summary_markdown
+    assert len(handle.store) == 4
+
+
+def test_job_runner_records_stage_and_file_timings(tmp_path):
+    project = tmp_path / "repo"
+    project.mkdir()
+    for idx in range(4):
+        (project / f"script{idx}.js").write_text(SAMPLE_JS * (idx + 1), encoding="utf-8")
+
+    job = Job(
+        id="timing",
+        project_name="Demo Project",
+        source=project,
+        source_type=JobSourceType.REPOSITORY,
+        created_at=datetime.utcnow(),
+        settings=JobSettings(use_cache=False, workers=2, llm_mode=True),
+    )
+    result = JobRunner().run(job)
+
+    timing = job.as_dict()["timing"]
+    for stage in (JobStage.PREPARING, JobStage.DISCOVERING, JobStage.PARSING, JobStage.RULES,
+                  JobStage.LLM, JobStage.WRITING, JobStage.PACKAGING):
+        assert timing["stages"][stage.value]["wall_seconds"] >= 0
+    assert timing["stages"][JobStage.RULES.value]["cpu_seconds"] > 0  # measured in the workers
+    assert timing["files"]["count"] == 4
+    assert timing["throughput"]["bytes"] == sum(p.stat().st_size for p in project.glob("*.js"))
+    slowest = timing["slowest_files"]
+    assert [entry["seconds"] for entry in slowest] == sorted((entry["seconds"] for entry in slowest), reverse=True)
+    assert set(slowest[0]["phases"]) == {"read", "parse", "rules", "llm", "write"}
+
+    index_timing = result.index_json["timing"]
+    assert sorted(entry["path"] for entry in index_timing["file_durations"]) == [f"script{idx}.js" for idx in range(4)]
+    with zipfile.ZipFile(result.docs_path / "artifacts/Docs.zip") as archive:
+        assert json.loads(archive.read("index.json")) == result.index_json
+    assert result.index_json == json.loads((result.docs_path / "index.json").read_text(encoding="utf-8"))
+    messages = [entry.message for entry in job.log]
+    assert any(message.startswith("Discovered 4 files") for message in messages)
+    assert messages[-1].startswith("Completed in")
+
+
+def test_job_runner_merges_rule_profiles_from_workers(tmp_path):
+    project = tmp_path / "repo"
+    project.mkdir()
+    for idx in range(3):
+        (project / f"script{idx}.js").write_text(SAMPLE_JS, encoding="utf-8")
+
+    settings = JobSettings(use_cache=False, workers=2, profile_rules=True)
+    index = _run_project(project, "profiled", settings)
+
+    profile = index["rule_profile"]
+    assert profile["files"] == 3
+    rows = {row["rule_id"]: row for row in profile["rules"]}
+    assert rows["security.secret_literal"]["calls"] == 3
+    assert rows["security.secret_literal"]["matches"] == 3
+    assert rows["clientscript.heavy_loop_dom"]["skipped"] == 3
+    seconds = [row["seconds"] for row in profile["rules"]]
+    assert seconds == sorted(seconds, reverse=True)
+    assert "rule_profile" not in _run_project(project, "plain", JobSettings(use_cache=False))
+
+
+def test_job_runner_reports_minified_fast_path(tmp_path):
+    project = tmp_path / "repo"
+    (project / "vendor").mkdir(parents=True)
+    (project / "script.js").write_text(SAMPLE_JS, encoding="utf-8")
+    minified = "!function(e){" + ";".join(f"function m{i}(a){{return a+{i}}}" for i in range(400)) + "}(this);\n"
+    (project / "vendor" / "lib.min.js").write_text(minified, encoding="utf-8")
+
+    index = _run_project(project, "minified", JobSettings(use_cache=False))
+    classification = index["timing"]["classification"]
+    assert classification["fast_path_files"] == 1
+    assert classification["kinds"]["minified"]["files"] == 1
+    assert classification["kinds"]["source"]["files"] == 1
+    assert classification["estimated_seconds_saved"] >= 0
+    by_path = {entry["path"]: entry for entry in index["timing"]["file_durations"]}
+    assert by_path["vendor/lib.min.js"]["classification"] == "minified"
+
+
+def test_job_runner_writes_module_graph(tmp_path):
+    project = tmp_path / "repo"
+    (project / "lib").mkdir(parents=True)
+    (project / "script.js").write_text(SAMPLE_JS.replace("'N/search']", "'N/search', './lib/utils']"), encoding="utf-8")
+    (project / "lib" / "utils.js").write_text("define([], function () { return {}; });\n", encoding="utf-8")
+
+    index = _run_project(project, "graph", JobSettings(use_cache=False))
+    graph = index["module_graph"]
+    assert graph["files"]["script.js"]["imports"] == ["lib/utils.js"]
+    assert graph["files"]["lib/utils.js"]["fan_in"] == 1
+    assert graph["netsuite_modules"] == {"N/record": 1, "N/search": 1}
+    assert index["call_graph"]["netsuite_calls"]["N/record.load"] == 1
+    assert index["rule_engine"]["by_script_type"]["UserEventScript"] == 1
+    summary = json.loads((project / "Docs" / "summary" / "script.js.summary.json").read_text(encoding="utf-8"))
+    edge = next(e for e in summary["call_graph_lite"] if e["to"] == "record.load")
+    assert (edge["from"], edge["module"], edge["in_loop"]) == ("afterSubmit", "N/record", True)
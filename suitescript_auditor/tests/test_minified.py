@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from suitescript_auditor.core.io.discovery import SourceFile
+from suitescript_auditor.core.io.snapshot import FileSnapshot
+from suitescript_auditor.core.jobs.analysis import analyze_file
+from suitescript_auditor.core.parsing.minified import BUNDLE, MINIFIED, SOURCE, classify
+from suitescript_auditor.core.rules.base import RuleEngine
+from suitescript_auditor.core.rules.suitescript import governance_rules, security_rules
+
+READABLE = "".join(
+    f"function f{i}(ids) {{\n    for (var k = 0; k < ids.length; k++) {{\n        record.load({{ id: ids[k] }});\n    }}\n}}\n"
+    for i in range(200)
+)
+MINIFIED_TEXT = "!function(e){" + ";".join(
+    f"function m{i}(a,b){{for(var k=0;k<a.length;k++){{record.load({{id:a[k]}})}}return eval(b)}}" for i in range(300)
+) + "}(window);\n//# sourceMappingURL=vendor.min.js.map\n"
+
+
+def test_classify_by_line_length_and_whitespace():
+    assert classify(READABLE).kind == SOURCE
+    result = classify(MINIFIED_TEXT)
+    assert result.kind == MINIFIED and result.source_map
+    assert result.avg_line_length > 1000 and result.whitespace_ratio < 0.05
+    assert classify("var a=1;" * 100).kind == SOURCE  # too small to bother
+
+
+def test_classify_ignores_inline_source_maps_and_finds_bundles():
+    inline_map = READABLE + "//# sourceMappingURL=data:application/json;base64," + "QUJD" * 20000 + "\n"
+    result = classify(inline_map)
+    assert result.kind == SOURCE and result.source_map
+    bundle = "/******/ var __webpack_require__ = {};\n" + READABLE
+    assert classify(bundle).kind == BUNDLE
+    # A bundled SuiteScript entry point is still audited in full.
+    assert classify("/**\n * @NScriptType Suitelet\n */\n" + bundle).kind == SOURCE
+
+
+def _snapshot(text):
+    return FileSnapshot(
+        source=SourceFile(path=Path("/repo/vendor/lib.min.js"), rel_path=Path("vendor/lib.min.js"), size=len(text)),
+        sha256="0" * 64,
+        text=text,
+        size=len(text),
+    )
+
+
+def test_minified_files_take_the_fast_path():
+    engine = RuleEngine(governance_rules.get_rules() + security_rules.get_rules())
+    snapshot = _snapshot(MINIFIED_TEXT)
+
+    full = analyze_file(snapshot, engine)
+    assert full.classification == SOURCE and full.symbols
+    assert {hotspot.rule_id for hotspot in full.hotspots} == {"governance.record_load_loop", "security.eval_usage"}
+
+    fast = analyze_file(snapshot, engine, minified_policy="security")
+    assert fast.classification == MINIFIED and fast.fast_path
+    assert fast.symbols == [] and fast.modules == []
+    assert {hotspot.rule_id for hotspot in fast.hotspots} == {"security.eval_usage"}
+
+    skipped = analyze_file(snapshot, engine, minified_policy="skip")
+    assert skipped.hotspots == []
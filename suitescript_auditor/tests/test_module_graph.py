@@ -0,0 +1,76 @@
+from pathlib import Path
+
+from suitescript_auditor.core.io.discovery import SourceFile
+from suitescript_auditor.core.parsing.module_graph import ModuleGraph
+from suitescript_auditor.core.parsing.module_resolver import find_modules
+
+
+def _graph(imports):
+    graph = ModuleGraph()
+    for path in imports:
+        graph.add_file(SourceFile(path=Path("/project") / path, rel_path=Path(path), size=0))
+    for path, specifiers in imports.items():
+        graph.set_imports(path, specifiers)
+    return graph
+
+
+def test_find_modules_reads_every_define_and_require():
+    text = """
+define('custom/id', ['N/record', './lib/utils'], (record, utils) => {
+    require(['N/search'], function loaded(search) {});
+});
+require(["../shared/format"]);
+"""
+    modules = find_modules(text)
+    assert [(m.specifier, m.alias) for m in modules] == [
+        ("N/record", "record"),
+        ("./lib/utils", "utils"),
+        ("N/search", "search"),
+        ("../shared/format", ""),
+    ]
+
+
+def test_resolves_relative_absolute_and_bare_specifiers():
+    graph = _graph(
+        {
+            "ue/order_ue.js": ["N/record", "./lib/utils", "/SuiteScripts/shared/format.js", "missing/module"],
+            "ue/lib/utils.js": ["../../shared/format"],
+            "shared/format.js": [],
+        }
+    )
+    assert graph.resolve("ue/order_ue.js", "./lib/utils") == "ue/lib/utils.js"
+    assert graph.resolve("ue/order_ue.js", "N/record") is None
+    assert graph.dependencies("ue/order_ue.js") == ["ue/lib/utils.js", "shared/format.js"]
+    assert sorted(graph.dependents("shared/format.js")) == ["ue/lib/utils.js", "ue/order_ue.js"]
+    assert (graph.fan_in("shared/format.js"), graph.fan_out("shared/format.js")) == (2, 0)
+
+    payload = graph.as_dict()
+    assert payload["files"]["ue/order_ue.js"]["fan_out"] == 2
+    assert payload["netsuite_modules"] == {"N/record": 1}
+    assert payload["unresolved"] == {"ue/order_ue.js": ["missing/module"]}
+
+
+def test_ambiguous_bare_specifier_stays_unresolved_until_unique():
+    graph = _graph({"a/utils.js": [], "b/utils.js": [], "main.js": ["utils", "a/utils"]})
+    assert graph.resolve("main.js", "utils") is None
+    assert graph.dependencies("main.js") == ["a/utils.js"]
+
+
+def test_resolution_is_refreshed_when_files_arrive_later():
+    graph = _graph({"main.js": ["./lib/helper"]})
+    assert graph.dependencies("main.js") == []
+    graph.add_file(SourceFile(path=Path("/project/lib/helper.js"), rel_path=Path("lib/helper.js"), size=0))
+    assert graph.dependencies("main.js") == ["lib/helper.js"]
+
+
+def test_affected_follows_dependents_transitively():
+    graph = _graph(
+        {
+            "app.js": ["./service"],
+            "service.js": ["./lib/db"],
+            "lib/db.js": [],
+            "other.js": [],
+        }
+    )
+    assert graph.affected(["lib/db.js"]) == {"lib/db.js", "service.js", "app.js"}
+    assert graph.affected(["other.js"]) == {"other.js"}
@@ -0,0 +1,49 @@
+import pickle
+
+from suitescript_auditor.core.parsing.parsed_file import ParsedFile
+from suitescript_auditor.core.rules.base import RuleContext
+
+TEXT = """/**
+ * @NApiVersion 2.1
+ * @NScriptType UserEventScript
+ */
+define(['N/record'], function (record) {
+    function afterSubmit(context) {
+        for (var i = 0; i < 2; i++) { record.load({ id: i }); } // record.save()
+    }
+    return { afterSubmit: afterSubmit };
+});
+"""
+
+
+def test_parsed_file_computes_products_once_and_on_demand():
+    parsed = ParsedFile(TEXT, "ue.js")
+    assert parsed.computed() == []
+    assert parsed.header.script_type == "UserEventScript"
+    assert parsed.computed() == ["header"]
+    assert [m.specifier for m in parsed.modules] == ["N/record"]
+    assert [s.name for s in parsed.symbols] == ["afterSubmit"]
+    assert parsed.symbols is parsed.symbols
+    assert parsed.view("code").count("record.") == 1
+    assert parsed.view("raw") is TEXT
+    assert "scopes" not in parsed.computed()
+    assert parsed.scopes.loop_depth(TEXT.index("record.load")) == 1
+
+
+def test_rule_context_shares_the_parsed_file():
+    parsed = ParsedFile(TEXT, "ue.js")
+    context = RuleContext.from_parsed(parsed)
+    assert (context.path, context.script_type, context.api_version) == ("ue.js", "UserEventScript", "2.1")
+    assert context.line_map is parsed.line_map
+    assert context.scopes() is parsed.scopes
+    assert context.view("no_comments") is parsed.view("no_comments")
+
+
+def test_parsed_file_keeps_known_products_and_pickles_light():
+    parsed = ParsedFile(TEXT, "ue.js", symbols=[])
+    assert parsed.symbols == []
+    parsed.compute("header", "modules", "line_map", "scopes")
+    restored = pickle.loads(pickle.dumps(parsed))
+    assert sorted(restored.computed()) == ["header", "modules", "symbols"]
+    assert restored.header == parsed.header and restored.symbols == []
+    assert restored.line_map.loc == parsed.line_map.loc
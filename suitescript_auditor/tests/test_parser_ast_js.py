@@ -0,0 +1,116 @@
+import time
+
+from suitescript_auditor.core.parsing.ast_js import PAREN_WINDOW, extract_functions
+from suitescript_auditor.core.parsing.line_map import LineMap
+
+MODULE = r"""/**
+ * @NApiVersion 2.1
+ */
+define(['N/record'], (record) => {
+    const PATTERN = /[{}]\/"/g;
+    var helper = function (a, b) {
+        var s = "}{";
+        return a / b;
+    };
+    function load(id) {
+        const t = `x ${ id ? `}` : "{" } y`;
+        if (id) {
+            return t;
+        }
+    }
+    const add = (x, y) => x + y;
+    const square = x =>
+        x * x;
+    exports.shout = function (m) { return m; };
+    function beforeSubmit(context) {
+        /* } */
+        return load(context);
+    }
+    return {
+        beforeSubmit: beforeSubmit, // entry points
+        afterSubmit: function (context) {
+            return add(1, 2);
+        },
+        execute(ctx) {
+            return square(3);
+        },
+        onRequest: (ctx) => {
+            return 1;
+        }
+    };
+});
+"""
+
+
+def _by_name(text):
+    return {symbol.name: symbol for symbol in extract_functions(text)}
+
+
+def test_extract_functions_reports_exact_line_ranges():
+    symbols = _by_name(MODULE)
+    ranges = {name: (symbol.start_line, symbol.end_line) for name, symbol in symbols.items()}
+    assert ranges == {
+        "helper": (6, 9),
+        "load": (10, 15),
+        "add": (16, 16),
+        "square": (17, 18),
+        "shout": (19, 19),
+        "beforeSubmit": (20, 23),
+        "afterSubmit": (26, 28),
+        "execute": (29, 31),
+        "onRequest": (32, 34),
+    }
+    assert [symbol.name for symbol in extract_functions(MODULE)][:2] == ["helper", "load"]
+
+
+def test_extract_functions_kinds_signatures_and_exports():
+    symbols = _by_name(MODULE)
+    assert symbols["helper"].kind == "Function Expression"
+    assert symbols["load"].kind == "Function Declaration"
+    assert symbols["add"].kind == "Arrow Function"
+    assert symbols["afterSubmit"].kind == "Method"
+    assert symbols["execute"].kind == "Method"
+    assert symbols["add"].signature == "(x, y)"
+    assert symbols["square"].signature == "x"
+    exported = {name for name, symbol in symbols.items() if symbol.exported}
+    assert exported == {"shout", "beforeSubmit", "afterSubmit", "execute", "onRequest"}
+
+
+def test_extract_functions_ignores_control_flow_and_unclosed_input():
+    text = "function a() {\n  for (var i = 0; i < 2; i++) {\n    if (i) { b(i); }\n  }\n  catchAll();\n"
+    symbols = extract_functions(text)
+    assert [(s.name, s.start_line, s.end_line) for s in symbols] == [("a", 1, 5)]
+
+
+def test_extract_functions_counts_lines_like_line_map():
+    text = "// a\rb\u2028c\x0cd\nfunction first() {\r\n  return 1;\x85}\nconst second = () => {\u2029};\n"
+    symbols = _by_name(text)
+    line_map = LineMap.from_text(text)
+    assert (symbols["first"].start_line, symbols["first"].end_line) == (
+        line_map.line_at(text.index("function")),
+        line_map.line_at(text.index("}")),
+    ) == (5, 7)
+    assert (symbols["second"].start_line, symbols["second"].end_line) == (8, 9)
+
+
+def test_extract_functions_finds_long_parameter_lists():
+    params = ", ".join(f"argument{i}" for i in range(PAREN_WINDOW // 8))
+    text = f"function wide({params}) {{\n  return 1;\n}}\n"
+    [symbol] = extract_functions(text)
+    assert (symbol.name, symbol.start_line, symbol.end_line) == ("wide", 1, 3)
+    assert symbol.signature == f"({params})"
+
+
+def test_extract_functions_scales_linearly():
+    block = "function f{0}(a) {{\n  var s = '{{';\n  return a.map(x => x / 2);\n}}\n"
+    small = "".join(block.format(i) for i in range(500))
+    large = "".join(block.format(i) for i in range(5000))
+    started = time.perf_counter()
+    assert len(extract_functions(small)) == 500
+    small_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    symbols = extract_functions(large)
+    large_seconds = time.perf_counter() - started
+    assert len(symbols) == 5000
+    assert symbols[-1].start_line == 4 * 4999 + 1 and symbols[-1].end_line == 4 * 5000
+    assert large_seconds < small_seconds * 30
@@ -0,0 +1,43 @@
+import pytest
+
+from suitescript_auditor.core.parsing.lexer import lex
+
+SOURCE = """/* eval(x) */
+var a = "eval('1')"; // eval here
+var t = `hi ${ eval(name) } // not a comment`;
+var r = /\\/eval"/g, d = a / 2 / 3;
+"""
+
+
+def test_views_keep_offsets_and_line_breaks():
+    source = lex(SOURCE)
+    for name in ("raw", "no_comments", "code"):
+        view = source.view(name)
+        assert len(view) == len(SOURCE)
+        assert len(view.splitlines()) == len(SOURCE.splitlines())
+        assert [i for i, c in enumerate(view) if c == "\n"] == [i for i, c in enumerate(SOURCE) if c == "\n"]
+    assert source.view("raw") is SOURCE
+
+
+def test_code_view_blanks_comments_and_literal_contents():
+    code = lex(SOURCE).view("code")
+    lines = code.splitlines()
+    assert lines[0].strip() == ""
+    assert lines[1].rstrip() == 'var a = "         ";'
+    # Code inside a template substitution stays, its text chunks do not.
+    assert "eval(name)" in lines[2] and "not a comment" not in lines[2]
+    assert lines[3].startswith("var r = /") and "eval" not in lines[3] and "/g, d = a / 2 / 3;" in lines[3]
+    assert code.count("eval") == 1
+
+
+def test_no_comments_view_keeps_literals():
+    view = lex(SOURCE).view("no_comments")
+    assert "eval here" not in view and "eval(x)" not in view
+    assert "\"eval('1')\"" in view and "// not a comment" in view and "/\\/eval\"/g" in view
+
+
+def test_tokens_and_unknown_view():
+    source = lex("x = 'a' + `b${ {c: '}'}.c }d` // e\n")
+    assert [token.kind for token in source.tokens] == ["string", "template", "string", "template", "comment"]
+    with pytest.raises(ValueError):
+        source.view("ast")
@@ -10,3 +10,23 @@ def test_line_map_offset_to_range():
     numbered = line_map.numbered_text(1, 2)
     assert numbered[0].startswith("0001|")
     assert line_map.loc == 3
+
+
+def test_line_map_keeps_splitlines_boundaries():
+    content = "a\r\nb\rc\x0cd e"
+    line_map = LineMap.from_text(content)
+    assert line_map.loc == len(content.splitlines())
+    assert line_map.to_range(content.index("c"), content.index("c") + 1).start == 3
+    assert line_map.numbered_text(1, 2) == ["0001| a\r", "0002| b\r"]
+    assert line_map.line_text(5) == "e"
+    assert LineMap.from_text("").loc == 1
+
+
+def test_line_map_batch_ranges_match_single_lookups():
+    content = "".join(f"line {idx}\n" for idx in range(2000))
+    line_map = LineMap.from_text(content)
+    spans = [(content.index(f"line {idx}\n"), content.index(f"line {idx + 3}\n")) for idx in range(0, 1990, 7)]
+    expected = [line_map.to_range(start, end) for start, end in spans]
+    assert line_map.to_ranges(spans) == expected
+    assert expected[1].start == 8 and expected[1].end == 10
+    assert line_map.to_ranges(list(reversed(spans))) == list(reversed(expected))
@@ -0,0 +1,128 @@
+import time
+
+from suitescript_auditor.core.parsing.lexer import lex
+from suitescript_auditor.core.parsing.scopes import build_scope_index
+
+MODULE = """define(['N/record', 'N/search'], function (record, search) {
+    function afterSubmit(context) {
+        for (var i = 0; i < 3; i++) {
+            if (i) { record.load({ type: 'x', id: i }); }
+            ids.forEach(function (id) {
+                search.run().each((r) => { return '}'; });
+            });
+        }
+        do { x++; } while (x < 3);
+        record.save();
+    }
+    return { afterSubmit: afterSubmit, summarize: (s) => { log.debug('{'); } };
+});
+"""
+
+
+def _index(text):
+    return build_scope_index(lex(text).view("code"), text)
+
+
+def test_scope_index_pairs_nested_loops_and_functions():
+    index = _index(MODULE)
+    assert [(scope.kind, scope.name) for scope in index.scopes] == [
+        ("function", ""),
+        ("function", "afterSubmit"),
+        ("loop", "for"),
+        ("callback", "forEach"),
+        ("callback", "each"),
+        ("loop", "do"),
+        ("function", "summarize"),
+    ]
+    for_loop = index.scopes[2]
+    assert MODULE[for_loop.start : for_loop.body] == "for (var i = 0; i < 3; i++) "
+    assert MODULE[for_loop.end - 1] == "}" and MODULE[for_loop.end :].startswith("\n        do {")
+
+
+def test_scope_index_answers_depth_and_enclosing_queries():
+    index = _index(MODULE)
+    expected = {
+        "record.load": (1, "for", "afterSubmit", "afterSubmit"),
+        "search.run": (2, "forEach", "forEach", "afterSubmit"),
+        "return '}'": (3, "each", "each", "afterSubmit"),
+        "x++": (1, "do", "afterSubmit", "afterSubmit"),
+        "record.save": (0, None, "afterSubmit", "afterSubmit"),
+        "log.debug": (0, None, "summarize", "summarize"),
+        "define(": (0, None, None, None),
+    }
+    for needle, (depth, loop, function, entry) in expected.items():
+        offset = MODULE.index(needle)
+        assert index.loop_depth(offset) == depth, needle
+        assert getattr(index.enclosing_loop(offset), "name", None) == loop, needle
+        assert getattr(index.enclosing_function(offset), "name", None) == function, needle
+        assert getattr(index.entry_point(offset), "name", None) == entry, needle
+    assert [scope.name for scope in index.entry_points("afterSubmit")] == ["afterSubmit"]
+
+
+def test_entry_points_are_declared_or_exported_handlers_only():
+    text = """define([], function () {
+    var totals = results.map(function (r) { return r.amount; });
+    var sums = results.reduce(function reduce(a, b) { return a + b; }, 0);
+    const get = (ctx) => { ctx.response.write('ok'); };
+    function map(ctx) { ctx.write(ctx.key, 1); }
+    return { get: get, map: map, reduce(ctx) { ctx.write(ctx.key); } };
+});
+"""
+    index = _index(text)
+    assert [scope.name for scope in index.scopes if scope.entry_point] == ["get", "map", "reduce"]
+    assert index.entry_point(text.index("r.amount")) is None
+    assert index.entry_point(text.index("a + b")) is None
+    assert index.entry_point(text.index("ctx.write(ctx.key, 1)")).name == "map"
+
+
+def test_braceless_loops_end_with_their_statement():
+    text = """function execute(ctx) {
+    while (more) record.load({ type: 'x', id: next() });
+    for (var i = 0; i < n; i++) if (ids[i]) record.save();
+    for (;;) while (x) y();
+    if (a) { for (k in o) z() }
+    do { x++; } while (x < 3)
+    after();
+}
+"""
+    index = _index(text)
+    assert [(scope.kind, scope.name) for scope in index.scopes] == [
+        ("function", "execute"),
+        ("loop", "while"),
+        ("loop", "for"),
+        ("loop", "for"),
+        ("loop", "while"),
+        ("loop", "for"),
+        ("loop", "do"),
+    ]
+    while_loop = index.scopes[1]
+    assert text[while_loop.start : while_loop.end] == "while (more) record.load({ type: 'x', id: next() });"
+    assert text[index.scopes[5].end - 1 :].startswith("}\n    do")
+    expected = {
+        "record.load": (1, "while"),
+        "record.save": (1, "for"),
+        "y()": (2, "while"),
+        "z()": (1, "for"),
+        "x++": (1, "do"),
+        "after()": (0, None),
+    }
+    for needle, (depth, loop) in expected.items():
+        offset = text.index(needle)
+        assert index.loop_depth(offset) == depth, needle
+        assert getattr(index.enclosing_loop(offset), "name", None) == loop, needle
+        assert index.enclosing_function(offset).name == "execute", needle
+
+
+def test_scope_index_scales_linearly_with_nesting():
+    def nested(depth):
+        return "function f() {\n" + "for (;;) {\n" * depth + "x();\n" + "}\n" * depth + "}\n"
+
+    small, large = nested(200) * 5, nested(2000) * 5
+    started = time.perf_counter()
+    _index(small)
+    small_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    index = _index(large)
+    large_seconds = time.perf_counter() - started
+    assert index.loop_depth(large.index("x();")) == 2000
+    assert large_seconds < small_seconds * 30
@@ -0,0 +1,47 @@
+import pytest
+
+from suitescript_auditor.core.jobs.pipeline import Pipeline, PipelineCancelled
+
+
+def test_pipeline_streams_items_in_order():
+    pipeline = Pipeline(capacity=2)
+    numbers = pipeline.channel("numbers")
+    doubled = pipeline.channel("doubled")
+
+    def produce(stats):
+        for value in range(20):
+            numbers.put(value, stats)
+
+    def double(stats):
+        for value in numbers.drain(stats):
+            doubled.put(value * 2, stats)
+
+    pipeline.start("produce", produce, output=numbers)
+    pipeline.start("double", double, input=numbers, output=doubled)
+    sink = pipeline.stats("sink", doubled)
+    received = list(doubled.drain(sink))
+    pipeline.finish(sink)
+    pipeline.join()
+
+    assert received == [value * 2 for value in range(20)]
+    report = pipeline.as_dict()
+    assert report["produce"]["items"] == 20
+    assert report["double"]["items"] == 20
+    assert report["double"]["max_queue_depth"] <= 2
+
+
+def test_pipeline_propagates_stage_errors():
+    pipeline = Pipeline(capacity=1)
+    numbers = pipeline.channel("numbers")
+
+    def produce(stats):
+        numbers.put(1, stats)
+        raise ValueError("disk went away")
+
+    pipeline.start("produce", produce, output=numbers)
+    sink = pipeline.stats("sink", numbers)
+    with pytest.raises(PipelineCancelled):
+        for _ in numbers.drain(sink):
+            pass
+    with pytest.raises(ValueError, match="disk went away"):
+        pipeline.join()
@@ -0,0 +1,115 @@
+import re
+import threading
+import time
+
+import pytest
+
+from suitescript_auditor.core.jobs.runner import default_rule_engine
+from suitescript_auditor.core.parsing.line_map import LineMap
+from suitescript_auditor.core.rules.base import DEGRADED_SEVERITY, PatternRule, RuleContext, RuleEngine
+from suitescript_auditor.core.rules.budget import Deadline, RuleTimeout, alarm_available, time_budget
+from suitescript_auditor.core.rules.lint import lint_pattern
+from suitescript_auditor.core.rules.profiler import RuleProfile
+from suitescript_auditor.core.rules.suitescript.security_rules import EvalUsageRule
+
+
+class BacktrackingRule(PatternRule):
+    rule_id = "test.backtracking"
+    severity = "LOW"
+    title = "Catastrophic pattern"
+    pattern = re.compile(r"(a+)+b")
+
+
+def _context(text):
+    return RuleContext("slow.js", text, None, None, LineMap.from_text(text))
+
+
+@pytest.mark.skipif(not alarm_available(), reason="needs SIGALRM in the main thread")
+def test_rule_over_budget_yields_degraded_finding():
+    engine = RuleEngine([BacktrackingRule(), EvalUsageRule()])
+    context = _context("eval(x);\n" + "a" * 40 + "\n")
+    expected = [("test.backtracking", DEGRADED_SEVERITY), ("security.eval_usage", "HIGH")]
+    # Without a profile the combined scan times out first.
+    started = time.perf_counter()
+    findings = engine.run(context, budget=0.2)
+    assert time.perf_counter() - started < 5
+    assert [(h.rule_id, h.severity) for h in findings] == expected
+    assert findings[0].verified is False
+
+    profile = RuleProfile()
+    findings = engine.run(context, profile, budget=0.2)
+    assert [(h.rule_id, h.severity) for h in findings] == expected
+    assert profile.rules["test.backtracking"].timeouts == 1
+    assert profile.rules["security.eval_usage"].timeouts == 0
+
+
+def test_profile_charges_regex_time_to_the_slow_rule():
+    engine = RuleEngine([BacktrackingRule(), EvalUsageRule()])
+    assert set(engine.scanned_views) == {"test.backtracking", "security.eval_usage"}
+    profile = RuleProfile()
+    engine.run(_context("eval(x);\n" + ("a" * 16 + "\n") * 4), profile)
+    assert set(profile.rules) == {"test.backtracking", "security.eval_usage"}
+    slow, fast = profile.rules["test.backtracking"], profile.rules["security.eval_usage"]
+    assert (slow.worst_file, slow.matches, fast.matches) == ("slow.js", 0, 1)
+    assert slow.seconds > 20 * fast.seconds
+
+
+def test_deadline_is_cooperative_outside_the_main_thread():
+    outcome = {}
+
+    def worker():
+        with time_budget(0.01) as deadline:
+            outcome["alarm"] = alarm_available()
+            time.sleep(0.02)
+            try:
+                deadline.check()
+            except RuleTimeout:
+                outcome["expired"] = True
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert outcome == {"alarm": False, "expired": True}
+    Deadline(10).check()
+
+
+def test_rule_over_budget_degrades_outside_the_main_thread():
+    engine = RuleEngine([BacktrackingRule(), EvalUsageRule()])
+    outcome = {}
+
+    def worker():
+        profile = RuleProfile()
+        findings = engine.run(_context("eval(x);\n" + "a" * 20 + "\n"), profile, budget=0.05)
+        outcome["findings"] = [(h.rule_id, h.severity) for h in findings]
+        outcome["timeouts"] = profile.rules["test.backtracking"].timeouts
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert outcome == {
+        "findings": [("test.backtracking", DEGRADED_SEVERITY), ("security.eval_usage", "HIGH")],
+        "timeouts": 1,
+    }
+
+
+def test_find_checks_the_deadline_between_matches():
+    class EveryCharRule(PatternRule):
+        rule_id = "test.every_char"
+        severity = "LOW"
+        title = "Every character"
+        pattern = re.compile(r"a")
+
+    deadline = Deadline(0)
+    time.sleep(0.001)
+    with pytest.raises(RuleTimeout):
+        EveryCharRule().find(_context("a" * 1000), deadline)
+    assert len(EveryCharRule().find(_context("a" * 1000))) == 1000
+
+
+def test_lint_flags_backtracking_prone_patterns():
+    assert [kind for kind, _ in lint_pattern(re.compile(r"(\s+)*x"))] == ["nested-quantifier"]
+    assert [kind for kind, _ in lint_pattern(re.compile(r"afterSubmit[\s\S]*record"))] == ["unbounded-span"]
+    assert [kind for kind, _ in lint_pattern(re.compile(r"for[^{]+{"))] == ["unbounded-span"]
+    assert lint_pattern(re.compile(r"for[^{\n]+{|https\.request\([^)]{0,400}")) == []
+    assert default_rule_engine().lint == []
+    assert [w.rule_id for w in RuleEngine([BacktrackingRule()]).lint] == ["test.backtracking"]
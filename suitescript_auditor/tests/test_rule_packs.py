@@ -0,0 +1,173 @@
+import json
+import pickle
+
+import pytest
+
+from suitescript_auditor.core.jobs.runner import default_rule_engine
+from suitescript_auditor.core.parsing.line_map import LineMap
+from suitescript_auditor.core.rules.base import RuleContext, RuleEngine
+from suitescript_auditor.core.rules.packs import PackRule, RulePackError, compile_pack, load_pack, load_rule_packs
+from suitescript_auditor.core.rules.profiler import RuleProfile
+
+PACK_TOML = """
+[[rules]]
+id = "acme.legacy_load_loop"
+severity = "HIGH"
+title = "SuiteScript 1.0 record load inside loop"
+pattern = '\\bnlapiLoadRecord\\b'
+required_literals = ["nlapiLoadRecord"]
+scope = "loop"
+recommendations = ["Load the records once, outside the loop."]
+score = 3
+
+[[rules]]
+id = "acme.debug_log"
+severity = "LOW"
+pattern = 'log\\.debug'
+flags = ["IGNORECASE"]
+required_literals = ["log.debug"]
+script_types = ["UserEventScript"]
+scope = "entry_point"
+entry_points = ["afterSubmit"]
+"""
+
+SOURCE = """/**
+ * @NScriptType UserEventScript
+ */
+define(['N/log'], function (log) {
+    function beforeLoad(ctx) {
+        log.debug('before', ctx.type);
+    }
+    function afterSubmit(ctx) {
+        LOG.DEBUG('after', ctx.type);
+        ids.forEach(function (id) {
+            var rec = nlapiLoadRecord('salesorder', id);
+        });
+    }
+    return { beforeLoad: beforeLoad, afterSubmit: afterSubmit };
+});
+"""
+
+
+def _context(text, script_type="UserEventScript"):
+    return RuleContext("acme.js", text, script_type, "2.1", LineMap.from_text(text))
+
+
+def _write_pack(tmp_path, name="acme.toml", text=PACK_TOML):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_toml_pack_compiles_to_scoped_pattern_rules(tmp_path):
+    rules = load_pack(_write_pack(tmp_path))
+    assert [rule.rule_id for rule in rules] == ["acme.legacy_load_loop", "acme.debug_log"]
+    loop_rule, log_rule = rules
+    assert log_rule.title == "acme.debug_log"
+    assert log_rule.script_types == ("UserEventScript",)
+
+    context = _context(SOURCE)
+    [loop_hit] = loop_rule.evaluate(context)
+    assert (loop_hit.start_line, loop_hit.end_line) == (10, 11)
+    assert loop_hit.recommendations == ["Load the records once, outside the loop."]
+    assert loop_hit.score_1_10 == 3.0
+    # Only the afterSubmit call counts, whatever its case.
+    assert [(hit.start_line, hit.severity) for hit in log_rule.evaluate(context)] == [(9, "LOW")]
+
+
+def test_json_pack_matches_toml_pack(tmp_path):
+    toml_rules = load_pack(_write_pack(tmp_path))
+    data = {"rules": [rule.spec for rule in toml_rules]}
+    json_rules = load_pack(_write_pack(tmp_path, "acme.json", json.dumps(data)))
+    assert [rule.digest for rule in json_rules] == [rule.digest for rule in toml_rules]
+
+
+def test_engine_scans_prefilters_and_dispatches_pack_rules(tmp_path):
+    rules = load_pack(_write_pack(tmp_path))
+    engine = RuleEngine(rules)
+    assert set(engine.scanned_views) == {"acme.legacy_load_loop", "acme.debug_log"}
+    assert len(engine.prefilter) == 2
+    assert engine.dispatch_counts() == {"*": 1, "UserEventScript": 1}
+
+    profile = RuleProfile()
+    findings = engine.run(_context(SOURCE), profile)
+    assert sorted(hit.rule_id for hit in findings) == ["acme.debug_log", "acme.legacy_load_loop"]
+    assert [hit.rule_id for hit in engine.run(_context(SOURCE, "Suitelet"))] == ["acme.legacy_load_loop"]
+    assert engine.run(_context("var x = 1;\n"), profile) == []
+    assert profile.rules["acme.legacy_load_loop"].prefiltered == 1
+    # Worker processes receive the engine pickled.
+    assert [hit.rule_id for hit in pickle.loads(pickle.dumps(engine)).run(_context(SOURCE))] == [
+        hit.rule_id for hit in findings
+    ]
+
+
+def test_pack_cache_is_keyed_by_content(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    path = _write_pack(tmp_path)
+    first = load_pack(path, cache_dir)
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    # A cached pack is neither parsed nor validated again.
+    from suitescript_auditor.core.rules import packs
+
+    monkeypatch.setattr(packs, "compile_pack", lambda *args: pytest.fail("pack compiled again"))
+    second = load_pack(path, cache_dir)
+    assert [rule.digest for rule in second] == [rule.digest for rule in first]
+    assert [rule.lint_warnings for rule in second] == [rule.lint_warnings for rule in first]
+    monkeypatch.undo()
+
+    path.write_text(PACK_TOML.replace('severity = "LOW"', 'severity = "MED"'), encoding="utf-8")
+    edited = load_pack(path, cache_dir)
+    assert edited[1].severity == "MED"
+    assert len(list(cache_dir.glob("*.json"))) == 2
+
+
+def test_pack_changes_rule_set_fingerprint(tmp_path):
+    path = _write_pack(tmp_path)
+    before = RuleEngine(load_pack(path)).fingerprint()
+    path.write_text(PACK_TOML.replace('scope = "loop"', 'scope = "any"'), encoding="utf-8")
+    assert RuleEngine(load_pack(path)).fingerprint() != before
+
+
+@pytest.mark.parametrize(
+    "entry, message",
+    [
+        ({"severity": "HIGH", "pattern": "x"}, "'id' must be a non-empty string"),
+        ({"id": "a", "severity": "URGENT", "pattern": "x"}, "'severity' must be one of HIGH, MED, LOW"),
+        ({"id": "a", "severity": "LOW", "pattern": "("}, "invalid pattern"),
+        ({"id": "a", "severity": "LOW", "pattern": "(foo)?bar|x*"}, "can match the empty string"),
+        ({"id": "a", "severity": "LOW", "pattern": "\\bfoo|\\b"}, "can match the empty string"),
+        ({"id": "a", "severity": "LOW", "pattern": "x", "scope": "nested"}, "'scope' must be one of"),
+        ({"id": "a", "severity": "LOW", "pattern": "x", "flags": ["GLOBAL"]}, "unknown flag(s) GLOBAL"),
+        ({"id": "a", "severity": "LOW", "pattern": "x", "entry_points": ["map"]}, "needs scope"),
+        ({"id": "a", "severity": "LOW", "pattern": "x", "score": 11}, "'score' must be a number from 1 to 10"),
+        ({"id": "a", "severity": "LOW", "pattern": "x", "severty": "LOW"}, "unknown field(s) severty"),
+    ],
+)
+def test_invalid_rules_are_reported_with_their_position(entry, message):
+    with pytest.raises(RulePackError) as error:
+        compile_pack({"rules": [{"id": "ok", "severity": "LOW", "pattern": "y"}, entry]}, "site.toml")
+    assert str(error.value).startswith("site.toml: rules[1]")
+    assert message in str(error.value)
+
+
+def test_duplicate_ids_across_packs_and_built_ins_are_rejected(tmp_path):
+    _write_pack(tmp_path, "a.toml")
+    _write_pack(tmp_path, "b.toml")
+    with pytest.raises(RulePackError, match="already defined"):
+        load_rule_packs([tmp_path])
+
+    clash = tmp_path / "clash"
+    clash.mkdir()
+    pack = {"rules": [{"id": "security.eval_usage", "severity": "LOW", "pattern": "x"}]}
+    _write_pack(clash, "eval.json", json.dumps(pack))
+    with pytest.raises(RulePackError, match="built-in"):
+        default_rule_engine([clash])
+
+
+def test_default_rule_engine_appends_pack_rules(tmp_path):
+    _write_pack(tmp_path)
+    engine = default_rule_engine([tmp_path], tmp_path / "cache")
+    assert [rule.rule_id for rule in engine.rules][-2:] == ["acme.legacy_load_loop", "acme.debug_log"]
+    assert all(isinstance(rule, PackRule) for rule in engine.rules[-2:])
+    assert engine.fingerprint() != default_rule_engine().fingerprint()
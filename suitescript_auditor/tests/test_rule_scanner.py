@@ -0,0 +1,92 @@
+import re
+from dataclasses import asdict
+
+import pytest
+
+from suitescript_auditor.core.jobs.runner import default_rule_engine
+from suitescript_auditor.core.parsing.line_map import LineMap
+from suitescript_auditor.core.rules.base import PatternRule, RuleContext, RuleEngine
+from suitescript_auditor.core.rules.scanner import MultiPatternScanner, combinable, first_chars
+
+SAMPLE = """/**
+ * @NScriptType UserEventScript
+ */
+define(['N/record', 'N/search'], function (record, search) {
+    function afterSubmit(context) {
+        var opts = { ignoreMandatoryFields: true, token: "abcd1234ABCD5678" };
+        for (var i = 0; i < 3; i++) {
+            record.load({ type: 'salesorder', id: i });
+            search.run().each(function () { document.title = eval('1'); });
+            record.save();
+        }
+        try { record.submitFields(opts); } catch (e) {}
+        https.request({ url: 'http://example.com' });
+    }
+    return { afterSubmit: afterSubmit };
+});
+"""
+
+
+def _spans(matches):
+    return [match.span() for match in matches]
+
+
+def test_scanner_matches_finditer_for_overlapping_patterns():
+    patterns = [
+        re.compile(r"record\.(load|save)"),
+        re.compile(r"rec"),
+        re.compile(r"\.\w+"),
+        re.compile(r"ORD", re.IGNORECASE),
+        re.compile(r"load  # verbose comment", re.VERBOSE),
+    ]
+    text = "record.load(); record.save(); RECORD.saveAll"
+    found = MultiPatternScanner(patterns).scan(text)
+    assert [_spans(matches) for matches in found] == [_spans(p.finditer(text)) for p in patterns]
+    assert found[0][0].group(1) == "load"
+
+
+def test_first_chars_and_combinable():
+    assert first_chars(re.compile(r"\b(eval|new\s+Function)\b")) == {"e", "n"}
+    assert first_chars(re.compile(r"(?:a|b)?c")) == {"a", "b", "c"}
+    assert first_chars(re.compile(r"\w+")) is None
+    assert combinable(re.compile(r"x(?P<name>y)")) is False
+    assert combinable(re.compile(r"(a)\1")) is False
+    assert combinable(re.compile(r"a", re.ASCII)) is False
+    assert combinable(re.compile(r"(foo)?bar|x*")) is False
+    assert combinable(re.compile(r"\b")) is False
+    with pytest.raises(ValueError):
+        MultiPatternScanner([re.compile(r"(a)\1")])
+
+
+class EmptyMatchRule(PatternRule):
+    rule_id = "test.empty_match"
+    severity = "LOW"
+    title = "Empty-matching pattern"
+    pattern = re.compile(r"(foo)?bar|x*")
+
+
+def test_empty_matching_pattern_runs_alone():
+    engine = RuleEngine([EmptyMatchRule(), *default_rule_engine().rules])
+    assert "test.empty_match" not in engine.scanned_views
+    text = "var bar = 1;\n"
+    context = RuleContext("e.js", text, None, None, LineMap.from_text(text))
+    found = [h for h in engine.run(context) if h.rule_id == "test.empty_match"]
+    assert len(found) == len(list(EmptyMatchRule().evaluate(context)))
+
+
+def test_engine_scan_matches_rules_evaluated_alone():
+    engine = default_rule_engine()
+    assert set(engine.scanned_views) == {rule.rule_id for rule in engine.rules}
+
+    def context():
+        return RuleContext("ue.js", SAMPLE, "UserEventScript", "2.1", LineMap.from_text(SAMPLE))
+
+    alone = [asdict(h) for rule in engine.rules if rule.applies(context()) for h in rule.evaluate(context())]
+    scanned = [asdict(h) for h in engine.run(context())]
+    assert scanned == alone
+    assert {h["rule_id"] for h in scanned} >= {
+        "governance.record_load_loop",
+        "governance.search_each_loop",
+        "security.secret_literal",
+        "userevent.after_submit_rewrite",
+    }
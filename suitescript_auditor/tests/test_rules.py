@@ -1,5 +1,10 @@
-from suitescript_auditor.core.rules.base import RuleContext
-from suitescript_auditor.core.rules.suitescript.security_rules import SecretLiteralRule
+from suitescript_auditor.core.jobs.runner import default_rule_engine
+from suitescript_auditor.core.rules.base import RuleContext, RuleEngine
+from suitescript_auditor.core.rules.profiler import RuleProfile
+from suitescript_auditor.core.rules.suitescript.data_integrity_rules import EmptyCatchRule
+from suitescript_auditor.core.rules.suitescript.security_rules import EvalUsageRule, SecretLiteralRule
+from suitescript_auditor.core.rules.suitescript.governance_rules import RecordLoadInLoopRule, SearchEachLoopRule
+from suitescript_auditor.core.rules.suitescript.userevent_rules import AfterSubmitRewriteRule
 from suitescript_auditor.core.parsing.line_map import LineMap
 
 
@@ -16,3 +21,135 @@ def test_secret_literal_detection():
     findings = list(rule.evaluate(context))
     assert findings
     assert findings[0].severity == "HIGH"
+
+
+def _context(path, text, script_type=None):
+    return RuleContext(
+        path=path,
+        text=text,
+        script_type=script_type,
+        api_version=None,
+        line_map=LineMap.from_text(text),
+    )
+
+
+def test_rule_engine_profile_tracks_calls_skips_and_worst_file():
+    engine = RuleEngine([SecretLiteralRule(), AfterSubmitRewriteRule()])
+    small = _context("small.js", "const token = 'abcd1234ABCD5678';", "ClientScript")
+    large = _context("large.js", "const token = 'abcd1234ABCD5678';\n" * 200, "ClientScript")
+
+    profile = RuleProfile()
+    plain = engine.run(large)
+    assert engine.run(large, profile) == plain
+    engine.run(small, profile)
+
+    rows = {row["rule_id"]: row for row in profile.table()}
+    secret = rows["security.secret_literal"]
+    assert (secret["calls"], secret["skipped"], secret["matches"]) == (2, 0, 201)
+    assert secret["worst_file"] == "large.js"
+    after_submit = rows["userevent.after_submit_rewrite"]
+    assert (after_submit["calls"], after_submit["skipped"], after_submit["matches"]) == (0, 2, 0)
+
+    merged = RuleProfile().merge(profile).merge(profile)
+    assert merged.files == 4
+    assert merged.rules["security.secret_literal"].matches == 402
+
+
+def test_prefilter_skips_rules_without_their_literals():
+    engine = RuleEngine([SecretLiteralRule(), EvalUsageRule(), RecordLoadInLoopRule()])
+    # Case-insensitive patterns look their literals up case-folded.
+    text = "var PASSWORD = 'abcd1234ABCD5678';\nfor (;;) { record.load({}); }\n"
+    profile = RuleProfile()
+    findings = engine.run(_context("mixed.js", text), profile)
+    assert sorted(h.rule_id for h in findings) == ["governance.record_load_loop", "security.secret_literal"]
+    engine.run(_context("plain.js", "var total = 1;\n"), profile)
+
+    rows = {row["rule_id"]: row for row in profile.table()}
+    assert (rows["security.eval_usage"]["calls"], rows["security.eval_usage"]["prefiltered"]) == (0, 2)
+    assert (rows["security.secret_literal"]["calls"], rows["security.secret_literal"]["prefiltered"]) == (1, 1)
+    assert rows["security.secret_literal"]["skipped"] == 0
+
+
+def test_rules_are_dispatched_by_script_type():
+    engine = default_rule_engine()
+    user_event = engine.rules_for("UserEventScript")
+    assert engine.rules_for("usereventscript") is user_event
+    ids = {rule.rule_id for rule in user_event}
+    assert "userevent.after_submit_rewrite" in ids
+    assert not ids & {"clientscript.heavy_loop_dom", "suitelet.missing_pagination", "mapreduce.missing_retry"}
+    assert len(engine.rules_for(None)) == len(engine.rules)
+    assert {rule.rule_id for rule in engine.rules_for("Suitelet", fast_path=True)} == {
+        rule.rule_id for rule in engine.fast_path_rules
+    }
+
+    counts = engine.dispatch_counts()
+    assert counts["UserEventScript"] == 1 and counts["*"] == len(engine.rules) - 4
+    assert engine.diagnostics()["by_script_type"] == counts
+
+
+def test_rules_ignore_comments_and_string_contents():
+    text = (
+        "// eval(legacy)\n"
+        "var note = 'do not eval(x)';\n"
+        "/* const token = 'abcd1234ABCD5678'; */\n"
+        "var f = eval(code);\n"
+        "const password = 'abcd1234ABCD5678';\n"
+    )
+    context = _context("mixed.js", text)
+    eval_hits = list(EvalUsageRule().evaluate(context))
+    assert [(hit.start_line, hit.end_line) for hit in eval_hits] == [(4, 4)]
+    secret_hits = list(SecretLiteralRule().evaluate(context))
+    assert [hit.start_line for hit in secret_hits] == [5]
+    assert "***REDACTED***" in secret_hits[0].snippet[0]
+
+
+def test_loop_rules_follow_nested_braces():
+    text = (
+        "for (var i = 0; i < n; i++) {\n"
+        "    if (ids[i]) { log.debug('skip'); }\n"
+        "    var rec = record.load({ type: 'customer', id: ids[i] });\n"
+        "}\n"
+        "record.save();\n"
+        "results.forEach(function (r) { search.run().each(check); });\n"
+    )
+    context = _context("loops.js", text)
+    load_hits = list(RecordLoadInLoopRule().evaluate(context))
+    assert [(hit.start_line, hit.end_line) for hit in load_hits] == [(1, 3)]
+    each_hits = list(SearchEachLoopRule().evaluate(context))
+    assert [(hit.start_line, hit.end_line) for hit in each_hits] == [(6, 6)]
+
+
+def test_loop_rules_cover_braceless_loops():
+    text = (
+        "while (more)\n"
+        "    record.load({ type: 'customer', id: next() });\n"
+        "for (var i = 0; i < n; i++) record.load({ type: 'item', id: ids[i] });\n"
+        "record.load({ type: 'vendor', id: 1 });\n"
+    )
+    hits = list(RecordLoadInLoopRule().evaluate(_context("loops.js", text)))
+    assert [(hit.start_line, hit.end_line) for hit in hits] == [(1, 2), (3, 3)]
+
+
+def test_after_submit_rule_only_reports_writes_in_after_submit():
+    text = (
+        "function afterSubmit(context) {\n"
+        "    if (context.type) { record.submitFields({ type: 'x', id: 1, values: {} }); }\n"
+        "}\n"
+        "function helper() { record.save(); }\n"
+    )
+    hits = list(AfterSubmitRewriteRule().evaluate(_context("ue.js", text, "UserEventScript")))
+    assert [(hit.start_line, hit.end_line) for hit in hits] == [(1, 2)]
+
+
+def test_empty_catch_ignores_commented_bodies():
+    text = (
+        "try { a(); } catch (e) { /* intentionally ignored */ }\n"
+        "try { b(); } catch (e) {\n    // best effort\n}\n"
+        "try { c(); } catch (e) {\n}\n"
+        "var s = 'catch (e) {}'; // catch (e) {}\n"
+    )
+    context = _context("catch.js", text)
+    assert [(h.start_line, h.end_line) for h in EmptyCatchRule().evaluate(context)] == [(5, 6)]
+    assert [(h.rule_id, h.start_line) for h in RuleEngine([EmptyCatchRule()]).run(context)] == [
+        ("data_integrity.empty_catch", 5)
+    ]
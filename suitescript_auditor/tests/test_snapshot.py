@@ -0,0 +1,37 @@
+import hashlib
+from pathlib import Path
+
+from suitescript_auditor.core.io.discovery import SourceFile
+from suitescript_auditor.core.io.snapshot import read_snapshot
+
+
+def _source(path):
+    return SourceFile(path=path, rel_path=Path(path.name), size=path.stat().st_size)
+
+
+def test_snapshot_hashes_and_decodes_once(tmp_path):
+    raw = "define([], function() {\r\n  return 'ñ';\r\n});\r\n".encode("utf-8")
+    path = tmp_path / "script.js"
+    path.write_bytes(raw)
+    snapshot = read_snapshot(_source(path))
+    assert snapshot.sha256 == hashlib.sha256(raw).hexdigest()
+    assert snapshot.text == path.read_text(encoding="utf-8", errors="ignore")
+    assert snapshot.size == len(raw)
+
+
+def test_snapshot_memory_maps_large_files(tmp_path):
+    raw = b"var a = 1;\n" * 2000 + b"\xff\xfe"
+    path = tmp_path / "big.js"
+    path.write_bytes(raw)
+    mapped = read_snapshot(_source(path), mmap_threshold=1024)
+    buffered = read_snapshot(_source(path), mmap_threshold=len(raw) + 1)
+    assert mapped == buffered
+    assert mapped.text.endswith("var a = 1;\n")
+
+
+def test_snapshot_handles_empty_files(tmp_path):
+    path = tmp_path / "empty.js"
+    path.write_bytes(b"")
+    snapshot = read_snapshot(_source(path), mmap_threshold=0)
+    assert snapshot.text == ""
+    assert snapshot.sha256 == hashlib.sha256(b"").hexdigest()
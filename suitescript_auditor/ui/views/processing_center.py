@@ -18,12 +18,14 @@ def build(parent: tk.Widget, context) -> ttk.Frame:
     stats_frame.pack(fill="x", pady=10)
 
     total_jobs = len(context.job_queue.list_jobs())
+    pending = len([j for j in context.job_queue.list_jobs() if j.status == JobStatus.PENDING])
     running = len([j for j in context.job_queue.list_jobs() if j.status == JobStatus.RUNNING])
     completed = len([j for j in context.job_queue.list_jobs() if j.status == JobStatus.COMPLETED])
     failed = len([j for j in context.job_queue.list_jobs() if j.status == JobStatus.FAILED])
 
     for label, value in [
         ("Total Jobs", total_jobs),
+        ("Pending", pending),
         ("Running", running),
         ("Completed", completed),
         ("Failed", failed),
@@ -33,7 +35,7 @@ def build(parent: tk.Widget, context) -> ttk.Frame:
     table_frame = ttk.Frame(frame)
     table_frame.pack(fill="both", expand=True)
 
-    columns = ("project", "status", "progress", "stage", "files", "cost")
+    columns = ("project", "status", "priority", "progress", "stage", "files", "cost")
     tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=12)
     for col in columns:
         tree.heading(col, text=col.title())
@@ -54,6 +56,7 @@ def build(parent: tk.Widget, context) -> ttk.Frame:
                 values=(
                     job.project_name,
                     job.status.value.title(),
+                    job.priority,
                     f"{job.progress*100:.0f}%",
                     job.stage.value if hasattr(job.stage, "value") else str(job.stage),
                     f"{job.files_processed}/{job.files_total}",
@@ -40,6 +40,29 @@ def build(parent: tk.Widget, context) -> ttk.Frame:
     _info_card(cards, "Hotspots", str(job.results.get("hotspots", 0) if job.results else 0))
     _info_card(cards, "Costo LLM (USD)", f"${job.llm_cost:.2f}")
 
+    timing = job.timer.as_dict()
+    throughput = timing["throughput"]
+    _info_card(cards, "Tiempo total", f"{timing['elapsed_seconds']:.2f}s")
+    _info_card(cards, "Throughput", f"{throughput['bytes_per_second'] / 1e6:.2f} MB/s")
+
+    tables = ttk.Frame(frame)
+    tables.pack(fill="x", pady=(5, 0))
+    _table(
+        tables,
+        "Tiempos por etapa",
+        ("stage", "wall", "cpu"),
+        [
+            (stage, f"{span['wall_seconds']:.3f}s", f"{span['cpu_seconds']:.3f}s")
+            for stage, span in timing["stages"].items()
+        ],
+    )
+    _table(
+        tables,
+        "Archivos más lentos",
+        ("file", "seconds", "bytes"),
+        [(entry["path"], f"{entry['seconds']:.3f}s", entry["bytes"]) for entry in timing["slowest_files"]],
+    )
+
     ttk.Label(frame, text="Logs", font=("Segoe UI", 12, "bold")).pack(anchor="w", pady=(15, 5))
     log_box = tk.Text(frame, height=12)
     log_box.pack(fill="both", expand=True)
@@ -52,6 +75,19 @@ def build(parent: tk.Widget, context) -> ttk.Frame:
     return frame
 
 
+def _table(parent: ttk.Frame, title: str, columns: tuple, rows: list) -> None:
+    wrapper = ttk.Frame(parent, padding=(0, 0, 10, 0))
+    wrapper.pack(side="left", fill="both", expand=True)
+    ttk.Label(wrapper, text=title, font=("Segoe UI", 12, "bold")).pack(anchor="w", pady=(0, 5))
+    tree = ttk.Treeview(wrapper, columns=columns, show="headings", height=6)
+    for col in columns:
+        tree.heading(col, text=col.title())
+        tree.column(col, width=220 if col in {"stage", "file"} else 90)
+    for row in rows:
+        tree.insert("", "end", values=row)
+    tree.pack(fill="both", expand=True)
+
+
 def _info_card(parent: ttk.Frame, title: str, value: str) -> None:
     wrapper = ttk.Frame(parent, padding=10, borderwidth=1, relief="ridge")
     wrapper.pack(side="left", padx=5, fill="x", expand=True)